@@ -66,8 +66,12 @@ else:
                     st.error("Please enter a valid email address.")
                 else:
                     user_data = database.get_user(login_email)  # (hashed_pass, role)
-                    
-                    if user_data and auth.verify_password(login_password, user_data[0]):
+                    valid, new_hash = auth.login(login_password, user_data[0]) if user_data else (False, None)
+                    if valid and new_hash:
+                        # Stored with an older bcrypt cost; upgrade it now that we have the password
+                        database.update_password_hash(login_email, new_hash)
+
+                    if valid:
                         st.session_state["logged_in"] = True
                         st.session_state["email"] = login_email
                         st.session_state["role"] = user_data[1]
@@ -131,7 +135,7 @@ else:
                         if profile_data.get('year_gap') is None:
                             profile_data['year_gap'] = 0
                         
-                        hashed_pass = auth.hash_password(signup_password)
+                        hashed_pass = auth.hash_password_in_pool(signup_password)
                         role_to_db = signup_role.lower()
                         
                         success, message = database.add_user_and_profile(
@@ -145,7 +149,7 @@ else:
                             st.error(message)
                 else:
                     # Admin signup (no profile needed)
-                    hashed_pass = auth.hash_password(signup_password)
+                    hashed_pass = auth.hash_password_in_pool(signup_password)
                     role_to_db = signup_role.lower()
                     
                     success, message = database.add_user_and_profile(
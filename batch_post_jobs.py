@@ -0,0 +1,40 @@
+"""
+Script to parse and post a folder of job descriptions (PDF or .txt) in one batch
+Every posted job is linked to its eligible students in a single transaction
+Run with: python batch_post_jobs.py <folder> <admin_email> [--dry-run] [--post-empty] [--concurrency N]
+"""
+import sys
+from modules import jd_batch
+
+def main(argv):
+    flags = {arg for arg in argv if arg in ('--dry-run', '--post-empty')}
+    args = [arg for arg in argv if arg not in flags]
+    concurrency = jd_batch.MAX_CONCURRENCY
+    if '--concurrency' in args:
+        position = args.index('--concurrency')
+        concurrency = int(args[position + 1])
+        del args[position:position + 2]
+    if len(args) != 2:
+        print(__doc__.strip().splitlines()[-1])
+        return 1
+    folder, admin_email = args
+
+    paths = jd_batch.find_documents(folder)
+    if not paths:
+        print(f"No PDF or .txt job descriptions found in {folder}")
+        return 1
+    print(f"Processing {len(paths)} job descriptions from {folder} "
+          f"({concurrency} parses at a time{', dry run' if '--dry-run' in flags else ''})...\n")
+
+    def show_progress(stage, done, total):
+        print(f"\r  {stage}: {done}/{total}", end="\n" if done == total else "", flush=True)
+
+    results, stage_seconds = jd_batch.ingest(paths, admin_email, max_concurrency=concurrency,
+                                             dry_run='--dry-run' in flags, post_empty='--post-empty' in flags,
+                                             on_progress=show_progress)
+    print()
+    print(jd_batch.format_report(results, stage_seconds))
+    return 0 if all(row['status'] != 'failed' for row in results) else 2
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,64 @@
+"""
+Benchmark: bcrypt logins per second at each cost factor.
+For every cost it measures one core (verifications in this process) and the
+auth process pool driven by concurrent login threads with the verification
+cache off (its default), then the same logins again with the cache on. It also checks that
+a hash made at another cost is upgraded by auth.login.
+Run with: python benchmark_auth.py [costs, e.g. 8,10,12] [concurrent_logins]
+"""
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from modules import auth
+
+PASSWORD = "correct horse battery staple"
+MIN_SECONDS = 1.0
+CACHE_SECONDS = 300  # for the cached column only; the cache is off by default
+
+def per_core_rate(hashed):
+    """Verifications per second in this process, measured for at least MIN_SECONDS."""
+    count, started = 0, time.perf_counter()
+    while time.perf_counter() - started < MIN_SECONDS or count < 3:
+        assert auth.verify_password(PASSWORD, hashed)
+        count += 1
+    return count / (time.perf_counter() - started)
+
+def pool_rate(hashes, rounds, concurrency):
+    """Logins per second through auth.login from `concurrency` threads."""
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda hashed: auth.login(PASSWORD, hashed, rounds), hashes))
+    assert all(valid and new_hash is None for valid, new_hash in results)
+    return len(hashes) / (time.perf_counter() - started)
+
+def main(costs=(8, 10, 12), concurrency=16):
+    print(f"{os.cpu_count()} CPU(s), auth pool of {auth.MAX_WORKERS} worker(s), {concurrency} concurrent logins\n")
+    print(f"{'Cost':>4} {'ms/verify':>10} {'per core/s':>11} {'pool/s':>8} {'cached/s':>10}")
+    auth._run(len, "")  # start the pool before timing
+    for rounds in costs:
+        hashed = auth.hash_password(PASSWORD, rounds)
+        single = per_core_rate(hashed)
+        # Enough logins for about a second of pool time; distinct hashes so each one is a real check
+        count = max(concurrency, int(single * max(auth.MAX_WORKERS, 1)))
+        hashes = [auth.hash_password(PASSWORD, rounds) for _ in range(min(count, 200))]
+        auth.clear_cache()
+        saved, auth.CACHE_SECONDS = auth.CACHE_SECONDS, 0
+        pooled = pool_rate(hashes, rounds, concurrency)
+        auth.CACHE_SECONDS = CACHE_SECONDS
+        pool_rate(hashes, rounds, concurrency)  # fills the cache
+        cached = pool_rate(hashes * 10, rounds, concurrency)
+        auth.CACHE_SECONDS = saved
+        print(f"{rounds:>4} {1000 / single:>10.1f} {single:>11.1f} {pooled:>8.1f} {cached:>10.0f}")
+
+    old = auth.hash_password(PASSWORD, costs[0])
+    valid, new_hash = auth.login(PASSWORD, old, costs[-1])
+    upgraded = valid and auth.hash_rounds(new_hash) == costs[-1] and auth.verify_password(PASSWORD, new_hash)
+    print(f"\nRehash on login: cost {costs[0]} -> {auth.hash_rounds(new_hash)} "
+          f"({'ok' if upgraded else 'FAILED'})")
+    return 0 if upgraded else 1
+
+if __name__ == "__main__":
+    args = sys.argv[1:3]
+    costs = tuple(int(cost) for cost in args[0].split(",")) if args else (8, 10, 12)
+    sys.exit(main(costs, *[int(arg) for arg in args[1:]]))
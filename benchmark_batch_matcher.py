@@ -0,0 +1,66 @@
+"""
+Benchmark: vectorized batch matching vs. one SQL query per job.
+Builds a throwaway database with N students and evaluates M random job
+criteria both ways, checking that the eligible sets are identical.
+Run with: python benchmark_batch_matcher.py [num_students] [num_jobs]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from modules import batch_matcher, database, synthetic_roster
+
+def random_criteria(rng):
+    branches = [code for code, _ in database.branch_mapper.get_all_branches()]
+    criteria = {}
+    if rng.random() < 0.9:
+        criteria['cgpa'] = round(rng.uniform(6.0, 9.0), 1)
+    if rng.random() < 0.7:
+        criteria['backlogs'] = rng.choice([0, 0, 1, 2])
+    if rng.random() < 0.5:
+        criteria['year_gap'] = rng.choice([0, 1])
+    if rng.random() < 0.6:
+        criteria['branches'] = rng.sample(branches, rng.randint(1, 4))
+    return criteria
+
+def main(num_students=10000, num_jobs=200):
+    rng = random.Random(7)
+    random.seed(7)
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_FILE = os.path.join(tmp, "batch_bench.db")
+        database.init_database()
+        conn = database.get_connection()
+        synthetic_roster.populate(conn, num_students)
+        criteria_list = [random_criteria(rng) for _ in range(num_jobs)]
+
+        start = time.perf_counter()
+        sql_results = [database.get_students_matching_criteria(c) for c in criteria_list]
+        sql_seconds = time.perf_counter() - start
+        sql_sets = [set(df['email']) if not df.empty else set() for df in sql_results]
+
+        start = time.perf_counter()
+        matrix = batch_matcher.StudentMatrix.load(conn)
+        load_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        batch_results = matrix.match(criteria_list)
+        match_seconds = time.perf_counter() - start
+
+        mismatches = sum(1 for a, b in zip(sql_sets, batch_results) if a != set(b))
+        database.close_all_connections()
+
+    print(f"{num_students} students x {num_jobs} jobs")
+    print(f"  per-job SQL     : {sql_seconds * 1000:9.1f} ms")
+    print(f"  vectorized load : {load_seconds * 1000:9.1f} ms")
+    print(f"  vectorized match: {match_seconds * 1000:9.1f} ms")
+    total = load_seconds + match_seconds
+    print(f"  speedup         : {sql_seconds / total:9.1f}x (load + match)")
+    if mismatches:
+        print(f"MISMATCH: {mismatches} jobs returned different eligible sets")
+        return 1
+    print("  eligible sets identical for every job")
+    return 0
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    sys.exit(main(*args))
@@ -0,0 +1,92 @@
+"""
+Micro-benchmark for branch_mapper.normalize_branch.
+Compares the original linear-scan implementation with the precompiled,
+memoized one on a 100k mixed-input corpus and checks they agree.
+Run with: python benchmark_branch_mapper.py [corpus_size]
+"""
+import random
+import re
+import string
+import sys
+import time
+from modules import branch_mapper
+from modules.branch_mapper import BRANCH_CODES, BRANCH_MAPPING
+
+def legacy_normalize_branch(branch_input):
+    """The original implementation, kept here as the reference."""
+    if not branch_input:
+        return None
+    branch_lower = branch_input.strip().lower()
+    if branch_lower in BRANCH_MAPPING:
+        return BRANCH_MAPPING[branch_lower]
+    branch_upper = branch_input.strip().upper()
+    if branch_upper in BRANCH_CODES:
+        return BRANCH_CODES[branch_upper]
+    for key, code in BRANCH_MAPPING.items():
+        if key in branch_lower or branch_lower in key:
+            return code
+    patterns = [
+        (r'computer\s*science', 'CSE'),
+        (r'electronics\s*(?:and\s*)?communication', 'ECE'),
+        (r'information\s*technology', 'IT'),
+        (r'electrical\s*(?:and\s*)?electronics', 'EEE'),
+        (r'mechanical', 'MECH'),
+        (r'civil', 'CIVIL'),
+        (r'aerospace', 'AERO'),
+        (r'biotech', 'BIO'),
+        (r'chemical', 'CHEM'),
+        (r'automobile', 'AUTO'),
+    ]
+    for pattern, code in patterns:
+        if re.search(pattern, branch_lower):
+            return code
+    return None
+
+def build_corpus(size, seed=42):
+    """Mix of exact names, codes, decorated names and unmatchable noise."""
+    rng = random.Random(seed)
+    exact = list(BRANCH_MAPPING) + list(BRANCH_CODES)
+    decorated = [f"B.Tech {name.title()}" for name in BRANCH_MAPPING] + \
+                [f"  {name.upper()} (Hons)  " for name in BRANCH_MAPPING] + \
+                ["ComputerScience", "Electronics & Communication", "Bio-technology", "Mechatronics"]
+    corpus = []
+    for _ in range(size):
+        roll = rng.random()
+        if roll < 0.5:
+            corpus.append(rng.choice(exact))
+        elif roll < 0.8:
+            corpus.append(rng.choice(decorated))
+        else:
+            # Unique noise defeats the memo, exercising the compiled matchers
+            corpus.append(''.join(rng.choice(string.ascii_lowercase + ' ') for _ in range(rng.randint(3, 20))))
+    return corpus
+
+def time_per_call(func, corpus):
+    start = time.perf_counter()
+    for item in corpus:
+        func(item)
+    return (time.perf_counter() - start) / len(corpus) * 1e6
+
+def main(size=100000):
+    corpus = build_corpus(size)
+
+    mismatches = [item for item in set(corpus) if legacy_normalize_branch(item) != branch_mapper.normalize_branch(item)]
+    if mismatches:
+        print(f"MISMATCH on {len(mismatches)} inputs, e.g. {mismatches[:5]}")
+        return 1
+
+    branch_mapper.normalize_branch.cache_clear()
+    legacy_us = time_per_call(legacy_normalize_branch, corpus)
+    branch_mapper.normalize_branch.cache_clear()
+    cold_us = time_per_call(branch_mapper.normalize_branch, corpus)
+    warm_us = time_per_call(branch_mapper.normalize_branch, corpus)
+
+    print(f"Corpus: {size} inputs ({len(set(corpus))} distinct), results identical")
+    print(f"  legacy linear scan : {legacy_us:8.3f} us/call")
+    print(f"  compiled, cold memo: {cold_us:8.3f} us/call ({legacy_us / cold_us:.1f}x)")
+    print(f"  compiled, warm memo: {warm_us:8.3f} us/call ({legacy_us / warm_us:.1f}x)")
+    print(f"  memo: {branch_mapper.normalize_branch.cache_info()}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000))
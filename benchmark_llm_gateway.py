@@ -0,0 +1,128 @@
+"""
+Benchmark: the LLM gateway against a local fake LLM server.
+The server enforces a per-key rate limit (HTTP 429), fails a small share
+of requests with 503 and answers after a fixed delay. The same workload,
+with some identical prompts, is sent once straight to the server
+(round-robin keys, no retries) and once through the gateway.
+Run with: python benchmark_llm_gateway.py [num_requests] [concurrency]
+"""
+import json
+import random
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from modules import llm_gateway
+
+KEYS = ["fake-key-aaaa", "fake-key-bbbb", "fake-key-cccc"]
+SERVER_RPS_PER_KEY = 20
+SERVER_DELAY_SECONDS = 0.05
+SERVER_ERROR_RATE = 0.02
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    buckets = {key: llm_gateway.TokenBucket(SERVER_RPS_PER_KEY, 5) for key in KEYS}
+    lock = threading.Lock()
+    calls = 0
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        with FakeLLMHandler.lock:
+            FakeLLMHandler.calls += 1
+            bucket = FakeLLMHandler.buckets.get(body['api_key'])
+            now = time.monotonic()
+            limited = bucket is None or bucket.wait_time(now) > 0
+            if not limited:
+                bucket.take(now)
+        if limited:
+            return self._reply(429, {'error': 'rate limit exceeded'})
+        time.sleep(SERVER_DELAY_SECONDS)
+        if random.random() < SERVER_ERROR_RATE:
+            return self._reply(503, {'error': 'unavailable'})
+        self._reply(200, {'text': f"Answer to: {body['prompt']}"})
+
+    def _reply(self, status, payload):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+class FakeLLMServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # the default backlog of 5 adds connect retries under load
+
+def http_transport(url):
+    """Gateway transport for the fake server; urllib's HTTPError carries the status as .code."""
+    def transport(provider, model, prompt, system, api_key, temperature):
+        request = urllib.request.Request(url, data=json.dumps({'api_key': api_key, 'prompt': prompt}).encode('utf-8'),
+                                         headers={'Content-Type': 'application/json'})
+        with urllib.request.urlopen(request, timeout=10) as response:
+            text = json.loads(response.read())['text']
+        for word in text.split(' '):
+            yield word + ' '
+    return transport
+
+def run(label, send, prompts, concurrency):
+    FakeLLMHandler.calls = 0
+    latencies, failures = [], 0
+    lock = threading.Lock()
+
+    def one(prompt):
+        nonlocal failures
+        started = time.perf_counter()
+        try:
+            send(prompt)
+        except Exception:
+            with lock:
+                failures += 1
+            return
+        with lock:
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, prompts))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    percentile = lambda fraction: latencies[int(fraction * (len(latencies) - 1))] * 1000 if latencies else 0.0
+    print(f"{label:<10} ok {len(latencies):>5}/{len(prompts):<5} failed {failures:>4}  "
+          f"upstream calls {FakeLLMHandler.calls:>5}  {len(latencies) / elapsed:7.1f} ok/s  "
+          f"p50 {percentile(0.5):7.1f} ms  p95 {percentile(0.95):7.1f} ms  p99 {percentile(0.99):7.1f} ms")
+    return failures
+
+def main(num_requests=600, concurrency=32):
+    random.seed(11)
+    server = FakeLLMServer(('127.0.0.1', 0), FakeLLMHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/generate"
+    transport = http_transport(url)
+    # A third of the prompts repeat, like several users asking about the same JD at once
+    prompts = [f"prompt {random.randint(0, num_requests * 2 // 3)}" for _ in range(num_requests)]
+    print(f"{num_requests} requests, {concurrency} concurrent callers, {len(KEYS)} keys, "
+          f"server limit {SERVER_RPS_PER_KEY} req/s per key\n")
+
+    key_cycle = iter(KEYS * num_requests)
+    key_lock = threading.Lock()
+    def direct(prompt):
+        with key_lock:
+            key = next(key_cycle)
+        return "".join(transport("fake", "model", prompt, None, key, None))
+    run("direct", direct, prompts, concurrency)
+
+    gateway = llm_gateway.LLMGateway(transport, keys={"fake": KEYS}, requests_per_minute=SERVER_RPS_PER_KEY * 60,
+                                     burst=5, max_attempts=4, backoff_base=0.1)
+    failures = run("gateway", lambda prompt: gateway.complete("fake", "model", prompt), prompts, concurrency)
+    print(f"\nCoalesced requests: {gateway.coalesced}")
+    for row in gateway.get_metrics():
+        print("  " + ", ".join(f"{name}={value}" for name, value in row.items()))
+    server.shutdown()
+    return 0 if failures == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main(*[int(arg) for arg in sys.argv[1:3]]))
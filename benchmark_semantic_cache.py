@@ -0,0 +1,129 @@
+"""
+Benchmark for semantic_cache.SemanticCache.
+Fills the index with synthetic placement questions, then measures lookup
+latency for reworded questions (should hit) and for questions that differ
+only in a month, number, branch or company (must not reuse the original
+answer). A brute-force scan
+over a sample checks that prefix filtering never misses the best match.
+Run with: python benchmark_semantic_cache.py [index_size] [threshold]
+"""
+import random
+import statistics
+import string
+import sys
+import time
+from modules import placement_query, placement_store, semantic_cache
+
+MONTHS = ['January', 'February', 'March', 'April', 'June', 'July', 'August', 'September', 'October', 'November']
+BRANCHES = ['data science', 'electronics', 'blockchain', 'iot', 'information technology', 'BCE', 'BCI', 'BBS']
+TEMPLATES = [
+    ("Which companies came in {month} offering above {ctc} LPA?",
+     "show me the companies that came in {month} with a package above {ctc} LPA"),
+    ("How many {branch} students got placed at {company}?",
+     "how many students from {branch} were placed at {company}"),
+    ("What was the average package of companies in {month}?",
+     "average package for the companies that visited in {month}"),
+    ("List the top {n} companies by package for {branch} students",
+     "top {n} companies by package for {branch} students please"),
+    ("Companies offering between {ctc} and {ctc2} LPA in {month}",
+     "which companies offered between {ctc} and {ctc2} LPA during {month}"),
+    ("Did {company} hire any {branch} students in {month}?",
+     "were any {branch} students hired by {company} in {month}?"),
+]
+
+def make_values(rng, companies):
+    ctc = rng.randint(30, 400) / 10
+    return {'month': rng.choice(MONTHS), 'branch': rng.choice(BRANCHES), 'company': rng.choice(companies),
+            'ctc': f"{ctc:g}", 'ctc2': f"{ctc + rng.randint(1, 10):g}", 'n': rng.randint(3, 50)}
+
+def answer_key(template, values):
+    """Identifies the correct answer: the template and the entities it uses."""
+    fields = [field for _, field, _, _ in string.Formatter().parse(TEMPLATES[template][0]) if field]
+    return (template,) + tuple(values[field] for field in fields)
+
+def altered(rng, values, companies):
+    """Same question with one answer-changing entity swapped."""
+    changed = dict(values)
+    field = rng.choice(['month', 'branch', 'company', 'ctc', 'n'])
+    while changed[field] == values[field]:
+        changed[field] = make_values(rng, companies)[field]
+    changed['ctc2'] = f"{float(changed['ctc']) + 1:g}"
+    return changed
+
+def brute_force(index, question):
+    """Best stored question by exhaustive cosine over all entries with the same signature."""
+    query_weights = index._weights(semantic_cache.extract_terms(question))
+    signature = index._signature(question)
+    best = (0.0, None)
+    for stored_question, _, terms, stored_signature in index._entries.values():
+        if stored_signature != signature:
+            continue
+        stored_weights = index._weights(terms)
+        score = sum(weight * stored_weights[term] for term, weight in query_weights.items() if term in stored_weights)
+        best = max(best, (score, stored_question), key=lambda item: item[0])
+    return best
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def main(size=100000, threshold=0.8, probes=2000, seed=7):
+    rng = random.Random(seed)
+    companies = [f"{rng.choice(['Nova', 'Apex', 'Zen', 'Quant', 'Blue', 'Tera'])}{i} Labs" for i in range(300)]
+    signature = lambda question: placement_query.question_signature(question, companies, placement_store.BRANCH_NAMES)
+    index = semantic_cache.SemanticCache(threshold=threshold, max_entries=size, signature_fn=signature)
+
+    # Re-asked questions replace their entry, so keep generating until the index is full
+    stored = {}
+    start = time.perf_counter()
+    while len(index) < size:
+        template, phrasing = rng.randrange(len(TEMPLATES)), rng.randrange(2)
+        values = make_values(rng, companies)
+        question = TEMPLATES[template][phrasing].format(**values)
+        index.add(question, {'key': answer_key(template, values)})
+        stored[question] = (template, phrasing, values)
+    stored = [(template, phrasing, values, question) for question, (template, phrasing, values) in stored.items()]
+    build_seconds = time.perf_counter() - start
+
+    hit_latencies, miss_latencies = [], []
+    hits = wrong_answers = false_reuses = 0
+    for template, phrasing, values, _ in rng.sample(stored, probes):
+        # Ask it the other way round
+        started = time.perf_counter()
+        found = index.lookup(TEMPLATES[template][1 - phrasing].format(**values))
+        hit_latencies.append(time.perf_counter() - started)
+        if found is not None:
+            hits += 1
+            if found[0]['key'] != answer_key(template, values):
+                wrong_answers += 1
+
+        changed = altered(rng, values, companies)
+        started = time.perf_counter()
+        found = index.lookup(TEMPLATES[template][phrasing].format(**changed))
+        miss_latencies.append(time.perf_counter() - started)
+        # A hit is fine only if the altered question (in some phrasing) was itself stored
+        if found is not None and found[0]['key'] != answer_key(template, changed):
+            false_reuses += 1
+
+    disagreements = 0
+    for template, phrasing, values, _ in rng.sample(stored, 50):
+        question = TEMPLATES[template][1 - phrasing].format(**values)
+        score, _ = brute_force(index, question)
+        found = index.lookup(question)
+        if (found is not None) != (score >= threshold) or (found and abs(found[1] - score) > 1e-3):
+            disagreements += 1
+
+    all_latencies = hit_latencies + miss_latencies
+    print(f"Index: {len(index)} questions, {len(index._postings)} terms, built in {build_seconds:.1f}s "
+          f"({size / build_seconds:,.0f} inserts/s), threshold {threshold}")
+    print(f"  reworded probes : {hits}/{probes} reused ({hits / probes:.1%}), {wrong_answers} wrong answers")
+    print(f"  altered probes  : {false_reuses}/{probes} answered for the wrong entities")
+    print(f"  lookup latency  : p50 {percentile(all_latencies, 0.5) * 1e3:.2f} ms, "
+          f"p95 {percentile(all_latencies, 0.95) * 1e3:.2f} ms, p99 {percentile(all_latencies, 0.99) * 1e3:.2f} ms, "
+          f"mean {statistics.mean(all_latencies) * 1e3:.2f} ms")
+    print(f"  brute-force check: {disagreements}/50 disagreements")
+    return 1 if wrong_answers or false_reuses or disagreements else 0
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000,
+                  float(sys.argv[2]) if len(sys.argv) > 2 else 0.8))
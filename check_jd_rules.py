@@ -0,0 +1,51 @@
+"""
+Regression check for the rule-based JD parser.
+Each case is a JD with the branches the rules should return and whether
+gemini_parser.extract_criteria may trust them without asking Gemini.
+JDs that name branches outside a "Branches:" section must go to Gemini:
+an empty list there would make every branch eligible.
+Run with: python check_jd_rules.py
+"""
+import sys
+from modules import gemini_parser, jd_rules
+
+# (label, JD, expected branches, rules trusted without Gemini)
+CASES = [
+    ("codes without a branch keyword",
+     "Open to CSE and ECE students only. Minimum CGPA 7.5, no active backlogs. CTC 12 LPA.",
+     [], False),
+    ("branch names without a branch keyword",
+     "We welcome Computer Science and Electronics graduates. 7 CGPA and above, no backlogs, package 10 LPA.",
+     [], False),
+    ("codes outside the branch section",
+     "Eligible branches: CSE, IT. ECE students may also apply. Minimum CGPA 7.5, no backlogs. CTC 12 LPA.",
+     ["CSE", "IT"], False),
+    ("branch section",
+     "Eligible branches: CSE, IT. Minimum CGPA 7.5, no active backlogs. CTC 12 LPA.",
+     ["CSE", "IT"], True),
+    ("all branches, lowercase 'it' and 'me' in prose",
+     "All branches eligible. Minimum CGPA 7, no backlogs; it is a great fit for me. CTC 8 LPA.",
+     [], True),
+    ("no branches mentioned",
+     "Minimum CGPA 7.5, no active backlogs. CTC 12 LPA.",
+     [], True),
+]
+
+def main():
+    failures = []
+    for label, jd, expected_branches, trusted in CASES:
+        criteria, confidence = jd_rules.extract_criteria(jd)
+        is_trusted = confidence >= gemini_parser.RULES_MIN_CONFIDENCE
+        ok = sorted(criteria['branches']) == sorted(expected_branches) and is_trusted == trusted
+        print(f"{'PASS' if ok else 'FAIL'} {label}: branches {criteria['branches']}, confidence {confidence:.2f} "
+              f"({'rules' if is_trusted else 'Gemini'})")
+        if not ok:
+            failures.append(label)
+    if failures:
+        print(f"\n{len(failures)} JD rule check(s) failed: {', '.join(failures)}")
+        return 1
+    print("\nAll JD rule checks passed.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""
+Query-plan regression check for the placement database.
+Builds a throwaway database with a synthetic roster and asserts that
+EXPLAIN QUERY PLAN uses the secondary indexes for the hot queries.
+Run with: python check_query_plans.py [num_students]
+"""
+import os
+import sys
+import tempfile
+import time
+from modules import database, synthetic_roster
+
+def explain(conn, query, params):
+    """Returns the EXPLAIN QUERY PLAN detail lines for a query."""
+    rows = conn.execute(f"EXPLAIN QUERY PLAN {query}", params).fetchall()
+    return [row[-1] for row in rows]
+
+def timed(conn, query, params, repeat=50):
+    """Returns the mean wall time of a query in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        conn.execute(query, params).fetchall()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+def main(num_students=50000):
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_FILE = os.path.join(tmp, "plan_check.db")
+        conn = database.get_connection()
+        database.init_database()
+        synthetic_roster.populate(conn, num_students)
+        database.sync_indexes(conn)
+        conn.execute("ANALYZE")
+
+        checks = [
+            ("branch + cgpa criteria",
+             {'cgpa': 9.5, 'branches': ['CSE', 'ECE'], 'backlogs': 0, 'year_gap': 0},
+             'idx_student_profiles_branch_cgpa'),
+            ("cgpa-only criteria",
+             {'cgpa': 9.7, 'backlogs': 0},
+             'idx_student_profiles_cgpa'),
+        ]
+        for label, criteria, expected_index in checks:
+            query, params = database.build_student_criteria_query(criteria)
+            plan = explain(conn, query, params)
+            ok = any(expected_index in line for line in plan)
+            print(f"{'PASS' if ok else 'FAIL'} {label}: {plan} ({timed(conn, query, params):.3f} ms)")
+            if not ok:
+                failures.append(label)
+
+        params = ("student42@vit.ac.in",)
+        plan = explain(conn, database.ELIGIBLE_JOBS_QUERY, params)
+        ok = any('idx_eligibility_student_job' in line for line in plan)
+        print(f"{'PASS' if ok else 'FAIL'} eligible jobs by student: {plan} "
+              f"({timed(conn, database.ELIGIBLE_JOBS_QUERY, params):.3f} ms)")
+        if not ok:
+            failures.append("eligible jobs by student")
+
+        # Student dashboard feed: keyset pages must walk the index backwards, with no sort step
+        for label, before_job_id in (("eligible jobs first page", None), ("eligible jobs later page", 15)):
+            query, params = database.build_eligible_jobs_page_query("student42@vit.ac.in", before_job_id)
+            plan = explain(conn, query, params)
+            ok = (any('idx_eligibility_student_job' in line for line in plan)
+                  and not any('TEMP B-TREE' in line for line in plan))
+            print(f"{'PASS' if ok else 'FAIL'} {label}: {plan} ({timed(conn, query, params):.3f} ms)")
+            if not ok:
+                failures.append(label)
+
+        database.close_all_connections()
+
+    if failures:
+        print(f"\n{len(failures)} query plan check(s) failed: {', '.join(failures)}")
+        return 1
+    print("\nAll query plan checks passed.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000))
@@ -3,9 +3,31 @@ Script to import student data from CSV file into the database
 This creates user accounts and student profiles from the CSV data
 """
 import csv
+import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from modules import database, auth
 
+def parse_student_row(row):
+    """
+    Converts a CSV row into (email, profile_data).
+    Raises KeyError for missing columns and ValueError for bad values.
+    """
+    email = row['email'].strip()
+    profile_data = {
+        'roll_number': row['roll_number'].strip(),
+        'full_name': row['full_name'].strip(),
+        'cgpa': float(row['cgpa']),
+        'branch': row['branch'].strip(),
+        'class_10_perc': float(row['class_10_perc']),
+        'class_12_perc': float(row['class_12_perc']),
+        'backlogs': int(row['backlogs']),
+        'year_gap': int(row['year_gap'])
+    }
+    return email, profile_data
+
 def import_students_from_csv(csv_filename='fake_students.csv', default_password='Student@123'):
     """
     Import students from CSV file into the database.
@@ -21,31 +43,11 @@ def import_students_from_csv(csv_filename='fake_students.csv', default_password=
             
             for row_num, row in enumerate(reader, start=2):  # Start at 2 (header is row 1)
                 try:
-                    email = row['email'].strip()
-                    roll_number = row['roll_number'].strip()
-                    full_name = row['full_name'].strip()
-                    branch = row['branch'].strip()
-                    cgpa = float(row['cgpa'])
-                    class_10_perc = float(row['class_10_perc'])
-                    class_12_perc = float(row['class_12_perc'])
-                    backlogs = int(row['backlogs'])
-                    year_gap = int(row['year_gap'])
+                    email, profile_data = parse_student_row(row)
                     
                     # Hash the default password
                     hashed_password = auth.hash_password(default_password)
                     
-                    # Prepare profile data
-                    profile_data = {
-                        'roll_number': roll_number,
-                        'full_name': full_name,
-                        'cgpa': cgpa,
-                        'branch': branch,
-                        'class_10_perc': class_10_perc,
-                        'class_12_perc': class_12_perc,
-                        'backlogs': backlogs,
-                        'year_gap': year_gap
-                    }
-                    
                     # Add user and profile
                     success, message = database.add_user_and_profile(
                         email, hashed_password, 'student', profile_data
@@ -69,19 +71,108 @@ def import_students_from_csv(csv_filename='fake_students.csv', default_password=
                     errors.append(f"Row {row_num}: Unexpected error - {e}")
                     students_skipped += 1
         
-        print(f"\nImport complete!")
-        print(f"   Successfully imported: {students_imported} students")
-        print(f"   Skipped/Failed: {students_skipped} students")
+        _print_summary(students_imported, students_skipped, errors, default_password)
         
-        if errors:
-            print(f"\nErrors encountered:")
-            for error in errors[:10]:  # Show first 10 errors
-                print(f"   {error}")
-            if len(errors) > 10:
-                print(f"   ... and {len(errors) - 10} more errors")
+        return students_imported, students_skipped
+    
+    except FileNotFoundError:
+        print(f"Error: File '{csv_filename}' not found!")
+        print(f"   Please run 'python generate_fake_students.py' first to create the CSV file.")
+        return 0, 0
+    except Exception as e:
+        print(f"Error reading CSV file: {e}")
+        return 0, 0
+
+def _print_summary(students_imported, students_skipped, errors, default_password):
+    """Prints the end-of-import report shared by both import modes."""
+    print(f"\nImport complete!")
+    print(f"   Successfully imported: {students_imported} students")
+    print(f"   Skipped/Failed: {students_skipped} students")
+    
+    if errors:
+        print(f"\nErrors encountered:")
+        for error in errors[:10]:  # Show first 10 errors
+            print(f"   {error}")
+        if len(errors) > 10:
+            print(f"   ... and {len(errors) - 10} more errors")
+    
+    print(f"\nDefault password for all imported students: {default_password}")
+    print(f"   (Students should change this after first login)")
+
+def bulk_import_students_from_csv(csv_filename='fake_students.csv', default_password='Student@123',
+                                  chunk_size=1000, workers=None):
+    """
+    Bulk variant of import_students_from_csv for large rosters.
+    Streams the CSV in chunks, bcrypt-hashes each chunk across a process pool
+    (every student still gets their own salt) and inserts each chunk with
+    executemany inside one transaction.
+    """
+    students_imported = 0
+    students_skipped = 0
+    errors = []
+    workers = workers or os.cpu_count() or 1
+    start_time = time.perf_counter()
+    rows_read = 0
+    database.init_database()
+    
+    try:
+        with open(csv_filename, 'r', encoding='utf-8') as csvfile, \
+                ProcessPoolExecutor(max_workers=workers) as pool:
+            reader = enumerate(csv.DictReader(csvfile), start=2)  # Start at 2 (header is row 1)
+            
+            while True:
+                chunk = list(islice(reader, chunk_size))
+                if not chunk:
+                    break
+                rows_read += len(chunk)
+                
+                # 1. Parse and validate the chunk
+                parsed = []
+                for row_num, row in chunk:
+                    try:
+                        email, profile_data = parse_student_row(row)
+                        parsed.append((row_num, email, profile_data))
+                    except KeyError as e:
+                        errors.append(f"Row {row_num}: Missing column - {e}")
+                        students_skipped += 1
+                    except ValueError as e:
+                        errors.append(f"Row {row_num}: Invalid data format - {e}")
+                        students_skipped += 1
+                
+                # 2. Drop already-registered emails before paying for bcrypt
+                existing = database.get_existing_emails(email for _, email, _ in parsed)
+                to_insert = []
+                for row_num, email, profile_data in parsed:
+                    if email in existing:
+                        students_skipped += 1
+                        errors.append(f"Row {row_num} ({email}): This email is already registered.")
+                    else:
+                        to_insert.append((email, profile_data))
+                if not to_insert:
+                    continue
+                
+                # 3. Hash in parallel, one fresh salt per student
+                hashes = pool.map(auth.hash_password, [default_password] * len(to_insert),
+                                  chunksize=max(1, len(to_insert) // (workers * 4)))
+                students = [(email, hashed, profile_data)
+                            for (email, profile_data), hashed in zip(to_insert, hashes)]
+                
+                # 4. One transaction per chunk
+                try:
+                    inserted, skipped_emails = database.add_students_bulk(students)
+                except Exception as e:
+                    students_skipped += len(students)
+                    errors.append(f"Rows {chunk[0][0]}-{chunk[-1][0]}: Chunk failed - {e}")
+                    continue
+                students_imported += inserted
+                students_skipped += len(skipped_emails)
+                errors.extend(f"{email}: This email is already registered." for email in skipped_emails)
+                print(f"  Imported {students_imported} students...")
         
-        print(f"\nDefault password for all imported students: {default_password}")
-        print(f"   (Students should change this after first login)")
+        elapsed = time.perf_counter() - start_time
+        _print_summary(students_imported, students_skipped, errors, default_password)
+        rate = rows_read / elapsed if elapsed > 0 else 0.0
+        print(f"\nThroughput: {rows_read} rows in {elapsed:.2f}s ({rate:.1f} rows/sec, {workers} hashing workers)")
         
         return students_imported, students_skipped
     
@@ -98,11 +189,17 @@ if __name__ == "__main__":
     print("Student Data Import Tool")
     print("=" * 60)
     
-    csv_file = sys.argv[1] if len(sys.argv) > 1 else 'fake_students.csv'
+    # Usage: python import_students_from_csv.py [csv_file] [--bulk]
+    bulk = '--bulk' in sys.argv
+    args = [arg for arg in sys.argv[1:] if arg != '--bulk']
+    csv_file = args[0] if args else 'fake_students.csv'
     print(f"\nImporting students from: {csv_file}")
     print("This will create user accounts and student profiles...\n")
     
-    imported, skipped = import_students_from_csv(csv_file)
+    if bulk:
+        imported, skipped = bulk_import_students_from_csv(csv_file)
+    else:
+        imported, skipped = import_students_from_csv(csv_file)
     
     if imported > 0:
         print(f"\nSuccessfully imported {imported} students into the database!")
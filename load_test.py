@@ -0,0 +1,173 @@
+"""
+Load test: N concurrent simulated users driving the LLM-backed page logic
+headless, against the offline fake LLM (modules/fake_llm.py) behind the
+real gateway, so no API keys or network are needed.
+
+Each user runs a few sessions, cycling through the pages:
+    Admin Panel         JD -> criteria (Gemini) -> eligible students
+    Voice Query Engine  question -> intent or LLM-written SQL -> rows
+    Resume Matcher      the four-stage resume analysis
+    Mock Interview      question generation, then one batch of answers graded
+Prompts are unique per session, so caches and coalescing do not flatter the
+numbers. Users and students live in a throwaway database; data.db is read only.
+
+Reports requests, errors, p50/p95/p99 latency and throughput per page.
+Run with: python load_test.py [--users N] [--iterations N] [--latency-ms MS] [--error-rate R] [--rpm N]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from modules import (database, fake_llm, gemini_parser, interview, llm_client, llm_gateway, placement_query,
+                     resume_analysis, synthetic_roster)
+
+GEMINI_MODEL = "gemini-2.5-flash"
+SQL_MODEL = "gpt-4o-mini"
+
+ROLES = ["Software Engineer", "Data Analyst", "Embedded Engineer", "Cloud Engineer", "Product Analyst"]
+SKILLS = ["Python", "Java", "SQL", "C++", "AWS", "React", "Linux", "Machine Learning"]
+# Half recognised by the intent parser, half sent to the LLM for SQL
+QUESTIONS = [
+    "How many students were placed in July?",
+    "Which company had the highest CTC?",
+    "What is the average CTC in August?",
+    "Which companies offered above 10 LPA in September?",
+    "List companies that hired more than ten {skill} developers",
+    "Show the trend of offers for {role} roles over the season",
+    "Which recruiters came back for a second drive?",
+    "Compare placements of core and software companies",
+]
+
+def make_jd(rng, session):
+    role, skills = rng.choice(ROLES), rng.sample(SKILLS, 3)
+    return (f"Session {session}: we are hiring a {role} to build products with {', '.join(skills)}. "
+            f"Candidates should have good academics and strong problem solving. "
+            f"Package competitive; apply through the placement cell.")
+
+# --- Page flows ---
+# Each returns None on success or a short error message; exceptions count as errors too
+def admin_panel(rng, session):
+    criteria, message = gemini_parser.get_gemini_json_response(make_jd(rng, session))
+    if criteria is None:
+        return message
+    database.get_students_matching_criteria(criteria)
+    return None
+
+def voice_query(rng, session):
+    question = rng.choice(QUESTIONS).format(skill=rng.choice(SKILLS), role=rng.choice(ROLES))
+    result = placement_query.answer_query(
+        f"{question} (session {session})",
+        llm_complete=lambda system, question: llm_client.complete(llm_client.OPENAI, SQL_MODEL, question,
+                                                                  system=system, temperature=0))
+    return result['error']
+
+def resume_matcher(rng, session):
+    resume = (f"Resume {session}: B.Tech student with projects in {', '.join(rng.sample(SKILLS, 4))}, "
+              f"one internship and a hackathon win.")
+    results, _ = resume_analysis.analyze(resume, make_jd(rng, session), GEMINI_MODEL)
+    failed = [name for name in resume_analysis.STAGE_DEPENDENCIES if name not in results]
+    return f"stages failed or skipped: {', '.join(failed)}" if failed else None
+
+def mock_interview(rng, session):
+    jd = make_jd(rng, session)
+    questions = interview.generate_questions(jd)
+    if not questions:
+        return "no questions generated"
+    items = [{'id': f"{section}-0", 'section': section, 'question': questions[section][0],
+              'answer': f"My answer for session {session}."} for section in ("technical", "projects", "hr")
+             if questions.get(section)]
+    graded = interview.evaluate_answers_batch(jd, items)
+    return None if len(graded) == len(items) else f"{len(items) - len(graded)} answers not graded"
+
+PAGES = {
+    "Admin Panel": admin_panel,
+    "Voice Query Engine": voice_query,
+    "Resume Matcher": resume_matcher,
+    "Mock Interview": mock_interview,
+}
+
+# --- Runner ---
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[int(fraction * (len(ordered) - 1))] * 1000 if ordered else 0.0
+
+def run(users, iterations, seed):
+    """Returns ({page: {'latencies': [...], 'errors': [...]}}, wall-clock seconds)."""
+    stats = {page: {'latencies': [], 'errors': []} for page in PAGES}
+    lock = threading.Lock()
+    pages = list(PAGES)
+
+    def user(index):
+        rng = random.Random(f"{seed}:{index}")
+        for iteration in range(iterations):
+            page = pages[(index + iteration) % len(pages)]
+            session = f"u{index}-i{iteration}"
+            started = time.perf_counter()
+            try:
+                error = PAGES[page](rng, session)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            elapsed = time.perf_counter() - started
+            with lock:
+                stats[page]['latencies'].append(elapsed)
+                if error:
+                    stats[page]['errors'].append(error)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=users) as pool:
+        list(pool.map(user, range(users)))
+    return stats, time.perf_counter() - started
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless load test of the LLM-backed pages.")
+    parser.add_argument("--users", type=int, default=20, help="Concurrent simulated users")
+    parser.add_argument("--iterations", type=int, default=4, help="Page sessions per user")
+    parser.add_argument("--latency-ms", type=float, default=800, help="Median fake LLM response time")
+    parser.add_argument("--sigma", type=float, default=0.5, help="Log-normal latency spread")
+    parser.add_argument("--error-rate", type=float, default=0.02, help="Share of fake LLM calls failing (429/503)")
+    parser.add_argument("--rpm", type=float, default=600, help="Gateway requests per minute per key")
+    parser.add_argument("--students", type=int, default=2000, help="Students in the throwaway database")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    fake = fake_llm.FakeLLM(latency_ms=args.latency_ms, latency_sigma=args.sigma, error_rate=args.error_rate,
+                            seed=args.seed)
+    llm_client.BACKEND = "fake"
+    gateway = llm_gateway.LLMGateway(
+        fake, keys={llm_client.GEMINI: fake_llm.FAKE_KEYS, llm_client.OPENAI: fake_llm.FAKE_KEYS},
+        requests_per_minute=args.rpm, burst=5, max_attempts=4, backoff_base=0.2)
+    llm_client.set_gateway(gateway)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_FILE = os.path.join(tmp, "load_test.db")
+        database.init_database()
+        random.seed(args.seed)
+        synthetic_roster.populate(database.get_connection(), args.students)
+
+        print(f"{args.users} users x {args.iterations} sessions, fake LLM median {args.latency_ms:.0f} ms "
+              f"(sigma {args.sigma}), error rate {args.error_rate:.0%}, {args.rpm:.0f} req/min per key\n")
+        stats, wall = run(args.users, args.iterations, args.seed)
+        database.close_all_connections()
+
+    print(f"{'Page':<20} {'Requests':>8} {'Errors':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>7}")
+    total_errors = 0
+    for page, page_stats in stats.items():
+        latencies, errors = page_stats['latencies'], page_stats['errors']
+        total_errors += len(errors)
+        print(f"{page:<20} {len(latencies):>8} {len(errors):>6} {_percentile(latencies, 0.5):>8.0f} "
+              f"{_percentile(latencies, 0.95):>8.0f} {_percentile(latencies, 0.99):>8.0f} "
+              f"{len(latencies) / wall:>7.2f}")
+    print(f"\nWall clock {wall:.1f}s, {fake.calls} fake LLM calls, {gateway.coalesced} coalesced")
+    for row in gateway.get_metrics():
+        print("  " + ", ".join(f"{name}={value}" for name, value in row.items()))
+    for page, page_stats in stats.items():
+        for error in sorted(set(page_stats['errors']))[:3]:
+            print(f"  {page}: {error}")
+    return 0 if total_errors == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+# modules/answer_cache.py
+"""
+Persistent LRU cache for Voice Query Engine answers.
+Entries are keyed by the normalized question plus a fingerprint of the
+companies table, so reloading the placement data invalidates them
+automatically; setup_database.py also clears the table after a reload.
+"""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from modules import database
+
+MAX_ENTRIES = 2000
+
+_stats_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'errors': 0}
+# Hits are counted in memory and written in batches, so a lookup never writes
+HIT_FLUSH_THRESHOLD = 100
+_pending_hits = {}  # cache_key -> (hits, last used)
+_fingerprints = {}  # (db_path, mtime_ns, size) -> fingerprint
+
+def _count(counter, amount=1):
+    with _stats_lock:
+        _stats[counter] += amount
+
+def _record_hit(key):
+    """Notes a hit; True once enough are pending to be worth a write."""
+    with _stats_lock:
+        hits, _ = _pending_hits.get(key, (0, 0.0))
+        _pending_hits[key] = (hits + 1, time.time())
+        return len(_pending_hits) >= HIT_FLUSH_THRESHOLD
+
+def _flush_hits(conn):
+    """Writes the pending hit counts and last-used times (inside the caller's savepoint)."""
+    with _stats_lock:
+        pending = list(_pending_hits.items())
+        _pending_hits.clear()
+    conn.executemany("""
+    UPDATE query_answer_cache SET hit_count = hit_count + ?, last_used_at = MAX(last_used_at, ?) WHERE cache_key = ?
+    """, [(hits, last_used, key) for key, (hits, last_used) in pending])
+
+def flush_hits():
+    """Writes pending hits now (e.g. before reading hit counts)."""
+    conn = database.get_connection()
+    try:
+        with database.savepoint(conn, 'query_answer_cache_hits'):
+            _flush_hits(conn)
+    except sqlite3.Error as e:
+        print(f"Answer cache hit update failed: {e}")
+        _count('errors')
+
+def normalize_query(query):
+    """Lowercases and strips punctuation so trivially different phrasings share an entry."""
+    text = (query or '').lower()
+    text = re.sub(r'[^\w.]+', ' ', text)
+    text = re.sub(r'(?<!\d)\.|\.(?!\d)', ' ', text)  # keep decimal points only
+    return re.sub(r'\s+', ' ', text).strip()
+
+def get_data_fingerprint(db_path):
+    """
+    Hash of the companies view contents (ordered by the view itself).
+    Recomputed only when the database file's mtime or size changes.
+    """
+    try:
+        stat = os.stat(db_path)
+    except OSError:
+        return None
+    key = (os.path.abspath(db_path), stat.st_mtime_ns, stat.st_size)
+    fingerprint = _fingerprints.get(key)
+    if fingerprint is None:
+        digest = hashlib.sha256()
+        conn = sqlite3.connect(db_path)
+        try:
+            for row in conn.execute("SELECT * FROM companies"):
+                digest.update(repr(row).encode('utf-8'))
+        finally:
+            conn.close()
+        fingerprint = digest.hexdigest()
+        _fingerprints.clear()
+        _fingerprints[key] = fingerprint
+    return fingerprint
+
+def _make_key(normalized, fingerprint):
+    return hashlib.sha256(f"{fingerprint}\n{normalized}".encode('utf-8')).hexdigest()
+
+def get(query, db_path):
+    """Returns the cached answer dict for a query, or None."""
+    fingerprint = get_data_fingerprint(db_path)
+    if fingerprint is None:
+        return None
+    key = _make_key(normalize_query(query), fingerprint)
+    try:
+        row = database.get_connection().execute(
+            "SELECT answer_json FROM query_answer_cache WHERE cache_key = ?", (key,)).fetchone()
+        if row is None:
+            _count('misses')
+            return None
+        answer = json.loads(row[0])
+    except (sqlite3.Error, ValueError) as e:
+        print(f"Answer cache lookup failed: {e}")
+        _count('errors')
+        return None
+    _count('hits')
+    if _record_hit(key):
+        flush_hits()
+    return answer
+
+def put(query, db_path, answer):
+    """Stores an answer dict and evicts least recently used entries beyond MAX_ENTRIES."""
+    fingerprint = get_data_fingerprint(db_path)
+    if fingerprint is None:
+        return
+    normalized = normalize_query(query)
+    now = time.time()
+    conn = database.get_connection()
+    try:
+        # A savepoint, so a transaction the caller has open on this pooled connection is left alone
+        with database.savepoint(conn, 'query_answer_cache_put'):
+            _flush_hits(conn)
+            conn.execute("""
+            INSERT OR REPLACE INTO query_answer_cache (cache_key, normalized_query, data_fingerprint, answer_json,
+                                                       created_at, last_used_at, hit_count)
+            VALUES (?, ?, ?, ?, ?, ?, 0)
+            """, (_make_key(normalized, fingerprint), normalized, fingerprint, json.dumps(answer), now, now))
+            # Entries for older data can never hit again
+            stale = conn.execute("DELETE FROM query_answer_cache WHERE data_fingerprint != ?",
+                                 (fingerprint,)).rowcount
+            overflow = conn.execute("""
+            DELETE FROM query_answer_cache WHERE cache_key IN (
+                SELECT cache_key FROM query_answer_cache ORDER BY last_used_at DESC LIMIT -1 OFFSET ?
+            )
+            """, (MAX_ENTRIES,)).rowcount
+        _count('stores')
+        _count('evictions', stale + overflow)
+    except sqlite3.Error as e:
+        print(f"Answer cache store failed: {e}")
+        _count('errors')
+
+def get_answers(db_path, limit=MAX_ENTRIES):
+    """
+    Cached answers for the current data, least recently used first.
+    Used to seed the in-memory semantic index.
+    """
+    fingerprint = get_data_fingerprint(db_path)
+    if fingerprint is None:
+        return []
+    try:
+        rows = database.get_connection().execute("""
+        SELECT answer_json FROM (
+            SELECT answer_json, last_used_at FROM query_answer_cache WHERE data_fingerprint = ?
+            ORDER BY last_used_at DESC LIMIT ?
+        ) ORDER BY last_used_at
+        """, (fingerprint, limit)).fetchall()
+    except sqlite3.Error as e:
+        print(f"Answer cache read failed: {e}")
+        _count('errors')
+        return []
+    answers = []
+    for (answer_json,) in rows:
+        try:
+            answers.append(json.loads(answer_json))
+        except ValueError:
+            continue
+    return answers
+
+def clear():
+    """Removes every cached answer (called after the placement data is reloaded)."""
+    conn = database.get_connection()
+    with database.savepoint(conn, 'query_answer_cache_clear'):
+        conn.execute("DELETE FROM query_answer_cache")
+    with _stats_lock:
+        _pending_hits.clear()
+    _fingerprints.clear()
+
+def get_stats():
+    """Returns hit/miss counters for this process plus the current entry count."""
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+    try:
+        stats['entries'] = database.get_connection().execute("SELECT COUNT(*) FROM query_answer_cache").fetchone()[0]
+    except sqlite3.Error:
+        stats['entries'] = None
+    return stats
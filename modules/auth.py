@@ -1,34 +1,162 @@
 # modules/auth.py
+"""
+Password hashing with bcrypt.
+
+    cost      BCRYPT_ROUNDS (default 12); login() rehashes a password whose
+              stored hash used another cost, so raising it needs no migration
+    pool      bcrypt runs in a small process pool (AUTH_WORKERS), with at most
+              AUTH_MAX_PENDING hashes queued, so a login storm cannot pin
+              every server thread. Workers start from a forkserver (spawn
+              where that is unavailable), never a fork of the threaded
+              Streamlit server.
+    cache     off by default. With AUTH_CACHE_SECONDS > 0 a successful check
+              is remembered for that long as an HMAC of (stored hash,
+              password) under a per-process random key, so a repeated login
+              skips bcrypt. Nothing reversible is kept and a changed password
+              misses the cache.
+"""
+import atexit
+import hashlib
+import hmac
+import multiprocessing
+import os
+import re
+import secrets
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import bcrypt
 
-def hash_password(password: str) -> str:
-    """
-    Hashes a plain-text password using bcrypt.
-    Bcrypt has a 72-byte limit, so we truncate if necessary.
-    """
-    # Convert to bytes and truncate if longer than 72 bytes
-    password_bytes = password.encode('utf-8')
-    if len(password_bytes) > 72:
-        password_bytes = password_bytes[:72]
-    
-    # Generate salt and hash
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password_bytes, salt)
-    return hashed.decode('utf-8')
+BCRYPT_ROUNDS = min(max(int(os.getenv("BCRYPT_ROUNDS", "12")), 4), 31)
+MAX_WORKERS = int(os.getenv("AUTH_WORKERS", str(min(2, os.cpu_count() or 1))))
+MAX_PENDING = int(os.getenv("AUTH_MAX_PENDING", "32"))
+CACHE_SECONDS = float(os.getenv("AUTH_CACHE_SECONDS", "0"))
+CACHE_MAX_ENTRIES = 10000
+
+_ROUNDS_PATTERN = re.compile(r'^\$2[abxy]?\$(\d{2})\$')
+
+def _password_bytes(password):
+    # Bcrypt has a 72-byte limit, so we truncate if necessary
+    return password.encode('utf-8')[:72]
+
+def hash_password(password: str, rounds=None) -> str:
+    """Hashes a plain-text password with bcrypt at `rounds` (default BCRYPT_ROUNDS)."""
+    salt = bcrypt.gensalt(rounds or BCRYPT_ROUNDS)
+    return bcrypt.hashpw(_password_bytes(password), salt).decode('utf-8')
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """
-    Verifies a plain-text password against a bcrypt hash.
-    Bcrypt has a 72-byte limit, so we truncate if necessary.
-    """
+    """Verifies a plain-text password against a bcrypt hash (in the calling process)."""
     try:
-        # Convert to bytes and truncate if longer than 72 bytes
-        password_bytes = plain_password.encode('utf-8')
-        if len(password_bytes) > 72:
-            password_bytes = password_bytes[:72]
-        
-        # Verify password
-        hashed_bytes = hashed_password.encode('utf-8')
-        return bcrypt.checkpw(password_bytes, hashed_bytes)
+        return bcrypt.checkpw(_password_bytes(plain_password), hashed_password.encode('utf-8'))
     except Exception:
-        return False
\ No newline at end of file
+        return False
+
+def hash_rounds(hashed_password):
+    """The cost factor a bcrypt hash was made with, or None if it is not a bcrypt hash."""
+    match = _ROUNDS_PATTERN.match(hashed_password or '')
+    return int(match.group(1)) if match else None
+
+def needs_rehash(hashed_password, rounds=None):
+    return hash_rounds(hashed_password) != (rounds or BCRYPT_ROUNDS)
+
+def _verify_and_rehash(plain_password, hashed_password, rounds):
+    """Worker: (valid, new hash or None). Both steps in one task, so a rehash costs no extra round trip."""
+    if not verify_password(plain_password, hashed_password):
+        return False, None
+    if needs_rehash(hashed_password, rounds):
+        return True, hash_password(plain_password, rounds)
+    return True, None
+
+# --- Process pool ---
+_pool = None
+_pool_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(MAX_PENDING)
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Forking a process that runs server threads can copy a lock another thread holds
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            _pool = ProcessPoolExecutor(max_workers=MAX_WORKERS, mp_context=multiprocessing.get_context(method))
+        return _pool
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+atexit.register(_reset_pool)
+
+def _run(function, *args):
+    """Runs function in the pool, waiting for a free slot first; inline if the pool cannot run."""
+    if MAX_WORKERS <= 0:
+        return function(*args)
+    with _slots:
+        try:
+            return _get_pool().submit(function, *args).result()
+        except (BrokenProcessPool, OSError, RuntimeError):
+            # e.g. a worker was killed or processes cannot be started here
+            _reset_pool()
+            return function(*args)
+
+def hash_password_in_pool(password, rounds=None):
+    """hash_password on the pool; the caller blocks only on its own result."""
+    return _run(hash_password, password, rounds or BCRYPT_ROUNDS)
+
+# --- Verification cache ---
+_cache_key = secrets.token_bytes(32)
+_cache = {}  # HMAC digest -> expiry (monotonic)
+_cache_lock = threading.Lock()
+
+def _cache_digest(plain_password, hashed_password):
+    message = hashed_password.encode('utf-8') + b'\0' + _password_bytes(plain_password)
+    return hmac.new(_cache_key, message, hashlib.sha256).digest()
+
+def _cache_hit(digest):
+    if CACHE_SECONDS <= 0:
+        return False
+    with _cache_lock:
+        expiry = _cache.get(digest)
+        if expiry is None:
+            return False
+        if expiry < time.monotonic():
+            del _cache[digest]
+            return False
+        return True
+
+def _cache_store(digest):
+    if CACHE_SECONDS <= 0:
+        return
+    now = time.monotonic()
+    with _cache_lock:
+        if len(_cache) >= CACHE_MAX_ENTRIES:
+            for key in [key for key, expiry in _cache.items() if expiry < now] or list(_cache)[:len(_cache) // 2]:
+                del _cache[key]
+        _cache[digest] = now + CACHE_SECONDS
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
+
+def login(plain_password, hashed_password, rounds=None):
+    """
+    Checks a login attempt.
+
+    Returns:
+        (valid, new_hash): new_hash is a fresh hash at the configured cost when
+        the stored one used another cost; the caller should save it.
+    """
+    rounds = rounds or BCRYPT_ROUNDS
+    if not hashed_password:
+        return False, None
+    digest = _cache_digest(plain_password, hashed_password)
+    if not needs_rehash(hashed_password, rounds) and _cache_hit(digest):
+        return True, None
+    valid, new_hash = _run(_verify_and_rehash, plain_password, hashed_password, rounds)
+    if valid:
+        _cache_store(_cache_digest(plain_password, new_hash or hashed_password))
+    return valid, new_hash
@@ -0,0 +1,70 @@
+"""
+Vectorized eligibility matching for many jobs at once.
+Loads student_profiles once into NumPy column arrays and evaluates each
+job's criteria as boolean masks, instead of one SQL scan per job.
+"""
+import numpy as np
+from modules import database, eligibility
+
+class StudentMatrix:
+    """Column-oriented snapshot of student_profiles used for batch matching."""
+
+    def __init__(self, emails, cgpa, backlogs, year_gap, branches):
+        self.emails = np.asarray(emails, dtype=object)
+        # NULLs become NaN, which fails every comparison just like SQL NULL
+        self.cgpa = np.asarray(cgpa, dtype=float)
+        self.backlogs = np.asarray(backlogs, dtype=float)
+        self.year_gap = np.asarray(year_gap, dtype=float)
+        # Branch strings are dictionary-encoded to small ints
+        branch_values = np.asarray(['' if b is None else b for b in branches], dtype=object)
+        if len(branch_values):
+            self.branch_names, self.branch_ids = np.unique(branch_values, return_inverse=True)
+        else:
+            self.branch_names, self.branch_ids = np.array([], dtype=object), np.array([], dtype=int)
+        self._branch_lookup = {name: index for index, name in enumerate(self.branch_names) if name != ''}
+
+    def __len__(self):
+        return len(self.emails)
+
+    @classmethod
+    def load(cls, conn=None):
+        """Reads every student profile in one query."""
+        conn = conn or database.get_connection()
+        rows = conn.execute("SELECT email, cgpa, backlogs, year_gap, branch FROM student_profiles").fetchall()
+        if not rows:
+            return cls([], [], [], [], [])
+        emails, cgpa, backlogs, year_gap, branches = zip(*rows)
+        return cls(emails, cgpa, backlogs, year_gap, branches)
+
+    def mask(self, criteria):
+        """Boolean mask of students meeting a criteria dict (all False when it has no conditions)."""
+        compiled = eligibility.compile_criteria(criteria)
+        if compiled is None:
+            return np.zeros(len(self), dtype=bool)
+        mask = np.ones(len(self), dtype=bool)
+        if compiled['cgpa'] is not None:
+            mask &= self.cgpa >= compiled['cgpa']
+        if compiled['backlogs'] is not None:
+            mask &= self.backlogs <= compiled['backlogs']
+        if compiled['year_gap'] is not None:
+            mask &= self.year_gap <= compiled['year_gap']
+        if compiled['branches'] is not None:
+            codes = [self._branch_lookup[b] for b in compiled['branches'] if b in self._branch_lookup]
+            mask &= np.isin(self.branch_ids, codes)
+        return mask
+
+    def match(self, criteria_list):
+        """Returns one list of eligible emails per criteria dict, in input order."""
+        return [self.emails[self.mask(criteria)].tolist() for criteria in criteria_list]
+
+def match_jobs(criteria_list, conn=None):
+    """
+    Batch counterpart of database.get_students_matching_criteria.
+
+    Args:
+        criteria_list: List of criteria dicts (one per job)
+
+    Returns:
+        List of eligible email lists, aligned with criteria_list
+    """
+    return StudentMatrix.load(conn).match(criteria_list)
@@ -2,6 +2,9 @@
 Branch name mapping and normalization module
 Maps various branch name formats to standardized codes
 """
+import bisect
+import functools
+import itertools
 import re
 
 # Standard branch codes (as stored in database)
@@ -96,9 +99,59 @@ BRANCH_MAPPING = {
     'auto': 'AUTO',
 }
 
+# Fallback patterns for inputs that match no mapping key
+BRANCH_PATTERNS = [
+    (r'computer\s*science', 'CSE'),
+    (r'electronics\s*(?:and\s*)?communication', 'ECE'),
+    (r'information\s*technology', 'IT'),
+    (r'electrical\s*(?:and\s*)?electronics', 'EEE'),
+    (r'mechanical', 'MECH'),
+    (r'civil', 'CIVIL'),
+    (r'aerospace', 'AERO'),
+    (r'biotech', 'BIO'),
+    (r'chemical', 'CHEM'),
+    (r'automobile', 'AUTO'),
+]
+
+# --- Precompiled matchers (built once at import) ---
+# Partial matching keeps the original rule: the first BRANCH_MAPPING key (in
+# dict order) that is contained in the input, or that contains the input, wins.
+_MAPPING_KEYS = list(BRANCH_MAPPING)
+# One lookahead alternation in key order: at every position it reports the
+# lowest-ordered key starting there, so the minimum over all positions is the
+# first key contained anywhere in the input.
+_KEYS_IN_INPUT = re.compile('(?=(' + '|'.join(re.escape(key) for key in _MAPPING_KEYS) + '))')
+_KEY_INDEX = {key: index for index, key in enumerate(_MAPPING_KEYS)}
+# All keys joined in order; the first hit of the input in this string (not
+# crossing a separator) is the first key that contains the input.
+_KEY_SEPARATOR = '\x00'
+_JOINED_KEYS = _KEY_SEPARATOR.join(_MAPPING_KEYS)
+_KEY_OFFSETS = list(itertools.accumulate((len(key) + len(_KEY_SEPARATOR) for key in _MAPPING_KEYS[:-1]),
+                                         initial=0))
+# Same lookahead trick for the fallback patterns: the lowest group number seen
+# at any position is the first pattern (in list order) that matches at all.
+_PATTERN_GROUPS = re.compile('(?=' + '|'.join(f'(?P<p{index}>{pattern})'
+                                              for index, (pattern, _) in enumerate(BRANCH_PATTERNS)) + ')')
+
+def _first_key_in_input(branch_lower):
+    """Index of the first mapping key contained in the input, or None."""
+    indexes = [_KEY_INDEX[match.group(1)] for match in _KEYS_IN_INPUT.finditer(branch_lower)]
+    return min(indexes) if indexes else None
+
+def _first_key_containing_input(branch_lower):
+    """Index of the first mapping key that contains the input, or None."""
+    if _KEY_SEPARATOR in branch_lower:
+        return None
+    position = _JOINED_KEYS.find(branch_lower)
+    if position == -1:
+        return None
+    return bisect.bisect_right(_KEY_OFFSETS, position) - 1
+
+@functools.lru_cache(maxsize=4096)
 def normalize_branch(branch_input):
     """
     Normalize branch name to standard code.
+    Results are memoized, so repeated inputs (bulk imports, JD lists) are a dict hit.
     
     Args:
         branch_input: Branch name in any format (string)
@@ -122,27 +175,16 @@ def normalize_branch(branch_input):
         return BRANCH_CODES[branch_upper]
     
     # Try partial matching for common patterns
-    for key, code in BRANCH_MAPPING.items():
-        if key in branch_lower or branch_lower in key:
-            return code
+    candidates = [index for index in (_first_key_in_input(branch_lower),
+                                      _first_key_containing_input(branch_lower))
+                  if index is not None]
+    if candidates:
+        return BRANCH_MAPPING[_MAPPING_KEYS[min(candidates)]]
     
     # Try to extract from common patterns
-    patterns = [
-        (r'computer\s*science', 'CSE'),
-        (r'electronics\s*(?:and\s*)?communication', 'ECE'),
-        (r'information\s*technology', 'IT'),
-        (r'electrical\s*(?:and\s*)?electronics', 'EEE'),
-        (r'mechanical', 'MECH'),
-        (r'civil', 'CIVIL'),
-        (r'aerospace', 'AERO'),
-        (r'biotech', 'BIO'),
-        (r'chemical', 'CHEM'),
-        (r'automobile', 'AUTO'),
-    ]
-    
-    for pattern, code in patterns:
-        if re.search(pattern, branch_lower):
-            return code
+    groups = [int(match.lastgroup[1:]) for match in _PATTERN_GROUPS.finditer(branch_lower)]
+    if groups:
+        return BRANCH_PATTERNS[min(groups)][1]
     
     return None
 
@@ -1,13 +1,158 @@
 # modules/database.py
 import sqlite3
+import threading
+from contextlib import contextmanager
 import pandas as pd
-from modules import branch_mapper
+from modules import branch_mapper, eligibility
 
 DB_FILE = "placement_users.db"
 
-def init_database():
-    """Initializes all required tables in the database."""
-    conn = sqlite3.connect(DB_FILE)
+# --- Connection pool settings ---
+# Every thread (Streamlit runs each session's script in its own thread) gets one
+# long-lived connection per database file instead of a connect/close per call.
+BUSY_TIMEOUT_SECONDS = 10.0
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",       # Readers no longer block the writer
+    "PRAGMA synchronous = NORMAL",     # Safe with WAL, far fewer fsyncs
+    "PRAGMA cache_size = -20000",      # ~20 MB page cache per connection
+    "PRAGMA mmap_size = 268435456",    # 256 MB memory-mapped I/O
+    "PRAGMA temp_store = MEMORY",
+)
+
+_pool_lock = threading.Lock()
+_connections = {}  # (thread_id, db_file) -> sqlite3.Connection
+_pool_stats = {
+    'connections_opened': 0,
+    'connections_reused': 0,
+    'connections_closed': 0,
+}
+
+def _open_connection(db_file):
+    """Opens a new connection with the pool's pragmas applied."""
+    # check_same_thread=False only so that the pool can close connections left
+    # behind by finished threads; a connection is never shared between live threads.
+    conn = sqlite3.connect(db_file, timeout=BUSY_TIMEOUT_SECONDS, check_same_thread=False)
+    conn.execute(f"PRAGMA busy_timeout = {int(BUSY_TIMEOUT_SECONDS * 1000)}")
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+def _prune_dead_connections():
+    """Closes connections owned by threads that have exited. Caller holds _pool_lock."""
+    alive = {thread.ident for thread in threading.enumerate()}
+    for key in [key for key in _connections if key[0] not in alive]:
+        try:
+            _connections.pop(key).close()
+        except sqlite3.Error:
+            pass
+        _pool_stats['connections_closed'] += 1
+
+def get_connection(db_file=None):
+    """
+    Returns the calling thread's pooled connection to db_file (defaults to DB_FILE).
+    Callers must not close it; commit or rollback as usual.
+    """
+    db_file = db_file or DB_FILE
+    key = (threading.get_ident(), db_file)
+    with _pool_lock:
+        conn = _connections.get(key)
+        if conn is not None:
+            _pool_stats['connections_reused'] += 1
+            return conn
+        _prune_dead_connections()
+        conn = _open_connection(db_file)
+        _connections[key] = conn
+        _pool_stats['connections_opened'] += 1
+        return conn
+
+@contextmanager
+def savepoint(conn, name):
+    """
+    Runs a block of statements as one unit without ending the caller's transaction.
+    Inside an open transaction the block becomes part of it; otherwise it is
+    committed on its own. An error undoes only the block and is re-raised.
+    """
+    conn.execute(f"SAVEPOINT {name}")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute(f"ROLLBACK TO {name}")
+        conn.execute(f"RELEASE {name}")
+        raise
+    conn.execute(f"RELEASE {name}")
+
+def close_all_connections():
+    """Closes every pooled connection (e.g. before replacing the database file)."""
+    with _pool_lock:
+        for conn in _connections.values():
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+            _pool_stats['connections_closed'] += 1
+        _connections.clear()
+
+def get_pool_stats():
+    """Returns a snapshot of the connection pool counters for monitoring."""
+    with _pool_lock:
+        stats = dict(_pool_stats)
+        stats['open_connections'] = len(_connections)
+        stats['threads'] = len({thread_id for thread_id, _ in _connections})
+    total = stats['connections_opened'] + stats['connections_reused']
+    stats['reuse_ratio'] = round(stats['connections_reused'] / total, 4) if total else 0.0
+    return stats
+
+# --- Secondary indexes ---
+# INDEXES is the authoritative index set: sync_indexes() creates the new ones and
+# drops any idx_* index that is no longer listed. New entries also need a
+# migration that creates them by name (see MIGRATIONS below).
+INDEXES = {
+    # Eligibility search: branch IN (...) AND cgpa >= ?
+    'idx_student_profiles_branch_cgpa':
+        "CREATE INDEX IF NOT EXISTS idx_student_profiles_branch_cgpa ON student_profiles (branch, cgpa)",
+    # Eligibility search when the JD has no branch restriction
+    'idx_student_profiles_cgpa':
+        "CREATE INDEX IF NOT EXISTS idx_student_profiles_cgpa ON student_profiles (cgpa)",
+    # Student dashboard: jobs by student_email (second column of the primary key)
+    'idx_eligibility_student_job':
+        "CREATE INDEX IF NOT EXISTS idx_eligibility_student_job ON eligibility (student_email, job_id)",
+    # JD parse cache eviction (oldest entries first)
+    'idx_jd_parse_cache_last_used':
+        "CREATE INDEX IF NOT EXISTS idx_jd_parse_cache_last_used ON jd_parse_cache (last_used_at)",
+    # Placement query answer cache LRU eviction
+    'idx_query_answer_cache_last_used':
+        "CREATE INDEX IF NOT EXISTS idx_query_answer_cache_last_used ON query_answer_cache (last_used_at)",
+    # Job posting queue: next claimable entry by status and retry time
+    'idx_job_queue_status_next':
+        "CREATE INDEX IF NOT EXISTS idx_job_queue_status_next ON job_queue (status, next_attempt_at)",
+}
+
+def create_indexes(conn, names):
+    """Creates the named indexes from INDEXES (used by migrations)."""
+    for name in names:
+        conn.execute(INDEXES[name])
+
+def sync_indexes(conn):
+    """Creates missing indexes from INDEXES and drops obsolete idx_* ones."""
+    cursor = conn.cursor()
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index' AND name LIKE 'idx\\_%' ESCAPE '\\'")
+    existing = {row[0] for row in cursor.fetchall()}
+
+    for name in existing - set(INDEXES):
+        cursor.execute(f"DROP INDEX IF EXISTS {name}")
+    for name, ddl in INDEXES.items():
+        if name not in existing:
+            cursor.execute(ddl)
+    # Refresh planner statistics so the new indexes get picked
+    if set(INDEXES) - existing:
+        cursor.execute("ANALYZE")
+
+# --- Schema migrations ---
+# Each migration runs once, in order, and the applied version is stored in
+# PRAGMA user_version. Never edit a released migration; append a new one.
+
+def _migration_1_base_schema(conn):
+    """Creates the original tables and adds the jobs columns older databases lack."""
     cursor = conn.cursor()
     
     # User table for login (Student or Admin)
@@ -51,27 +196,12 @@ def init_database():
     )
     """)
     
-    # Add new columns to existing jobs table if they don't exist (for migration)
-    try:
-        cursor.execute("ALTER TABLE jobs ADD COLUMN ctc TEXT")
-    except:
-        pass
-    try:
-        cursor.execute("ALTER TABLE jobs ADD COLUMN stipend TEXT")
-    except:
-        pass
-    try:
-        cursor.execute("ALTER TABLE jobs ADD COLUMN last_date TEXT")
-    except:
-        pass
-    try:
-        cursor.execute("ALTER TABLE jobs ADD COLUMN company_description TEXT")
-    except:
-        pass
-    try:
-        cursor.execute("ALTER TABLE jobs ADD COLUMN pdf_path TEXT")
-    except:
-        pass
+    # Jobs tables created before these columns existed need them added
+    cursor.execute("PRAGMA table_info(jobs)")
+    existing_columns = {row[1] for row in cursor.fetchall()}
+    for column in ('ctc', 'stipend', 'last_date', 'company_description', 'pdf_path'):
+        if column not in existing_columns:
+            cursor.execute(f"ALTER TABLE jobs ADD COLUMN {column} TEXT")
 
     # Eligibility mapping table (many-to-many)
     cursor.execute("""
@@ -84,12 +214,174 @@ def init_database():
     )
     """)
 
-    conn.commit()
-    conn.close()
+def _migration_2_indexes(conn):
+    """Adds the secondary indexes used by eligibility lookups."""
+    # Spelled out rather than taken from INDEXES, so this migration does the same thing in every release
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_student_profiles_branch_cgpa ON student_profiles (branch, cgpa)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_student_profiles_cgpa ON student_profiles (cgpa)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_eligibility_student_job ON eligibility (student_email, job_id)")
+    conn.execute("ANALYZE")
+
+def _migration_3_jd_parse_cache(conn):
+    """Adds the persistent cache for Gemini JD parsing results."""
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS jd_parse_cache (
+        cache_key TEXT PRIMARY KEY,  -- sha256 of model + prompt version + normalized JD
+        model TEXT NOT NULL,
+        prompt_version INTEGER NOT NULL,
+        criteria_json TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        last_used_at REAL NOT NULL,
+        hit_count INTEGER NOT NULL DEFAULT 0
+    )
+    """)
+    create_indexes(conn, ('idx_jd_parse_cache_last_used',))
+
+def _migration_4_query_answer_cache(conn):
+    """Adds the persistent cache for Voice Query Engine answers."""
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS query_answer_cache (
+        cache_key TEXT PRIMARY KEY,  -- sha256 of normalized query + data fingerprint
+        normalized_query TEXT NOT NULL,
+        data_fingerprint TEXT NOT NULL,
+        answer_json TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        last_used_at REAL NOT NULL,
+        hit_count INTEGER NOT NULL DEFAULT 0
+    )
+    """)
+    create_indexes(conn, ('idx_query_answer_cache_last_used',))
+
+def _migration_5_job_queue(conn):
+    """Adds the durable queue for Admin Panel job postings (see modules/job_queue.py)."""
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS job_queue (
+        queue_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        company_name TEXT NOT NULL,
+        job_description TEXT NOT NULL,
+        posted_by_email TEXT,
+        pdf_path TEXT,
+        status TEXT NOT NULL DEFAULT 'queued' CHECK(status IN ('queued', 'running', 'done', 'failed')),
+        stage TEXT,  -- parse, match or persist
+        attempts INTEGER NOT NULL DEFAULT 0,
+        criteria_json TEXT,  -- parse stage output
+        parse_message TEXT,
+        eligible_json TEXT,  -- match stage output
+        eligible_count INTEGER,
+        job_id INTEGER,  -- persist stage output
+        error TEXT,
+        created_at REAL NOT NULL,
+        updated_at REAL NOT NULL,
+        next_attempt_at REAL NOT NULL DEFAULT 0,
+        lease_until REAL,  -- a running entry whose lease expired is claimed again
+        FOREIGN KEY (job_id) REFERENCES jobs (job_id)
+    )
+    """)
+    create_indexes(conn, ('idx_job_queue_status_next',))
+
+def _migration_6_job_queue_review(conn):
+    """
+    Parsed postings wait for an admin's approval before they are saved:
+    adds the 'review' and 'rejected' statuses and approved_at. SQLite cannot
+    change a CHECK constraint in place, so the table is rebuilt.
+    """
+    conn.execute("""
+    CREATE TABLE job_queue_new (
+        queue_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        company_name TEXT NOT NULL,
+        job_description TEXT NOT NULL,
+        posted_by_email TEXT,
+        pdf_path TEXT,
+        status TEXT NOT NULL DEFAULT 'queued'
+            CHECK(status IN ('queued', 'running', 'review', 'done', 'failed', 'rejected')),
+        stage TEXT,  -- parse, match or persist
+        attempts INTEGER NOT NULL DEFAULT 0,
+        criteria_json TEXT,  -- parse stage output
+        parse_message TEXT,
+        eligible_json TEXT,  -- match stage output
+        eligible_count INTEGER,
+        approved_at REAL,  -- set by the admin; persist runs only after it
+        job_id INTEGER,  -- persist stage output
+        error TEXT,
+        created_at REAL NOT NULL,
+        updated_at REAL NOT NULL,
+        next_attempt_at REAL NOT NULL DEFAULT 0,
+        lease_until REAL,  -- a running entry whose lease expired is claimed again
+        FOREIGN KEY (job_id) REFERENCES jobs (job_id)
+    )
+    """)
+    columns = ("queue_id, company_name, job_description, posted_by_email, pdf_path, status, stage, attempts, "
+               "criteria_json, parse_message, eligible_json, eligible_count, job_id, error, created_at, updated_at, "
+               "next_attempt_at, lease_until")
+    # Entries already saved or past matching were posted without review under the old flow; keep them as they are
+    conn.execute(f"INSERT INTO job_queue_new ({columns}, approved_at) "
+                 f"SELECT {columns}, CASE WHEN job_id IS NOT NULL THEN updated_at END FROM job_queue")
+    conn.execute("DROP TABLE job_queue")
+    conn.execute("ALTER TABLE job_queue_new RENAME TO job_queue")
+    create_indexes(conn, ('idx_job_queue_status_next',))
+
+def _migration_7_sync_indexes(conn):
+    """
+    Brings every database to the full INDEXES set, whichever release of
+    migration 2 it ran, and drops idx_* indexes that are no longer listed.
+    """
+    sync_indexes(conn)
+
+MIGRATIONS = [
+    (1, _migration_1_base_schema),
+    (2, _migration_2_indexes),
+    (3, _migration_3_jd_parse_cache),
+    (4, _migration_4_query_answer_cache),
+    (5, _migration_5_job_queue),
+    (6, _migration_6_job_queue_review),
+    (7, _migration_7_sync_indexes),
+]
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+_migrated_db_files = set()
+
+def get_schema_version(conn):
+    """Returns the migration version recorded in the database."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def run_migrations(conn):
+    """
+    Applies pending migrations in a single write transaction.
+    Returns the list of migration versions that were applied.
+    """
+    # Steady state: a single read, no write lock
+    if get_schema_version(conn) >= SCHEMA_VERSION:
+        return []
+
+    if conn.in_transaction:
+        conn.commit()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # Another process may have migrated while we waited for the lock
+        current_version = get_schema_version(conn)
+        applied = []
+        for version, migration in MIGRATIONS:
+            if version > current_version:
+                migration(conn)
+                applied.append(version)
+        if applied:
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        conn.commit()
+        return applied
+    except Exception:
+        conn.rollback()
+        raise
+
+def init_database():
+    """Brings the database schema up to date. A no-op once this process has migrated it."""
+    if DB_FILE in _migrated_db_files:
+        return
+    run_migrations(get_connection())
+    _migrated_db_files.add(DB_FILE)
 
 def add_user_and_profile(email, hashed_password, role, profile_data):
     """Adds a new user and their profile (if student) in a single transaction."""
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     try:
         # Add to users table
@@ -112,6 +404,8 @@ def add_user_and_profile(email, hashed_password, role, profile_data):
                 profile_data['year_gap'],
                 profile_data['backlogs']
             ))
+            # Make existing open jobs visible to the new student right away
+            eligibility.update_student_eligibility(conn, DB_FILE, email, profile_data, remove_stale=False)
         
         conn.commit()
         return True, "Registration successful!"
@@ -121,27 +415,117 @@ def add_user_and_profile(email, hashed_password, role, profile_data):
     except Exception as e:
         conn.rollback()
         return False, f"An error occurred: {e}"
-    finally:
-        conn.close()
+
+STUDENT_PROFILE_COLUMNS = ('roll_number', 'full_name', 'cgpa', 'branch', 'class_10_perc',
+                           'class_12_perc', 'year_gap', 'backlogs')
+
+def get_existing_emails(emails):
+    """Returns the subset of the given emails that already have an account."""
+    conn = get_connection()
+    emails = list(emails)
+    existing = set()
+    # Stay well under SQLite's bound-parameter limit
+    for start in range(0, len(emails), 500):
+        batch = emails[start:start + 500]
+        placeholders = ', '.join('?' for _ in batch)
+        rows = conn.execute(f"SELECT email FROM users WHERE email IN ({placeholders})", batch).fetchall()
+        existing.update(row[0] for row in rows)
+    return existing
+
+def add_students_bulk(students):
+    """
+    Adds many students in a single transaction.
+    'students' is a list of (email, hashed_password, profile_data) tuples.
+    Emails that are already registered are skipped rather than failing the batch.
+    Returns (number_inserted, list_of_skipped_emails).
+    """
+    conn = get_connection()
+    try:
+        # Take the write lock up front so the duplicate check below stays valid
+        if conn.in_transaction:
+            conn.commit()
+        conn.execute("BEGIN IMMEDIATE")
+        existing = get_existing_emails(email for email, _, _ in students)
+
+        seen = set()
+        users_rows = []
+        profile_rows = []
+        inserted = []
+        skipped = []
+        for email, hashed_password, profile_data in students:
+            if email in existing or email in seen:
+                skipped.append(email)
+                continue
+            seen.add(email)
+            inserted.append((email, profile_data))
+            users_rows.append((email, hashed_password, 'student'))
+            profile_rows.append((email,) + tuple(profile_data[column] for column in STUDENT_PROFILE_COLUMNS))
+
+        conn.executemany("INSERT INTO users (email, hashed_password, role) VALUES (?, ?, ?)", users_rows)
+        conn.executemany(f"""
+        INSERT INTO student_profiles (email, {', '.join(STUDENT_PROFILE_COLUMNS)})
+        VALUES ({', '.join('?' for _ in range(len(STUDENT_PROFILE_COLUMNS) + 1))})
+        """, profile_rows)
+        for email, profile_data in inserted:
+            eligibility.update_student_eligibility(conn, DB_FILE, email, profile_data, remove_stale=False)
+        conn.commit()
+        return len(users_rows), skipped
+    except Exception:
+        conn.rollback()
+        raise
+
+def get_student_profile(email):
+    """Returns a student's profile as a dict, or None if they have none."""
+    row = get_connection().execute(f"SELECT {', '.join(STUDENT_PROFILE_COLUMNS)} FROM student_profiles WHERE email = ?",
+                                   (email,)).fetchone()
+    return dict(zip(STUDENT_PROFILE_COLUMNS, row)) if row else None
+
+def update_student_profile(email, profile_data):
+    """
+    Updates a student's profile and incrementally recomputes their eligibility
+    for open jobs in the same transaction.
+    """
+    conn = get_connection()
+    try:
+        columns = [column for column in STUDENT_PROFILE_COLUMNS if column in profile_data]
+        if columns:
+            assignments = ', '.join(f"{column} = ?" for column in columns)
+            cursor = conn.execute(f"UPDATE student_profiles SET {assignments} WHERE email = ?",
+                                  [profile_data[column] for column in columns] + [email])
+            if cursor.rowcount == 0:
+                conn.rollback()
+                return False, "No student profile found for this email."
+
+        row = conn.execute(f"SELECT {', '.join(STUDENT_PROFILE_COLUMNS)} FROM student_profiles WHERE email = ?",
+                           (email,)).fetchone()
+        if row is None:
+            return False, "No student profile found for this email."
+        eligibility.update_student_eligibility(conn, DB_FILE, email, dict(zip(STUDENT_PROFILE_COLUMNS, row)))
+        conn.commit()
+        return True, "Profile updated successfully!"
+    except Exception as e:
+        conn.rollback()
+        return False, f"An error occurred: {e}"
 
 def get_user(email):
     """Fetches a user's login details (password, role)."""
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     cursor.execute("SELECT hashed_password, role FROM users WHERE email = ?", (email,))
     user = cursor.fetchone()
-    conn.close()
     return user  # Returns (hashed_password, role) or None
 
-def get_students_matching_criteria(criteria):
+def update_password_hash(email, hashed_password):
+    """Stores a new hash for an existing user (e.g. one rehashed at a new bcrypt cost)."""
+    conn = get_connection()
+    conn.execute("UPDATE users SET hashed_password = ? WHERE email = ?", (hashed_password, email))
+    conn.commit()
+
+def build_student_criteria_query(criteria):
     """
-    Finds students who meet the criteria parsed from the JD.
-    'criteria' is a dict, e.g.:
-    {'cgpa': 7.5, 'branches': ['CSE', 'ECE'], 'backlogs': 0, 'year_gap': 1}
+    Builds the parameterized student_profiles query for a criteria dict.
+    Returns (query, params), or (None, []) when there are no usable criteria.
     """
-    conn = sqlite3.connect(DB_FILE)
-    
-    # Base query
     query = "SELECT * FROM student_profiles WHERE "
     conditions = []
     params = []
@@ -167,62 +551,119 @@ def get_students_matching_criteria(criteria):
             params.extend(normalized_branches)
 
     if not conditions:
+        return None, []
+
+    return query + " AND ".join(conditions), params
+
+def get_students_matching_criteria(criteria):
+    """
+    Finds students who meet the criteria parsed from the JD.
+    'criteria' is a dict, e.g.:
+    {'cgpa': 7.5, 'branches': ['CSE', 'ECE'], 'backlogs': 0, 'year_gap': 1}
+    """
+    query, params = build_student_criteria_query(criteria)
+    if query is None:
         return pd.DataFrame() # No criteria, return empty
 
-    query += " AND ".join(conditions)
-    
+    conn = get_connection()
     try:
         df = pd.read_sql_query(query, conn, params=params)
         return df
     except Exception as e:
         print(f"Error querying students: {e}")
         return pd.DataFrame()
-    finally:
-        conn.close()
+
+def insert_job_and_eligibility(cursor, company, jd, criteria_json, eligible_student_emails, admin_email,
+                               ctc=None, stipend=None, last_date=None, company_description=None, pdf_path=None):
+    """Inserts the job and its eligibility rows without committing; returns the new job_id."""
+    # 1. Save the job
+    cursor.execute("""
+    INSERT INTO jobs (company_name, job_description, criteria_json, posted_by_email, 
+                     ctc, stipend, last_date, company_description, pdf_path)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, (company, jd, criteria_json, admin_email, ctc, stipend, last_date, company_description, pdf_path))
+    
+    job_id = cursor.lastrowid
+    
+    # 2. Link eligible students
+    eligibility_data = [(job_id, email) for email in eligible_student_emails]
+    cursor.executemany("INSERT INTO eligibility (job_id, student_email) VALUES (?, ?)", eligibility_data)
+    return job_id
 
 def save_job_and_eligibility(company, jd, criteria_json, eligible_student_emails, admin_email, 
                             ctc=None, stipend=None, last_date=None, company_description=None, pdf_path=None):
     """Saves the job and links all eligible students to it."""
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     cursor = conn.cursor()
     try:
-        # 1. Save the job
-        cursor.execute("""
-        INSERT INTO jobs (company_name, job_description, criteria_json, posted_by_email, 
-                         ctc, stipend, last_date, company_description, pdf_path)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (company, jd, criteria_json, admin_email, ctc, stipend, last_date, company_description, pdf_path))
-        
-        job_id = cursor.lastrowid
-        
-        # 2. Link eligible students
-        eligibility_data = [(job_id, email) for email in eligible_student_emails]
-        cursor.executemany("INSERT INTO eligibility (job_id, student_email) VALUES (?, ?)", eligibility_data)
-        
+        job_id = insert_job_and_eligibility(cursor, company, jd, criteria_json, eligible_student_emails,
+                                            admin_email, ctc=ctc, stipend=stipend, last_date=last_date,
+                                            company_description=company_description, pdf_path=pdf_path)
         conn.commit()
         return True, job_id
     except Exception as e:
         conn.rollback()
         return False, str(e)
-    finally:
-        conn.close()
 
-def get_eligible_jobs_for_student(student_email):
-    """Fetches all jobs a specific student is eligible for."""
-    conn = sqlite3.connect(DB_FILE)
-    query = """
+ELIGIBLE_JOBS_QUERY = """
     SELECT j.company_name, j.job_description, j.criteria_json, j.ctc, j.stipend, 
            j.last_date, j.company_description, j.pdf_path
     FROM jobs j
     JOIN eligibility e ON j.job_id = e.job_id
     WHERE e.student_email = ?
-    ORDER BY j.job_id DESC
+    ORDER BY e.job_id DESC
     """
+
+def get_eligible_jobs_for_student(student_email):
+    """Fetches all jobs a specific student is eligible for."""
+    conn = get_connection()
     try:
-        df = pd.read_sql_query(query, conn, params=(student_email,))
+        df = pd.read_sql_query(ELIGIBLE_JOBS_QUERY, conn, params=(student_email,))
         return df
     except Exception as e:
         print(f"Error fetching jobs: {e}")
         return pd.DataFrame()
-    finally:
-        conn.close()
\ No newline at end of file
+
+def count_eligible_jobs_for_student(student_email):
+    """Counts the jobs a student is eligible for (index-only lookup)."""
+    conn = get_connection()
+    row = conn.execute("SELECT COUNT(*) FROM eligibility WHERE student_email = ?", (student_email,)).fetchone()
+    return row[0]
+
+def build_eligible_jobs_page_query(student_email, before_job_id=None, page_size=10):
+    """
+    Builds the keyset query behind get_eligible_jobs_page; returns (query, params).
+    It fetches one row more than page_size, which tells whether another page exists.
+    """
+    query = """
+    SELECT j.job_id, j.company_name, j.ctc, j.stipend, j.last_date,
+           j.company_description, j.pdf_path
+    FROM eligibility e
+    JOIN jobs j ON j.job_id = e.job_id
+    WHERE e.student_email = ?
+    """
+    params = [student_email]
+    if before_job_id is not None:
+        query += " AND e.job_id < ?"
+        params.append(before_job_id)
+    query += " ORDER BY e.job_id DESC LIMIT ?"
+    params.append(page_size + 1)
+    return query, params
+
+def get_eligible_jobs_page(student_email, before_job_id=None, page_size=10):
+    """
+    Fetches one page of a student's eligible jobs, newest first, using keyset
+    pagination on job_id. Only the columns the dashboard displays are selected.
+    Returns (DataFrame, next_before_job_id); the cursor is None on the last page.
+    """
+    conn = get_connection()
+    query, params = build_eligible_jobs_page_query(student_email, before_job_id, page_size)
+    try:
+        df = pd.read_sql_query(query, conn, params=params)
+    except Exception as e:
+        print(f"Error fetching jobs: {e}")
+        return pd.DataFrame(), None
+    if len(df) > page_size:
+        df = df.iloc[:page_size]
+        return df, int(df['job_id'].iloc[-1])
+    return df, None
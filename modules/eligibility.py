@@ -0,0 +1,141 @@
+"""
+Incremental eligibility engine.
+Keeps an in-memory index of every posted job's criteria so that a single
+student can be matched against all open jobs without re-querying them,
+and upserts the result into the eligibility table.
+"""
+import json
+import re
+import threading
+from datetime import date, datetime
+from modules import branch_mapper
+
+_DATE_FORMATS = ('%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y', '%d.%m.%Y', '%d %B %Y', '%d %b %Y',
+                 '%B %d %Y', '%b %d %Y', '%d/%m/%y')
+
+_index_lock = threading.Lock()
+_indexes = {}  # db_file -> {'max_job_id': int, 'jobs': {job_id: compiled criteria}}
+
+def _to_number(value):
+    """Mirrors SQLite's numeric comparison: unparsable thresholds match nobody."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float('nan')
+
+def parse_last_date(last_date):
+    """Parses the free-text last date of a job; returns None when it cannot be read."""
+    if not last_date:
+        return None
+    text = re.sub(r'(\d)(st|nd|rd|th)\b', r'\1', str(last_date).strip(), flags=re.IGNORECASE)
+    text = re.sub(r'\bof\b|,', ' ', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    for date_format in _DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format).date()
+        except ValueError:
+            continue
+    return None
+
+def compile_criteria(criteria, last_date=None):
+    """
+    Prepares a criteria dict for fast repeated matching.
+    Returns None when the criteria have no usable condition, in which case
+    get_students_matching_criteria matches nobody either.
+    """
+    compiled = {
+        'cgpa': _to_number(criteria.get('cgpa')),
+        'backlogs': _to_number(criteria.get('backlogs')),
+        'year_gap': _to_number(criteria.get('year_gap')),
+        'branches': None,
+        'last_date': parse_last_date(last_date or criteria.get('last_date')),
+    }
+    if criteria.get('branches'):
+        normalized = branch_mapper.normalize_branch_list(criteria['branches'])
+        if normalized:
+            compiled['branches'] = frozenset(normalized)
+    if all(compiled[key] is None for key in ('cgpa', 'backlogs', 'year_gap', 'branches')):
+        return None
+    return compiled
+
+def student_matches(profile, compiled):
+    """Same conditions as database.build_student_criteria_query, evaluated in Python."""
+    def value(key):
+        try:
+            return float(profile.get(key))
+        except (TypeError, ValueError):
+            # Missing or unreadable, e.g. "N/A": treated like NULL
+            return None
+
+    # NULL profile values fail every comparison, exactly as in SQL
+    if compiled['cgpa'] is not None:
+        cgpa = value('cgpa')
+        if cgpa is None or not cgpa >= compiled['cgpa']:
+            return False
+    if compiled['backlogs'] is not None:
+        backlogs = value('backlogs')
+        if backlogs is None or not backlogs <= compiled['backlogs']:
+            return False
+    if compiled['year_gap'] is not None:
+        year_gap = value('year_gap')
+        if year_gap is None or not year_gap <= compiled['year_gap']:
+            return False
+    if compiled['branches'] is not None and profile.get('branch') not in compiled['branches']:
+        return False
+    return True
+
+def _get_index(conn, db_file):
+    """Returns the criteria index for db_file, loading only jobs posted since the last call."""
+    with _index_lock:
+        index = _indexes.setdefault(db_file, {'max_job_id': 0, 'jobs': {}})
+        rows = conn.execute(
+            "SELECT job_id, criteria_json, last_date FROM jobs WHERE job_id > ? ORDER BY job_id",
+            (index['max_job_id'],)
+        ).fetchall()
+        for job_id, criteria_json, last_date in rows:
+            try:
+                criteria = json.loads(criteria_json) if criteria_json else {}
+            except ValueError:
+                criteria = {}
+            compiled = compile_criteria(criteria, last_date) if isinstance(criteria, dict) else None
+            if compiled is not None:
+                index['jobs'][job_id] = compiled
+            index['max_job_id'] = job_id
+        return index
+
+def get_open_jobs(conn, db_file, today=None):
+    """Returns {job_id: compiled criteria} for jobs whose last date has not passed."""
+    today = today or date.today()
+    index = _get_index(conn, db_file)
+    with _index_lock:
+        return {job_id: compiled for job_id, compiled in index['jobs'].items()
+                if compiled['last_date'] is None or compiled['last_date'] >= today}
+
+def reset_index(db_file=None):
+    """Forgets the cached criteria (all databases when db_file is None)."""
+    with _index_lock:
+        if db_file is None:
+            _indexes.clear()
+        else:
+            _indexes.pop(db_file, None)
+
+def update_student_eligibility(conn, db_file, email, profile, remove_stale=True):
+    """
+    Re-evaluates one student against every open job and upserts the result.
+    Runs inside the caller's transaction; the caller commits.
+    remove_stale=False skips the delete pass for brand-new students.
+    Returns the list of job_ids the student is now eligible for.
+    """
+    open_jobs = get_open_jobs(conn, db_file)
+    matched = [job_id for job_id, compiled in open_jobs.items() if student_matches(profile, compiled)]
+
+    conn.executemany("INSERT OR IGNORE INTO eligibility (job_id, student_email) VALUES (?, ?)",
+                     [(job_id, email) for job_id in matched])
+    if remove_stale:
+        # A profile edit can also make a student ineligible for an open job
+        matched_ids = set(matched)
+        conn.executemany("DELETE FROM eligibility WHERE job_id = ? AND student_email = ?",
+                         [(job_id, email) for job_id in open_jobs if job_id not in matched_ids])
+    return matched
@@ -0,0 +1,153 @@
+# modules/fake_llm.py
+"""
+Offline stand-in for Gemini and OpenAI, plugged into the LLM gateway as its
+transport (LLM_BACKEND=fake, or llm_client.set_gateway in a harness).
+
+Answers are canned and shaped like the real ones, so every LLM-driven path
+(JD parsing, SQL generation, resume analysis, mock interview questions and
+grading) runs end to end without network access:
+
+    latency   log-normal around FAKE_LLM_LATENCY_MS (spread FAKE_LLM_LATENCY_SIGMA),
+              the first chunk after a fraction of it, like a streamed answer
+    errors    FAKE_LLM_ERROR_RATE of calls fail with a 429 or 503
+    answers   built-in canned JSON/SQL/text, or the first matching entry of
+              FAKE_LLM_RESPONSES_FILE: [{"match": regex, "response": str or JSON}]
+
+Everything is seeded from FAKE_LLM_SEED, the prompt and how often that
+prompt was asked before, so a run is reproducible whatever the thread timing.
+"""
+import hashlib
+import itertools
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+
+FAKE_KEYS = ["fake-key-1", "fake-key-2"]
+
+class FakeLLMError(Exception):
+    """A simulated API failure; status_code is what the gateway classifies."""
+
+    def __init__(self, status_code, message):
+        super().__init__(f"{status_code} {message}")
+        self.status_code = status_code
+
+def _criteria(rng):
+    return {
+        'cgpa': rng.choice([None, 6.0, 6.5, 7.0, 7.5, 8.0]),
+        'branches': rng.choice([[], ["CSE"], ["CSE", "IT"], ["CSE", "ECE", "EEE"]]),
+        'backlogs': rng.choice([None, 0, 1]),
+        'year_gap': rng.choice([None, 0, 1]),
+        'ctc': f"{rng.randint(4, 30)} LPA",
+        'stipend': rng.choice([None, "30k/month", "50k/month"]),
+        'last_date': None,
+        'company_description': "A technology company hiring fresh graduates.",
+    }
+
+def _questions(rng):
+    sections = ["technical", "core_concepts", "projects", "hr", "company_specific"]
+    return {section: [f"Sample {section.replace('_', ' ')} question {i + 1}?" for i in range(3)]
+            for section in sections}
+
+def _evaluation(rng):
+    return {'score': rng.randint(4, 9), 'feedback': "Clear answer; add a concrete example.",
+            'suggestions': ["Quantify the impact", "Mention the trade-offs"]}
+
+def _batch_evaluation(prompt, rng):
+    ids = re.findall(r'"id":\s*"?([^",\n}]+)"?', prompt)
+    return {item_id: _evaluation(rng) for item_id in ids}
+
+def _text(rng, words=120):
+    vocabulary = ["Python", "SQL", "projects", "experience", "teamwork", "cloud", "machine learning", "APIs",
+                  "communication", "internship", "leadership", "testing", "data structures", "Git"]
+    return " ".join(rng.choice(vocabulary) for _ in range(words)) + "."
+
+# (pattern over system + prompt, answer builder) in priority order
+CANNED = [
+    (re.compile(r'SQLite SELECT'),
+     lambda prompt, rng: "SELECT Company, Month, Average_CTC_LPA FROM companies ORDER BY Average_CTC_LPA DESC LIMIT 10"),
+    (re.compile(r'HR data extractor'), lambda prompt, rng: json.dumps(_criteria(rng))),
+    (re.compile(r'generate 3 interview questions'), lambda prompt, rng: json.dumps(_questions(rng))),
+    (re.compile(r"Evaluate each of the candidate's answers"),
+     lambda prompt, rng: json.dumps(_batch_evaluation(prompt, rng))),
+    (re.compile(r'Evaluate this answer'), lambda prompt, rng: json.dumps(_evaluation(rng))),
+]
+
+class FakeLLM:
+    """
+    Gateway transport: callable(provider, model, prompt, system, api_key, temperature) -> chunks.
+
+    Args:
+        latency_ms: Median total response time
+        latency_sigma: Log-normal spread (0 gives a constant latency)
+        error_rate: Share of calls that fail with 429 (70%) or 503 (30%)
+        seed: Makes runs reproducible
+        responses: Extra [(regex, response)] checked before the built-in answers
+        chunk_words: Words per streamed chunk
+    """
+
+    def __init__(self, latency_ms=800, latency_sigma=0.5, error_rate=0.0, seed=0, responses=None, chunk_words=8):
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.seed = seed
+        self.responses = [(re.compile(pattern), response) for pattern, response in (responses or [])]
+        self.chunk_words = chunk_words
+        self._lock = threading.Lock()
+        self._asked = {}  # prompt digest -> calls so far
+        self._calls = itertools.count(1)
+        self.calls = 0
+
+    @classmethod
+    def from_env(cls):
+        responses = []
+        path = os.getenv("FAKE_LLM_RESPONSES_FILE")
+        if path:
+            with open(path, encoding="utf-8") as f:
+                for entry in json.load(f):
+                    response = entry["response"]
+                    responses.append((entry["match"], response if isinstance(response, str) else json.dumps(response)))
+        return cls(latency_ms=float(os.getenv("FAKE_LLM_LATENCY_MS", "800")),
+                   latency_sigma=float(os.getenv("FAKE_LLM_LATENCY_SIGMA", "0.5")),
+                   error_rate=float(os.getenv("FAKE_LLM_ERROR_RATE", "0")),
+                   seed=int(os.getenv("FAKE_LLM_SEED", "0")),
+                   responses=responses)
+
+    def _rng(self, provider, model, prompt, system):
+        digest = hashlib.sha256(f"{provider}\n{model}\n{system}\n{prompt}".encode("utf-8")).hexdigest()
+        with self._lock:
+            attempt = self._asked.get(digest, 0)
+            self._asked[digest] = attempt + 1
+            self.calls = next(self._calls)
+        return random.Random(f"{self.seed}:{digest}:{attempt}")
+
+    def answer(self, prompt, system, rng):
+        text = f"{system or ''}\n{prompt}"
+        for pattern, response in self.responses:
+            if pattern.search(text):
+                return response
+        for pattern, build in CANNED:
+            if pattern.search(text):
+                return build(prompt, rng)
+        return _text(rng)
+
+    def __call__(self, provider, model, prompt, system=None, api_key=None, temperature=None):
+        rng = self._rng(provider, model, prompt, system)
+        latency = self.latency_ms / 1000.0 * math.exp(self.latency_sigma * rng.gauss(0, 1))
+        if rng.random() < self.error_rate:
+            time.sleep(latency * 0.1)
+            if rng.random() < 0.7:
+                raise FakeLLMError(429, "Resource exhausted (fake)")
+            raise FakeLLMError(503, "Service unavailable (fake)")
+        text = self.answer(prompt, system, rng)
+        words = text.split(" ")
+        chunks = [" ".join(words[i:i + self.chunk_words]) for i in range(0, len(words), self.chunk_words)]
+        # A third of the latency before the first chunk, the rest spread over the stream
+        time.sleep(latency / 3)
+        pause = (latency * 2 / 3) / max(len(chunks), 1)
+        for index, chunk in enumerate(chunks):
+            yield chunk if index == len(chunks) - 1 else chunk + " "
+            time.sleep(pause)
@@ -1,22 +1,37 @@
 # modules/gemini_parser.py
-import google.generativeai as genai
-import os
 import json
 import re
-from modules import branch_mapper
+from modules import branch_mapper, jd_cache, jd_rules, llm_client
+
+MODEL_NAME = 'gemini-2.5-flash'
+# Bump whenever the extraction prompt changes so stale cached results are not reused
+PROMPT_VERSION = 1
+# Minimum confidence for the local rule-based result to be used without Gemini
+RULES_MIN_CONFIDENCE = 0.8
+
+def extract_criteria(jd_text, min_confidence=RULES_MIN_CONFIDENCE):
+    """
+    Extracts JD criteria, trying the local rule-based parser first.
+    Falls back to Gemini only when the rules are not confident enough.
+    """
+    criteria, confidence = jd_rules.extract_criteria(jd_text)
+    if confidence >= min_confidence:
+        return criteria, f"Parsed locally (rule confidence {confidence:.0%})."
+    return get_gemini_json_response(jd_text)
 
 def get_gemini_json_response(jd_text):
     """
     Sends the JD to Gemini and asks for structured JSON output.
+    Results are cached by JD content, so re-running the same JD skips the API call.
     """
-    # Configure the API (assumes GOOGLE_API_KEY is in .env)
-    try:
-        genai.configure(api_key=os.getenv("GEMINI_API_KEY_1") or os.getenv("GOOGLE_API_KEY"))
-    except Exception as e:
-        return None, f"Error configuring Gemini API: {e}. Make sure API key is in .env."
+    cached = jd_cache.get(jd_text, MODEL_NAME, PROMPT_VERSION)
+    if cached is not None:
+        return cached, "Loaded criteria from cache."
+
+    # Assumes GEMINI_API_KEY_1 or GOOGLE_API_KEY is in .env
+    if not llm_client.default_api_key(llm_client.GEMINI):
+        return None, "Error configuring Gemini API: no API key found. Make sure API key is in .env."
 
-    model = genai.GenerativeModel('gemini-2.5-flash') # Use a model good at JSON
-    
     prompt = f"""
     You are an expert HR data extractor. From the following job description, extract all relevant information.
     Return *only* a valid JSON object. Do not include any text before or after the JSON.
@@ -38,8 +53,7 @@ def get_gemini_json_response(jd_text):
     """
     
     try:
-        response = model.generate_content(prompt)
-        text = response.text.strip()
+        text = llm_client.complete(llm_client.GEMINI, MODEL_NAME, prompt).strip()
         
         # Clean the response to find the JSON
         match = re.search(r'\{.*\}', text, re.DOTALL)
@@ -68,6 +82,7 @@ def get_gemini_json_response(jd_text):
             normalized_branches = branch_mapper.normalize_branch_list(default_criteria['branches'])
             default_criteria['branches'] = normalized_branches
 
+        jd_cache.put(jd_text, MODEL_NAME, PROMPT_VERSION, default_criteria)
         return default_criteria, "Successfully parsed criteria."
 
     except json.JSONDecodeError:
@@ -0,0 +1,191 @@
+# modules/interview.py
+"""
+Mock interview question generation and answer evaluation.
+EvaluationQueue grades submitted answers on a background thread, batching
+answers that arrive close together into one Gemini call, so the candidate
+moves straight on to the next question instead of waiting for feedback.
+"""
+import json
+import queue
+import threading
+import time
+from modules import llm_client
+
+MODEL_NAME = "gemini-2.5-flash"
+SECTIONS = [
+    ("Technical", "technical"),
+    ("Core Concepts", "core_concepts"),
+    ("Projects", "projects"),
+    ("HR", "hr"),
+    ("Company Specific", "company_specific"),
+]
+
+def safe_parse_json(text: str):
+    try:
+        return json.loads(text)
+    except Exception:
+        start = text.find('{')
+        end = text.rfind('}')
+        if start != -1 and end != -1 and end > start:
+            try:
+                return json.loads(text[start:end+1])
+            except ValueError:
+                return None
+        return None
+
+def _ask(prompt, api_key=None, on_update=None):
+    chunks = llm_client.stream(llm_client.GEMINI, MODEL_NAME, prompt, api_key=api_key)
+    return llm_client.collect(chunks, on_update=on_update)
+
+def generate_questions(jd, api_key=None, on_update=None):
+    prompt = (
+        "You are an expert interview coach. Based ONLY on the job description (JD) below, "
+        "generate 3 interview questions each in the sections: technical, core_concepts, projects, hr, company_specific.\n"
+        "Return EXACT JSON with keys and 3 questions as lists:\n"
+        '{ "technical": [...], "core_concepts": [...], "projects": [...], "hr": [...], "company_specific": [...] }\n\n'
+        f"JD:\n{jd}\n"
+    )
+    return safe_parse_json(_ask(prompt, api_key, on_update) or "")
+
+def evaluate_text_answer(section, jd, question, answer, api_key=None, on_update=None):
+    prompt = (
+        f"You are an expert interviewer. Evaluate this answer:\n"
+        f"Section: {section}\nJob Description:\n{jd}\nQuestion:\n{question}\nAnswer:\n{answer}\n"
+        "Return JSON with score (1-10), feedback (text), and suggestions (list of strings)."
+    )
+    return safe_parse_json(_ask(prompt, api_key, on_update) or "") or {}
+
+def evaluate_answers_batch(jd, items, api_key=None):
+    """
+    Evaluates several answers in one call.
+    items: [{'id', 'section', 'question', 'answer'}]; returns {id: feedback dict}
+    for the answers the model graded (missing ids are left to the caller).
+    """
+    answers = json.dumps([{key: item[key] for key in ('id', 'section', 'question', 'answer')} for item in items],
+                         indent=1)
+    prompt = (
+        "You are an expert interviewer. Evaluate each of the candidate's answers below "
+        "for this job description.\n"
+        f"Job Description:\n{jd}\n\nAnswers (JSON list):\n{answers}\n\n"
+        "Return EXACT JSON: an object mapping each answer's id to an object with "
+        "score (1-10), feedback (text), and suggestions (list of strings)."
+    )
+    parsed = safe_parse_json(_ask(prompt, api_key) or "")
+    if not isinstance(parsed, dict):
+        return {}
+    return {str(key): value for key, value in parsed.items() if isinstance(value, dict)}
+
+class EvaluationQueue:
+    """
+    Background grader for one interview session.
+
+    Args:
+        jd: Job description the answers are judged against
+        api_key: Pins a Gemini key (by default the LLM gateway picks the least-loaded one)
+        batch_size: Maximum answers graded per Gemini call
+        batch_wait: Seconds to wait for more answers before grading a partial batch
+        idle_seconds: The worker thread exits after this long without work
+            and is restarted by the next submit()
+    """
+
+    def __init__(self, jd, api_key=None, batch_size=3, batch_wait=1.5, idle_seconds=60):
+        self.jd = jd
+        self.api_key = api_key
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.idle_seconds = idle_seconds
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._entries = {}  # item_id -> entry dict, in submission order
+        self._worker = None
+
+    def submit(self, item_id, section, question, answer):
+        """Queues an answer for grading and returns immediately."""
+        entry = {'id': item_id, 'section': section, 'question': question, 'answer': answer,
+                 'status': 'pending', 'feedback': None, 'submitted_at': time.time(), 'seconds': None}
+        with self._lock:
+            self._entries[item_id] = entry
+            self._queue.put(item_id)
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, daemon=True)
+                self._worker.start()
+
+    def _next_batch(self):
+        try:
+            batch = [self._queue.get(timeout=self.idle_seconds)]
+        except queue.Empty:
+            return []
+        deadline = time.time() + self.batch_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                with self._lock:
+                    if self._queue.empty():
+                        self._worker = None
+                        return
+                continue
+            with self._lock:
+                items = [dict(self._entries[item_id]) for item_id in batch]
+            self._evaluate(items)
+
+    def _evaluate(self, items):
+        feedback = {}
+        if len(items) > 1:
+            try:
+                feedback = evaluate_answers_batch(self.jd, items, self.api_key)
+            except Exception as e:
+                print(f"Batch evaluation failed, grading answers one by one: {e}")
+        for item in items:
+            result = feedback.get(str(item['id']))
+            if result is None:
+                try:
+                    result = evaluate_text_answer(item['section'], self.jd, item['question'], item['answer'],
+                                                  self.api_key)
+                except Exception as e:
+                    result = {'error': str(e)}
+            with self._lock:
+                entry = self._entries[item['id']]
+                entry['feedback'] = result
+                entry['status'] = 'done' if result and 'error' not in result else 'error'
+                entry['seconds'] = round(time.time() - entry['submitted_at'], 1)
+
+    def entries(self):
+        """Copies of all entries in submission order."""
+        with self._lock:
+            return [dict(entry) for entry in self._entries.values()]
+
+    def pending_count(self):
+        with self._lock:
+            return sum(1 for entry in self._entries.values() if entry['status'] == 'pending')
+
+def _score(feedback):
+    try:
+        return float((feedback or {}).get('score'))
+    except (TypeError, ValueError):
+        return None
+
+def session_report(entries):
+    """Summary of a finished session: overall and per-section average scores."""
+    scored = [(entry['section'], _score(entry['feedback'])) for entry in entries if entry['status'] == 'done']
+    scored = [(section, score) for section, score in scored if score is not None]
+    by_section = {}
+    for section, score in scored:
+        by_section.setdefault(section, []).append(score)
+    return {
+        'answered': len(entries),
+        'evaluated': sum(1 for entry in entries if entry['status'] == 'done'),
+        'failed': sum(1 for entry in entries if entry['status'] == 'error'),
+        'average_score': round(sum(score for _, score in scored) / len(scored), 1) if scored else None,
+        'by_section': {section: round(sum(scores) / len(scores), 1) for section, scores in by_section.items()},
+    }
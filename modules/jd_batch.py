@@ -0,0 +1,243 @@
+# modules/jd_batch.py
+"""
+Batch ingestion of many job descriptions at once.
+
+queue_for_review() (the Admin Panel's multi-PDF upload) extracts the text
+of every file and hands each one to job_queue, which parses and matches it
+in the background and holds it for the admin's review like a single post.
+
+ingest() (CLI: batch_post_jobs.py) runs the whole batch in the caller:
+
+    extract  PDF text for every file, across pdf_text's shared process pool (and cache)
+    parse    criteria per JD with bounded concurrency (rate limits and retries
+             are handled once, by llm_gateway)
+    match    eligibility for all jobs in one vectorized pass (batch_matcher)
+    write    every job and eligibility row in a single transaction
+
+Each file gets a timing row, so slow PDFs or throttled parses stand out.
+"""
+import json
+import os
+import random
+import re
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from modules import batch_matcher, database, gemini_parser, job_queue, pdf_text
+
+MAX_CONCURRENCY = int(os.getenv("JD_BATCH_CONCURRENCY", "4"))
+UPLOADS_DIR = "job_pdfs"
+SUPPORTED_EXTENSIONS = ('.pdf', '.txt')
+
+def find_documents(folder):
+    """Paths of the JD files (PDF or plain text) in a folder, sorted by name."""
+    return sorted(os.path.join(folder, name) for name in os.listdir(folder)
+                  if name.lower().endswith(SUPPORTED_EXTENSIONS))
+
+def company_from_filename(path):
+    """'Acme_Corp_20250101_120000.pdf' -> 'Acme Corp'."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    stem = re.sub(r'_\d{8}_\d{6}$', '', stem)
+    return re.sub(r'[_\-]+', ' ', stem).strip() or stem
+
+def _read_document(path):
+    """Text of one JD file; runs in a worker process."""
+    started = time.perf_counter()
+    if path.lower().endswith('.pdf'):
+        # The files are already spread across processes, so no nested pool per file
+        text = pdf_text.extract_text(path, parallel_min_pages=10 ** 9)
+    else:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            text = f.read()
+    return text, time.perf_counter() - started
+
+def _store_pdf(path, company, pdf_dir):
+    """Copies a PDF next to the ones the Admin Panel saves; returns the stored path."""
+    os.makedirs(pdf_dir, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    stored = os.path.join(pdf_dir, f"{company.replace(' ', '_')}_{timestamp}_{random.randint(0, 9999):04d}.pdf")
+    shutil.copyfile(path, stored)
+    return stored
+
+def _extract_all(paths, on_progress):
+    """
+    Reads every file on pdf_text's shared pool (inline if the pool cannot run).
+    Returns one (text or None, seconds or None, message) tuple per path.
+    """
+    try:
+        pool = pdf_text.get_pool()
+        futures = [pool.submit(_read_document, path) for path in paths]
+    except (BrokenProcessPool, OSError, RuntimeError):
+        pdf_text.reset_pool()
+        futures = [None] * len(paths)
+    extracted = []
+    for index, (path, future) in enumerate(zip(paths, futures)):
+        try:
+            try:
+                text, seconds = future.result() if future is not None else _read_document(path)
+            except BrokenProcessPool:
+                # A worker died (e.g. killed for memory); read this file here instead
+                pdf_text.reset_pool()
+                text, seconds = _read_document(path)
+            extracted.append((text, seconds, "" if text.strip() else "No text could be extracted."))
+        except Exception as e:
+            extracted.append((None, None, f"Could not read file: {e}"))
+        if on_progress is not None:
+            on_progress('extract', index + 1, len(paths))
+    return extracted
+
+def queue_for_review(paths, admin_email, companies=None, on_progress=None):
+    """
+    Queues a batch of job descriptions for parsing, matching and admin review.
+
+    Returns:
+        One dict per file with 'file', 'company', 'status' ('queued' or
+        'failed'), 'message', 'queue_id' and 'extract_s'
+    """
+    companies = companies or [company_from_filename(path) for path in paths]
+    results = []
+    for path, company, (text, seconds, message) in zip(paths, companies, _extract_all(paths, on_progress)):
+        row = {'file': os.path.basename(path), 'company': company, 'status': 'failed', 'message': message,
+               'queue_id': None, 'extract_s': seconds}
+        if text and text.strip():
+            pdf_path = path if path.lower().endswith('.pdf') else None
+            row['queue_id'] = job_queue.enqueue(company, text, admin_email, pdf_path=pdf_path)
+            row['status'] = 'queued'
+        results.append(row)
+    return results
+
+def ingest(paths, admin_email, companies=None, max_concurrency=MAX_CONCURRENCY,
+           dry_run=False, post_empty=False, pdf_dir=UPLOADS_DIR, on_progress=None):
+    """
+    Parses, matches and posts a batch of job descriptions.
+
+    Args:
+        paths: JD files (.pdf or .txt)
+        admin_email: Recorded as posted_by_email on every job
+        companies: Optional company names aligned with paths (default: from the file names)
+        max_concurrency: Parses in flight at once
+        dry_run: Parse and match, but write nothing
+        post_empty: Also post jobs no student is eligible for
+        pdf_dir: Where posted PDFs are copied (None keeps the given path)
+        on_progress: Optional callable(stage, done, total)
+
+    Returns:
+        (results, stage_seconds): one dict per file with 'file', 'company',
+        'status' ('posted', 'parsed', 'skipped' or 'failed'), 'message',
+        'job_id', 'eligible', 'extract_s' and 'parse_s'; stage_seconds has
+        the wall clock of each stage and 'total'
+    """
+    def progress(stage, done, total):
+        if on_progress is not None:
+            on_progress(stage, done, total)
+
+    database.init_database()
+    started = time.perf_counter()
+    companies = companies or [company_from_filename(path) for path in paths]
+    results = [{'file': os.path.basename(path), 'company': company, 'status': 'failed', 'message': '',
+                'job_id': None, 'eligible': None, 'extract_s': None, 'parse_s': None}
+               for path, company in zip(paths, companies)]
+    stage_seconds = {}
+
+    # --- Extract ---
+    stage_started = time.perf_counter()
+    texts = [None] * len(paths)
+    for index, (text, seconds, message) in enumerate(_extract_all(paths, on_progress)):
+        texts[index] = text
+        results[index].update(extract_s=seconds, message=message)
+    stage_seconds['extract'] = time.perf_counter() - stage_started
+
+    # --- Parse ---
+    stage_started = time.perf_counter()
+    criteria = [None] * len(paths)
+    pending = [index for index, text in enumerate(texts) if text and text.strip()]
+
+    def parse_one(index):
+        parse_started = time.perf_counter()
+        found, message = gemini_parser.extract_criteria(texts[index])
+        return index, found, message, time.perf_counter() - parse_started
+
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as pool:
+        for done, (index, found, message, seconds) in enumerate(pool.map(parse_one, pending), 1):
+            criteria[index] = found
+            results[index].update(message=message, parse_s=seconds)
+            progress('parse', done, len(pending))
+    stage_seconds['parse'] = time.perf_counter() - stage_started
+
+    # --- Match ---
+    stage_started = time.perf_counter()
+    parsed = [index for index in pending if criteria[index] is not None]
+    eligible = dict(zip(parsed, batch_matcher.match_jobs([criteria[index] for index in parsed])))
+    for index in parsed:
+        results[index]['eligible'] = len(eligible[index])
+        results[index]['status'] = 'parsed'
+        if not eligible[index] and not post_empty:
+            results[index]['status'] = 'skipped'
+            results[index]['message'] = "No students match the extracted criteria."
+    stage_seconds['match'] = time.perf_counter() - stage_started
+
+    # --- Write ---
+    stage_started = time.perf_counter()
+    to_post = [index for index in parsed if results[index]['status'] == 'parsed']
+    if to_post and not dry_run:
+        conn = database.get_connection()
+        cursor = conn.cursor()
+        job_ids = {}
+        # Copied before the transaction so it holds the write lock only for the inserts
+        stored = []
+        try:
+            pdf_paths = {}
+            for index in to_post:
+                pdf_paths[index] = None
+                if paths[index].lower().endswith('.pdf'):
+                    pdf_paths[index] = paths[index]
+                    if pdf_dir:
+                        pdf_paths[index] = _store_pdf(paths[index], companies[index], pdf_dir)
+                        stored.append(pdf_paths[index])
+            for index in to_post:
+                found = criteria[index]
+                job_ids[index] = database.insert_job_and_eligibility(
+                    cursor, companies[index], texts[index], json.dumps(found), eligible[index],
+                    admin_email, ctc=found.get('ctc'), stipend=found.get('stipend'),
+                    last_date=found.get('last_date'), company_description=found.get('company_description'),
+                    pdf_path=pdf_paths[index]
+                )
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            # No job row points at the copies any more
+            for path in stored:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            for index in to_post:
+                results[index]['status'] = 'failed'
+                results[index]['message'] = f"Batch write rolled back: {e}"
+        else:
+            for index, job_id in job_ids.items():
+                results[index]['status'] = 'posted'
+                results[index]['job_id'] = job_id
+    stage_seconds['write'] = time.perf_counter() - stage_started
+    stage_seconds['total'] = time.perf_counter() - started
+    return results, stage_seconds
+
+def format_report(results, stage_seconds):
+    """Plain-text per-file timing table plus stage totals."""
+    def seconds(value):
+        return f"{value:.2f}" if value is not None else "-"
+
+    lines = [f"{'File':<36} {'Status':<8} {'Extract s':>9} {'Parse s':>8} {'Eligible':>8} {'Job ID':>6}  Message"]
+    for row in results:
+        lines.append(f"{row['file'][:36]:<36} {row['status']:<8} {seconds(row['extract_s']):>9} "
+                     f"{seconds(row['parse_s']):>8} {row['eligible'] if row['eligible'] is not None else '-':>8} "
+                     f"{row['job_id'] if row['job_id'] is not None else '-':>6}  {row['message']}")
+    counts = {}
+    for row in results:
+        counts[row['status']] = counts.get(row['status'], 0) + 1
+    lines.append("")
+    lines.append("Stages: " + ", ".join(f"{stage} {value:.2f}s" for stage, value in stage_seconds.items()))
+    lines.append("Files: " + ", ".join(f"{count} {status}" for status, count in sorted(counts.items())))
+    return "\n".join(lines)
@@ -0,0 +1,129 @@
+# modules/jd_cache.py
+"""
+Persistent, content-addressed cache for JD parsing results.
+Entries are keyed by a hash of the model, the prompt version and the
+whitespace-normalized JD text, and live in the jd_parse_cache table.
+"""
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from modules import database
+
+TTL_SECONDS = 30 * 24 * 60 * 60  # Re-parse a JD after 30 days
+MAX_ENTRIES = 1000
+
+_stats_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0, 'errors': 0}
+# Hits are counted in memory and written in batches, so a lookup never writes
+HIT_FLUSH_THRESHOLD = 100
+_pending_hits = {}  # cache_key -> (hits, last used)
+
+def _count(counter, amount=1):
+    with _stats_lock:
+        _stats[counter] += amount
+
+def _record_hit(key):
+    """Notes a hit; True once enough are pending to be worth a write."""
+    with _stats_lock:
+        hits, _ = _pending_hits.get(key, (0, 0.0))
+        _pending_hits[key] = (hits + 1, time.time())
+        return len(_pending_hits) >= HIT_FLUSH_THRESHOLD
+
+def _flush_hits(conn):
+    """Writes the pending hit counts and last-used times (inside the caller's savepoint)."""
+    with _stats_lock:
+        pending = list(_pending_hits.items())
+        _pending_hits.clear()
+    conn.executemany("""
+    UPDATE jd_parse_cache SET hit_count = hit_count + ?, last_used_at = MAX(last_used_at, ?) WHERE cache_key = ?
+    """, [(hits, last_used, key) for key, (hits, last_used) in pending])
+
+def flush_hits():
+    """Writes pending hits now (e.g. before reading hit counts)."""
+    conn = database.get_connection()
+    try:
+        with database.savepoint(conn, 'jd_parse_cache_hits'):
+            _flush_hits(conn)
+    except sqlite3.Error as e:
+        print(f"JD cache hit update failed: {e}")
+        _count('errors')
+
+def normalize_jd_text(jd_text):
+    """Collapses whitespace so trivially reformatted JDs share a cache entry."""
+    return re.sub(r'\s+', ' ', jd_text or '').strip()
+
+def make_cache_key(jd_text, model, prompt_version):
+    """Returns the content hash used as the cache key."""
+    payload = f"{model}\n{prompt_version}\n{normalize_jd_text(jd_text)}"
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def get(jd_text, model, prompt_version):
+    """Returns the cached criteria dict, or None on a miss or expired entry."""
+    key = make_cache_key(jd_text, model, prompt_version)
+    try:
+        row = database.get_connection().execute(
+            "SELECT criteria_json, created_at FROM jd_parse_cache WHERE cache_key = ?", (key,)).fetchone()
+        # An expired entry is overwritten by the next put, which also evicts the others
+        if row is None or time.time() - row[1] > TTL_SECONDS:
+            _count('misses')
+            return None
+        criteria = json.loads(row[0])
+    except (sqlite3.Error, ValueError) as e:
+        # A broken cache must never block parsing; fall through to the API
+        print(f"JD cache lookup failed: {e}")
+        _count('errors')
+        return None
+    _count('hits')
+    if _record_hit(key):
+        flush_hits()
+    return criteria
+
+def put(jd_text, model, prompt_version, criteria):
+    """Stores parsed criteria and evicts expired and least recently used entries."""
+    key = make_cache_key(jd_text, model, prompt_version)
+    now = time.time()
+    conn = database.get_connection()
+    try:
+        # A savepoint, so a transaction the caller has open on this pooled connection is left alone
+        with database.savepoint(conn, 'jd_parse_cache_put'):
+            _flush_hits(conn)
+            conn.execute("""
+            INSERT OR REPLACE INTO jd_parse_cache (cache_key, model, prompt_version, criteria_json,
+                                                   created_at, last_used_at, hit_count)
+            VALUES (?, ?, ?, ?, ?, ?, 0)
+            """, (key, model, prompt_version, json.dumps(criteria), now, now))
+            expired = conn.execute("DELETE FROM jd_parse_cache WHERE created_at < ?",
+                                   (now - TTL_SECONDS,)).rowcount
+            overflow = conn.execute("""
+            DELETE FROM jd_parse_cache WHERE cache_key IN (
+                SELECT cache_key FROM jd_parse_cache ORDER BY last_used_at DESC LIMIT -1 OFFSET ?
+            )
+            """, (MAX_ENTRIES,)).rowcount
+        _count('stores')
+        _count('evictions', expired + overflow)
+    except sqlite3.Error as e:
+        print(f"JD cache store failed: {e}")
+        _count('errors')
+
+def clear():
+    """Removes every cached entry."""
+    conn = database.get_connection()
+    with database.savepoint(conn, 'jd_parse_cache_clear'):
+        conn.execute("DELETE FROM jd_parse_cache")
+    with _stats_lock:
+        _pending_hits.clear()
+
+def get_stats():
+    """Returns hit/miss counters for this process plus the current entry count."""
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+    try:
+        stats['entries'] = database.get_connection().execute("SELECT COUNT(*) FROM jd_parse_cache").fetchone()[0]
+    except sqlite3.Error:
+        stats['entries'] = None
+    return stats
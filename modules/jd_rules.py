@@ -0,0 +1,189 @@
+"""
+Rule-based job description parser.
+Extracts the same criteria dict as gemini_parser.get_gemini_json_response
+from regularly phrased JDs, together with a confidence score, so the LLM
+is only needed for the unusual ones.
+"""
+import re
+from modules import branch_mapper
+
+_NUMBER = r'(\d{1,2}(?:\.\d{1,2})?)'
+_MONTHS = (r'(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|'
+           r'sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)')
+
+# --- Mentions: if a JD talks about a field we must extract it, or defer to the LLM ---
+_MENTIONS = {
+    'cgpa': re.compile(r'\b(?:c?gpa|cpi)\b', re.IGNORECASE),
+    'backlogs': re.compile(r'\bbacklogs?\b|\barrears?\b', re.IGNORECASE),
+    'year_gap': re.compile(r'\b(?:year|education(?:al)?|academic)\s*gaps?\b|\bgap\s+(?:of|in)\b', re.IGNORECASE),
+    'branches': re.compile(r'\b(?:branch(?:es)?|streams?|disciplines?|departments?)\b', re.IGNORECASE),
+    'ctc': re.compile(r'\b(?:ctc|lpa|package|salary)\b', re.IGNORECASE),
+    'stipend': re.compile(r'\bstipend\b', re.IGNORECASE),
+    'last_date': re.compile(r'\b(?:last\s+date|deadline|apply\s+(?:by|before))\b', re.IGNORECASE),
+}
+
+# --- Value patterns ---
+# "<number> <keyword>" is tried first: "<keyword> ... <number>" can run on into the next clause
+_CGPA_PATTERNS = [
+    re.compile(_NUMBER + r'\s*(?:/\s*10\s*)?(?:c?gpa|cpi)\b', re.IGNORECASE),
+    re.compile(r'\b(?:c?gpa|cpi)\b[^.\n\d]{0,40}?' + _NUMBER, re.IGNORECASE),
+]
+_NO_BACKLOGS = re.compile(r'\b(?:no|zero|nil|without(?:\s+any)?)\s+(?:active\s+|standing\s+|current\s+)?(?:backlogs?|arrears?)\b',
+                          re.IGNORECASE)
+_BACKLOG_PATTERNS = [
+    re.compile(r'\b(\d{1,2})\s+(?:active\s+|standing\s+)?(?:backlogs?|arrears?)\b', re.IGNORECASE),
+    re.compile(r'\b(?:backlogs?|arrears?)\b[^.\n\d]{0,30}?(\d{1,2})\b', re.IGNORECASE),
+]
+_NO_YEAR_GAP = re.compile(r'\b(?:no|zero|without(?:\s+any)?)\s+(?:year|education(?:al)?|academic)\s*gaps?\b',
+                          re.IGNORECASE)
+_YEAR_GAP_PATTERNS = [
+    re.compile(r'\b(\d)\s*(?:-\s*)?years?\s+(?:of\s+)?(?:education(?:al)?\s+|academic\s+)?gap\b', re.IGNORECASE),
+    re.compile(r'\bgap\s+of\s+(?:up\s+to\s+|upto\s+|max(?:imum)?\s+)?(\d)\s+years?\b', re.IGNORECASE),
+    re.compile(r'\b(?:year|education(?:al)?|academic)\s*gaps?\b[^.\n\d]{0,30}?(\d)\b', re.IGNORECASE),
+]
+_CTC_RANGE = re.compile(_NUMBER + r'\s*(?:-|to|–)\s*' + _NUMBER + r'\s*(?:lpa|lakhs?\s+per\s+annum)\b', re.IGNORECASE)
+_CTC_SINGLE = re.compile(_NUMBER + r'\s*(?:lpa|lakhs?\s+per\s+annum)\b', re.IGNORECASE)
+_STIPEND = re.compile(r'\bstipend\b[^\d\n]{0,25}?((?:₹|rs\.?|inr)?\s*[\d,]+(?:\.\d+)?\s*k?(?:\s*(?:/|per)\s*month)?)',
+                      re.IGNORECASE)
+_DATE = (r'(\d{4}-\d{2}-\d{2}|\d{1,2}[/.-]\d{1,2}[/.-]\d{2,4}|'
+         r'\d{1,2}(?:st|nd|rd|th)?\s+(?:of\s+)?' + _MONTHS + r',?\s+\d{4}|' + _MONTHS + r'\s+\d{1,2}(?:st|nd|rd|th)?,?\s+\d{4})')
+_LAST_DATE = re.compile(r'\b(?:last\s+date(?:\s+to\s+apply)?|deadline|apply\s+(?:by|before))\b[^\d\n]{0,20}?' + _DATE,
+                        re.IGNORECASE)
+_BRANCH_SECTION = re.compile(r'\b(?:eligible\s+)?(?:branch(?:es)?|streams?|disciplines?|departments?)\b'
+                             r'(?:\s+(?:eligible|allowed))?\s*[:\-]?\s*([^\n.;]*)', re.IGNORECASE)
+_ALL_BRANCHES = re.compile(r'\b(?:all|any)\s+(?:branch(?:es)?|streams?|disciplines?|departments?)\b', re.IGNORECASE)
+_DEGREE_NAMES = re.compile(r'\b[bm]\.?\s?(?:tech|e|sc)\b\.?', re.IGNORECASE)
+_ABOUT_COMPANY = re.compile(r'\babout\s+(?:the\s+company|us)\b\s*[:\-]?\s*(.+?)(?:\n\s*\n|$)', re.IGNORECASE | re.DOTALL)
+
+# Whole-word branch aliases, longest first so "electrical and electronics" beats "electrical"
+_BRANCH_ALIASES = sorted(set(branch_mapper.BRANCH_MAPPING) | {code.lower() for code in branch_mapper.BRANCH_CODES},
+                         key=len, reverse=True)
+_BRANCH_WORDS = re.compile(r'\b(' + '|'.join(re.escape(alias) for alias in _BRANCH_ALIASES) + r')\b', re.IGNORECASE)
+# Branch names anywhere in the JD, section keyword or not. Short codes must be written in
+# capitals ("CSE and ECE students"), so "it", "me" or "bit" in ordinary prose do not count
+_BRANCH_ANYWHERE = re.compile(
+    r'\b(' + '|'.join(re.escape(alias.upper()) for alias in _BRANCH_ALIASES if len(alias) <= 4) + r')\b'
+    r'|\b((?i:' + '|'.join(re.escape(alias) for alias in _BRANCH_ALIASES if len(alias) > 4) + r'))\b'
+)
+# Confidence when branch names appear that the branch section did not account for;
+# below gemini_parser.RULES_MIN_CONFIDENCE, so the LLM decides who is eligible
+AMBIGUOUS_BRANCHES_CONFIDENCE = 0.5
+
+# Fields and their weight in the confidence score (eligibility fields matter most)
+_FIELD_WEIGHTS = {
+    'cgpa': 3, 'backlogs': 3, 'year_gap': 3, 'branches': 3,
+    'ctc': 1, 'stipend': 1, 'last_date': 1,
+}
+
+def _first_number(patterns, text, low, high):
+    """Returns the first match from the patterns that falls inside [low, high]."""
+    for pattern in patterns:
+        for match in pattern.finditer(text):
+            value = float(match.group(1))
+            if low <= value <= high:
+                return value
+    return None
+
+def _extract_cgpa(text):
+    return _first_number(_CGPA_PATTERNS, text, 0, 10)
+
+def _extract_backlogs(text):
+    if _NO_BACKLOGS.search(text):
+        return 0
+    value = _first_number(_BACKLOG_PATTERNS, text, 0, 20)
+    return int(value) if value is not None else None
+
+def _extract_year_gap(text):
+    if _NO_YEAR_GAP.search(text):
+        return 0
+    value = _first_number(_YEAR_GAP_PATTERNS, text, 0, 9)
+    return int(value) if value is not None else None
+
+def _extract_branches(text):
+    """
+    Returns (branches, found, unexplained): an explicit 'all branches' counts as
+    found with []. unexplained lists branch codes named anywhere in the JD that
+    the branch section does not include, e.g. "Open to CSE and ECE students".
+    """
+    # Drop degree names first: the dot in "B.Tech" would otherwise end the branch clause
+    text = _DEGREE_NAMES.sub(' ', text)
+    named = branch_mapper.normalize_branch_list([match.group(1) or match.group(2)
+                                                 for match in _BRANCH_ANYWHERE.finditer(text)])
+    if _ALL_BRANCHES.search(text):
+        return [], True, named
+    names = []
+    for section in _BRANCH_SECTION.finditer(text):
+        names.extend(match.group(1) for match in _BRANCH_WORDS.finditer(section.group(1)))
+    branches = branch_mapper.normalize_branch_list(names)
+    return branches, bool(branches), [code for code in named if code not in branches]
+
+def _extract_ctc(text):
+    match = _CTC_RANGE.search(text)
+    if match:
+        return f"{match.group(1)}-{match.group(2)} LPA"
+    match = _CTC_SINGLE.search(text)
+    if match:
+        return f"{match.group(1)} LPA"
+    return None
+
+def _extract_stipend(text):
+    match = _STIPEND.search(text)
+    return re.sub(r'\s+', ' ', match.group(1)).strip() if match else None
+
+def _extract_last_date(text):
+    match = _LAST_DATE.search(text)
+    return match.group(1).strip() if match else None
+
+def _extract_company_description(text):
+    """Takes up to three sentences from an 'About the company' section, if any."""
+    match = _ABOUT_COMPANY.search(text)
+    if not match:
+        return None
+    sentences = re.split(r'(?<=[.!?])\s+', re.sub(r'\s+', ' ', match.group(1)).strip())
+    description = ' '.join(sentences[:3]).strip()
+    return description or None
+
+def extract_criteria(jd_text):
+    """
+    Extracts criteria from a JD using regular expressions.
+
+    Args:
+        jd_text: Full job description text
+
+    Returns:
+        (criteria, confidence): criteria has the same keys as the Gemini parser
+        output; confidence is 0.0-1.0 and drops whenever the JD mentions a
+        field the rules could not extract.
+    """
+    text = jd_text or ''
+    branches, branches_found, unexplained_branches = _extract_branches(text)
+    criteria = {
+        'cgpa': _extract_cgpa(text),
+        'branches': branches,
+        'backlogs': _extract_backlogs(text),
+        'year_gap': _extract_year_gap(text),
+        'ctc': _extract_ctc(text),
+        'stipend': _extract_stipend(text),
+        'last_date': _extract_last_date(text),
+        'company_description': _extract_company_description(text),
+    }
+
+    mentioned_weight = 0
+    extracted_weight = 0
+    for field, weight in _FIELD_WEIGHTS.items():
+        found = branches_found if field == 'branches' else criteria[field] is not None
+        mentioned = _MENTIONS[field].search(text) or (field == 'branches' and unexplained_branches)
+        if mentioned or found:
+            mentioned_weight += weight
+            if found:
+                extracted_weight += weight
+
+    # Nothing recognisable at all: the JD is phrased in a way the rules do not know
+    if mentioned_weight == 0:
+        return criteria, 0.0
+    confidence = round(extracted_weight / mentioned_weight, 2)
+    if unexplained_branches:
+        # Branches are named outside anything the rules parsed; an empty or partial list
+        # would make every branch (or the wrong ones) eligible
+        confidence = min(confidence, AMBIGUOUS_BRANCHES_CONFIDENCE)
+    return criteria, confidence
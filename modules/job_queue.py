@@ -0,0 +1,315 @@
+# modules/job_queue.py
+"""
+Durable queue for Admin Panel job postings.
+
+Posting a job only inserts a row into the job_queue table; worker threads
+then run its parse -> match stages in the background and leave it in
+'review'. The admin checks the criteria and eligible students and
+approves it (or rejects it), and the persist stage then saves the job.
+Each stage's output is stored on the row as soon as it finishes, so a
+Streamlit rerun, a closed tab or a restarted process never loses work: a
+retried or recovered entry resumes at the first stage without output.
+Failed stages are retried with exponential backoff up to MAX_ATTEMPTS.
+
+Entries are claimed under a lease, renewed while a stage runs (a parse can
+wait on the gateway's rate limits and backoff for longer than one lease).
+A 'running' entry whose lease expired (its process died) is claimed again
+by the next worker.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from modules import database, gemini_parser
+
+MAX_WORKERS = int(os.getenv("JOB_QUEUE_WORKERS", "2"))
+MAX_ATTEMPTS = 3
+RETRY_BASE_SECONDS = 5.0
+LEASE_SECONDS = 300.0
+LEASE_RENEW_SECONDS = LEASE_SECONDS / 3
+POLL_SECONDS = 1.0
+IDLE_SECONDS = 60.0
+
+STAGES = ('parse', 'match', 'persist')
+_COLUMNS = ('queue_id', 'company_name', 'job_description', 'posted_by_email', 'pdf_path', 'status', 'stage',
+            'attempts', 'criteria_json', 'parse_message', 'eligible_json', 'eligible_count', 'approved_at', 'job_id',
+            'error', 'created_at', 'updated_at', 'next_attempt_at', 'lease_until')
+
+class StageError(Exception):
+    """A stage failed; retryable=False marks failures another attempt cannot fix."""
+
+    def __init__(self, message, retryable=True):
+        super().__init__(message)
+        self.retryable = retryable
+
+# --- Queue table ---
+def enqueue(company, jd, admin_email, pdf_path=None):
+    """Queues a job posting and wakes the workers. Returns the queue_id."""
+    database.init_database()
+    conn = database.get_connection()
+    now = time.time()
+    cursor = conn.execute("""
+    INSERT INTO job_queue (company_name, job_description, posted_by_email, pdf_path, created_at, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+    """, (company, jd, admin_email, pdf_path, now, now))
+    conn.commit()
+    start_workers()
+    return cursor.lastrowid
+
+def _row_dict(row):
+    return dict(zip(_COLUMNS, row)) if row else None
+
+def get_entry(queue_id):
+    conn = database.get_connection()
+    row = conn.execute(f"SELECT {', '.join(_COLUMNS)} FROM job_queue WHERE queue_id = ?", (queue_id,)).fetchone()
+    return _row_dict(row)
+
+def list_entries(posted_by=None, limit=50):
+    """Most recent queue entries first, optionally only one admin's."""
+    database.init_database()
+    conn = database.get_connection()
+    query = f"SELECT {', '.join(_COLUMNS)} FROM job_queue"
+    params = []
+    if posted_by:
+        query += " WHERE posted_by_email = ?"
+        params.append(posted_by)
+    query += " ORDER BY queue_id DESC LIMIT ?"
+    params.append(limit)
+    return [_row_dict(row) for row in conn.execute(query, params).fetchall()]
+
+def retry(queue_id):
+    """Puts a failed entry back in the queue with a fresh set of attempts."""
+    conn = database.get_connection()
+    cursor = conn.execute("""
+    UPDATE job_queue SET status = 'queued', attempts = 0, next_attempt_at = 0, error = NULL, updated_at = ?
+    WHERE queue_id = ? AND status = 'failed'
+    """, (time.time(), queue_id))
+    conn.commit()
+    if cursor.rowcount:
+        start_workers()
+    return cursor.rowcount > 0
+
+def approve(queue_id):
+    """Confirms a reviewed entry; a worker then saves the job and its eligibility rows."""
+    conn = database.get_connection()
+    now = time.time()
+    cursor = conn.execute("""
+    UPDATE job_queue SET status = 'queued', approved_at = ?, attempts = 0, next_attempt_at = 0, error = NULL,
+                         updated_at = ?
+    WHERE queue_id = ? AND status = 'review'
+    """, (now, now, queue_id))
+    conn.commit()
+    if cursor.rowcount:
+        start_workers()
+    return cursor.rowcount > 0
+
+def reject(queue_id):
+    """Discards a reviewed entry without posting it."""
+    conn = database.get_connection()
+    cursor = conn.execute("""
+    UPDATE job_queue SET status = 'rejected', updated_at = ? WHERE queue_id = ? AND status = 'review'
+    """, (time.time(), queue_id))
+    conn.commit()
+    return cursor.rowcount > 0
+
+def get_stats():
+    """Entry counts by status."""
+    database.init_database()
+    conn = database.get_connection()
+    stats = {status: 0 for status in ('queued', 'running', 'review', 'done', 'failed', 'rejected')}
+    stats.update(dict(conn.execute("SELECT status, COUNT(*) FROM job_queue GROUP BY status").fetchall()))
+    return stats
+
+def _claim():
+    """Atomically takes the next due entry (or one with an expired lease); None when there is none."""
+    conn = database.get_connection()
+    now = time.time()
+    if conn.in_transaction:
+        conn.commit()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute(f"""
+        SELECT {', '.join(_COLUMNS)} FROM job_queue
+        WHERE (status = 'queued' AND next_attempt_at <= ?) OR (status = 'running' AND lease_until < ?)
+        ORDER BY next_attempt_at, queue_id LIMIT 1
+        """, (now, now)).fetchone()
+        if row is None:
+            conn.commit()
+            return None
+        entry = _row_dict(row)
+        conn.execute("""
+        UPDATE job_queue SET status = 'running', attempts = attempts + 1, lease_until = ?, updated_at = ?
+        WHERE queue_id = ?
+        """, (now + LEASE_SECONDS, now, entry['queue_id']))
+        conn.commit()
+        entry['attempts'] += 1
+        return entry
+    except Exception:
+        conn.rollback()
+        raise
+
+def _has_pending():
+    """True while any entry is queued (possibly waiting for a retry) or running."""
+    conn = database.get_connection()
+    return conn.execute("SELECT 1 FROM job_queue WHERE status IN ('queued', 'running') LIMIT 1").fetchone() is not None
+
+def _update(queue_id, **fields):
+    conn = database.get_connection()
+    fields['updated_at'] = time.time()
+    assignments = ", ".join(f"{column} = ?" for column in fields)
+    conn.execute(f"UPDATE job_queue SET {assignments} WHERE queue_id = ?", (*fields.values(), queue_id))
+    conn.commit()
+
+@contextmanager
+def _lease_renewed(queue_id):
+    """Extends the entry's lease every LEASE_RENEW_SECONDS until the block ends."""
+    finished = threading.Event()
+
+    def renew():
+        while not finished.wait(LEASE_RENEW_SECONDS):
+            try:
+                conn = database.get_connection()
+                now = time.time()
+                # Only while still running: the persist stage may already have marked it done
+                conn.execute("UPDATE job_queue SET lease_until = ?, updated_at = ? WHERE queue_id = ? "
+                             "AND status = 'running'", (now + LEASE_SECONDS, now, queue_id))
+                conn.commit()
+            except Exception as e:
+                print(f"Job queue lease renewal failed for #{queue_id}: {e}")
+
+    thread = threading.Thread(target=renew, daemon=True, name=f"job-queue-lease-{queue_id}")
+    thread.start()
+    try:
+        yield
+    finally:
+        finished.set()
+        thread.join()
+
+# --- Stages ---
+def _parse(entry):
+    criteria, message = gemini_parser.extract_criteria(entry['job_description'])
+    if criteria is None:
+        raise StageError(f"Failed to parse criteria: {message}")
+    return {'criteria_json': json.dumps(criteria), 'parse_message': message}
+
+def _match(entry):
+    criteria = json.loads(entry['criteria_json'])
+    students = database.get_students_matching_criteria(criteria)
+    emails = students['email'].tolist() if not students.empty else []
+    if not emails:
+        raise StageError("No students match the extracted criteria.", retryable=False)
+    return {'eligible_json': json.dumps(emails), 'eligible_count': len(emails)}
+
+def _persist(entry):
+    """Saves the job, its eligibility rows and the queue entry's result in one transaction."""
+    criteria = json.loads(entry['criteria_json'])
+    conn = database.get_connection()
+    cursor = conn.cursor()
+    try:
+        job_id = database.insert_job_and_eligibility(
+            cursor, entry['company_name'], entry['job_description'], entry['criteria_json'],
+            json.loads(entry['eligible_json']), entry['posted_by_email'],
+            ctc=criteria.get('ctc'), stipend=criteria.get('stipend'), last_date=criteria.get('last_date'),
+            company_description=criteria.get('company_description'), pdf_path=entry['pdf_path']
+        )
+        cursor.execute("""
+        UPDATE job_queue SET job_id = ?, status = 'done', stage = NULL, error = NULL, lease_until = NULL,
+                             updated_at = ?
+        WHERE queue_id = ?
+        """, (job_id, time.time(), entry['queue_id']))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return {'job_id': job_id}
+
+_STAGE_FUNCTIONS = {'parse': _parse, 'match': _match, 'persist': _persist}
+_STAGE_OUTPUT = {'parse': 'criteria_json', 'match': 'eligible_json', 'persist': 'job_id'}
+
+def process(entry):
+    """
+    Runs the stages an entry has no output for yet, recording each result as it finishes.
+    An entry the admin has not approved stops before persist and waits in 'review'.
+    """
+    if entry['job_id'] is not None:
+        _update(entry['queue_id'], status='done', stage=None, lease_until=None)
+        return True
+    for stage in STAGES:
+        if entry[_STAGE_OUTPUT[stage]] is not None:
+            continue
+        if stage == 'persist' and entry['approved_at'] is None:
+            _update(entry['queue_id'], status='review', stage=None, lease_until=None)
+            return True
+        _update(entry['queue_id'], stage=stage, lease_until=time.time() + LEASE_SECONDS)
+        try:
+            with _lease_renewed(entry['queue_id']):
+                output = _STAGE_FUNCTIONS[stage](entry)
+        except Exception as e:
+            _fail(entry, stage, e)
+            return False
+        entry.update(output)
+        if stage != 'persist':
+            _update(entry['queue_id'], **output)
+    return True
+
+def _fail(entry, stage, error):
+    """Schedules a retry with exponential backoff, or marks the entry failed after MAX_ATTEMPTS."""
+    message = f"{stage}: {error}"
+    if entry['attempts'] < MAX_ATTEMPTS and getattr(error, 'retryable', True):
+        delay = RETRY_BASE_SECONDS * (2 ** (entry['attempts'] - 1))
+        _update(entry['queue_id'], status='queued', error=message, lease_until=None,
+                next_attempt_at=time.time() + delay)
+    else:
+        _update(entry['queue_id'], status='failed', error=message, lease_until=None)
+
+# --- Workers ---
+_workers_lock = threading.Lock()
+_workers = []
+_wake = threading.Event()
+
+def _worker_loop():
+    database.init_database()
+    idle_since = time.time()
+    while True:
+        try:
+            entry = _claim()
+            if entry is not None:
+                process(entry)
+                idle_since = time.time()
+                continue
+        except Exception as e:
+            # e.g. the database stayed locked past the busy timeout; the lease lets the entry be reclaimed
+            print(f"Job queue worker error: {e}")
+        if time.time() - idle_since > IDLE_SECONDS and not _has_pending():
+            with _workers_lock:
+                # Re-check under the lock so an enqueue racing with the exit is not stranded
+                if not _has_pending():
+                    _workers.remove(threading.current_thread())
+                    return
+        _wake.wait(POLL_SECONDS)
+        _wake.clear()
+
+def start_workers(max_workers=MAX_WORKERS):
+    """
+    Makes sure up to max_workers worker threads are running and wakes them.
+    Idle workers exit after IDLE_SECONDS; the next enqueue starts them again.
+    Call on page load too, so entries left by a previous process are resumed.
+    """
+    with _workers_lock:
+        _workers[:] = [worker for worker in _workers if worker.is_alive()]
+        while len(_workers) < max_workers:
+            worker = threading.Thread(target=_worker_loop, daemon=True, name=f"job-queue-{len(_workers)}")
+            _workers.append(worker)
+            worker.start()
+    _wake.set()
+
+def resume_pending():
+    """Starts the workers only if entries are waiting, e.g. ones left by a previous process."""
+    database.init_database()
+    if _has_pending():
+        start_workers()
+
+def active_workers():
+    with _workers_lock:
+        return sum(1 for worker in _workers if worker.is_alive())
@@ -0,0 +1,164 @@
+# modules/llm_client.py
+"""
+One interface for Gemini and OpenAI completions.
+stream() yields text chunks as they arrive, so pages can render them with
+st.write_stream (or collect() into a placeholder) and the user waits only
+for the first token instead of the whole answer.
+
+Every call goes through the shared llm_gateway, which spreads requests over
+all configured keys with per-key rate limits, retries and coalescing.
+With LLM_BACKEND=fake the gateway's transport is the offline fake_llm
+instead of the SDKs (no keys or network needed; see modules/fake_llm.py).
+"""
+import os
+import threading
+import google.ai.generativelanguage as glm
+from dotenv import load_dotenv
+from openai import OpenAI
+from modules import fake_llm, llm_gateway
+
+# The gateway reads the keys once, so make sure .env is loaded whichever page imports this first
+load_dotenv()
+
+GEMINI = "gemini"
+OPENAI = "openai"
+
+_clients_lock = threading.Lock()
+_gemini_clients = {}  # api_key -> GenerativeServiceClient
+_openai_clients = {}  # api_key -> OpenAI
+
+# Per-key limits; set them to the quota of the API plan behind the keys
+REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "60"))
+BURST = int(os.getenv("LLM_BURST", "5"))
+MAX_ATTEMPTS = int(os.getenv("LLM_MAX_ATTEMPTS", "4"))
+# "live" calls the provider SDKs, "fake" answers offline with canned responses
+BACKEND = os.getenv("LLM_BACKEND", "live").strip().lower()
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+def api_keys(provider):
+    """
+    Every key configured for a provider, in order, without duplicates.
+    Gemini: GEMINI_API_KEYS (comma-separated), GEMINI_API_KEY_1..9, GOOGLE_API_KEY.
+    OpenAI: OPENAI_API_KEYS (comma-separated), OPENAI_API_KEY.
+    The fake backend works without keys, so it falls back to fake_llm.FAKE_KEYS.
+    """
+    prefix = "GEMINI" if provider == GEMINI else "OPENAI"
+    keys = [key.strip() for key in os.getenv(f"{prefix}_API_KEYS", "").split(",")]
+    if provider == GEMINI:
+        keys += [os.getenv(f"GEMINI_API_KEY_{i}") for i in range(1, 10)] + [os.getenv("GOOGLE_API_KEY")]
+    else:
+        keys.append(os.getenv("OPENAI_API_KEY"))
+    keys = list(dict.fromkeys(key for key in keys if key))
+    if not keys and BACKEND == "fake":
+        return list(fake_llm.FAKE_KEYS)
+    return keys
+
+def default_api_key(provider):
+    keys = api_keys(provider)
+    return keys[0] if keys else None
+
+def _get_gemini_client(api_key):
+    """
+    Returns the GenerativeServiceClient for api_key.
+    genai.configure() is process-wide, so each key gets its own client
+    instead; that keeps concurrent requests on different keys independent.
+    """
+    with _clients_lock:
+        client = _gemini_clients.get(api_key)
+        if client is None:
+            client = _gemini_clients[api_key] = glm.GenerativeServiceClient(client_options={"api_key": api_key})
+        return client
+
+def _get_openai_client(api_key):
+    with _clients_lock:
+        client = _openai_clients.get(api_key)
+        if client is None:
+            client = _openai_clients[api_key] = OpenAI(api_key=api_key)
+        return client
+
+def _stream_gemini(model, prompt, system, api_key, temperature):
+    request = {
+        "model": model if model.startswith("models/") else f"models/{model}",
+        "contents": [glm.Content(role="user", parts=[glm.Part(text=prompt)])],
+    }
+    if system:
+        request["system_instruction"] = glm.Content(parts=[glm.Part(text=system)])
+    if temperature is not None:
+        request["generation_config"] = glm.GenerationConfig(temperature=temperature)
+    response = _get_gemini_client(api_key).stream_generate_content(request=glm.GenerateContentRequest(**request))
+    for chunk in response:
+        # Chunks without candidates or text parts (e.g. only a finish reason) yield nothing
+        if chunk.candidates:
+            text = "".join(part.text for part in chunk.candidates[0].content.parts)
+            if text:
+                yield text
+
+def _stream_openai(model, prompt, system, api_key, temperature):
+    messages = ([{"role": "system", "content": system}] if system else []) + [{"role": "user", "content": prompt}]
+    options = {"temperature": temperature} if temperature is not None else {}
+    response = _get_openai_client(api_key).chat.completions.create(
+        model=model, messages=messages, stream=True, **options)
+    for chunk in response:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+def direct_stream(provider, model, prompt, system=None, api_key=None, temperature=None):
+    """Calls the provider's SDK with one specific key; the gateway's default transport."""
+    api_key = api_key or default_api_key(provider)
+    if provider == GEMINI:
+        return _stream_gemini(model, prompt, system, api_key, temperature)
+    if provider == OPENAI:
+        return _stream_openai(model, prompt, system, api_key, temperature)
+    raise ValueError(f"Unknown LLM provider: {provider}")
+
+def get_gateway():
+    """The process-wide gateway, created on first use from the keys in the environment."""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            transport = fake_llm.FakeLLM.from_env() if BACKEND == "fake" else direct_stream
+            _gateway = llm_gateway.LLMGateway(
+                transport, keys={GEMINI: api_keys(GEMINI), OPENAI: api_keys(OPENAI)},
+                requests_per_minute=REQUESTS_PER_MINUTE, burst=BURST, max_attempts=MAX_ATTEMPTS)
+        return _gateway
+
+def set_gateway(gateway):
+    """Replaces the process-wide gateway (e.g. one with a fake transport); None recreates the default."""
+    global _gateway
+    with _gateway_lock:
+        _gateway = gateway
+
+def stream(provider, model, prompt, system=None, api_key=None, temperature=None):
+    """
+    Streams a completion as text chunks.
+
+    Args:
+        provider: GEMINI or OPENAI
+        model: Model name, e.g. "gemini-2.5-flash" or "gpt-4o-mini"
+        prompt: User prompt
+        system: Optional system instruction
+        api_key: Pins the request to this key; by default the gateway picks
+            the least-loaded configured key
+        temperature: Optional sampling temperature
+    """
+    if provider not in (GEMINI, OPENAI):
+        raise ValueError(f"Unknown LLM provider: {provider}")
+    return get_gateway().stream(provider, model, prompt, system=system, api_key=api_key, temperature=temperature)
+
+def collect(chunks, on_update=None):
+    """
+    Joins streamed chunks into the full text.
+    on_update(text_so_far) is called after every chunk, e.g. placeholder.markdown.
+    """
+    text = ""
+    for chunk in chunks:
+        text += chunk
+        if on_update is not None:
+            on_update(text)
+    return text
+
+def complete(provider, model, prompt, system=None, api_key=None, temperature=None):
+    """Returns the full completion text (stream() collected)."""
+    return collect(stream(provider, model, prompt, system=system, api_key=api_key, temperature=temperature))
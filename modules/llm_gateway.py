@@ -0,0 +1,299 @@
+# modules/llm_gateway.py
+"""
+Shared gateway in front of every LLM call.
+
+    rate limiting   a token bucket per API key (requests per minute + burst)
+    key selection   the least-loaded key that has a token, round-robin on ties
+    retries         exponential backoff on 429 and 5xx; a rate-limited key is
+                    cooled down and the retry goes to another key
+    coalescing      identical prompts already in flight share one request
+    metrics         per-key requests, errors, 429s and latency percentiles
+
+The gateway knows nothing about the SDKs: it calls a transport,
+transport(provider, model, prompt, system, api_key, temperature) -> iterator
+of text chunks. llm_client supplies the Gemini/OpenAI transport; tests and
+benchmarks can plug in one that talks to a local fake server.
+
+A request runs on a pump thread that writes chunks into a shared buffer,
+so every caller (the first and any coalesced ones) reads the same stream.
+A request that already produced chunks is not retried.
+"""
+import collections
+import itertools
+import random
+import re
+import threading
+import time
+
+# Error messages that mean "slow down" or "try again", for exceptions without a status code
+_RATE_LIMITED = re.compile(r'\b429\b|rate.?limit|resource.?exhausted|quota|too many requests', re.IGNORECASE)
+_SERVER_ERROR = re.compile(r'\b50[0234]\b|internal error|unavailable|deadline exceeded|overloaded', re.IGNORECASE)
+LATENCY_SAMPLES = 1000
+
+def error_status(error):
+    """HTTP-like status of an SDK exception: 429, 5xx, another code, or None if unknown."""
+    for attribute in ('status_code', 'code', 'status'):
+        value = getattr(error, attribute, None)
+        value = getattr(value, 'value', value)  # HTTPStatus / grpc codes
+        if isinstance(value, int) and 100 <= value < 600:
+            return value
+    response = getattr(error, 'response', None)
+    if isinstance(getattr(response, 'status_code', None), int):
+        return response.status_code
+    message = str(error)
+    if _RATE_LIMITED.search(message):
+        return 429
+    if _SERVER_ERROR.search(message):
+        return 503
+    return None
+
+def is_retryable(status):
+    return status is not None and (status == 429 or status >= 500)
+
+class TokenBucket:
+    """Allows `rate` requests per second on average with bursts of up to `capacity`."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now):
+        """Seconds until a token is available (0 if one is available now)."""
+        self._refill(now)
+        return 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+
+    def take(self, now):
+        self._refill(now)
+        self.tokens -= 1
+
+class _KeyState:
+    def __init__(self, provider, api_key, rate, burst, order):
+        self.provider = provider
+        self.api_key = api_key
+        self.bucket = TokenBucket(rate, burst)
+        self.order = order
+        self.in_flight = 0
+        self.cooldown_until = 0.0
+        self.last_used = 0
+        self.requests = 0
+        self.successes = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self.latencies = collections.deque(maxlen=LATENCY_SAMPLES)
+        self.first_chunk_latencies = collections.deque(maxlen=LATENCY_SAMPLES)
+
+    def ready_in(self, now):
+        return max(self.cooldown_until - now, self.bucket.wait_time(now), 0.0)
+
+class _InFlight:
+    """Chunks of one upstream request, readable by any number of callers while it runs."""
+
+    def __init__(self):
+        self.chunks = []
+        self.done = False
+        self.error = None
+        self.condition = threading.Condition()
+
+    def append(self, chunk):
+        with self.condition:
+            self.chunks.append(chunk)
+            self.condition.notify_all()
+
+    def finish(self, error=None):
+        with self.condition:
+            self.done = True
+            self.error = error
+            self.condition.notify_all()
+
+    def read(self):
+        position = 0
+        while True:
+            with self.condition:
+                while position >= len(self.chunks) and not self.done:
+                    self.condition.wait()
+                new_chunks = self.chunks[position:]
+                finished, error = self.done, self.error
+            for chunk in new_chunks:
+                yield chunk
+            position += len(new_chunks)
+            if finished and position >= len(self.chunks):
+                if error is not None:
+                    raise error
+                return
+
+def _percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+def mask_key(api_key):
+    return f"…{api_key[-4:]}" if api_key else "(default)"
+
+class LLMGateway:
+    """
+    Args:
+        transport: callable(provider, model, prompt, system, api_key, temperature) -> iterator of str
+        keys: {provider: [api keys]}; a provider without keys gets one slot with
+            api_key=None, leaving the choice to the transport
+        requests_per_minute: Sustained rate allowed per key
+        burst: Requests a key may make back to back
+        max_attempts: Tries per request, including the first
+        backoff_base: Seconds before the first retry; doubles on each retry
+    """
+
+    def __init__(self, transport, keys=None, requests_per_minute=60, burst=5, max_attempts=4, backoff_base=1.0):
+        self.transport = transport
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self._rate = requests_per_minute / 60.0
+        self._burst = burst
+        self._lock = threading.Condition()
+        self._keys = {}  # provider -> [_KeyState]
+        self._pinned = {}  # (provider, api_key) -> _KeyState for keys passed explicitly
+        self._in_flight = {}  # request key -> _InFlight
+        self._counter = itertools.count(1)
+        self._order = itertools.count()
+        self.coalesced = 0
+        for provider, api_keys in (keys or {}).items():
+            unique = list(dict.fromkeys(key for key in api_keys if key))
+            self._keys[provider] = [self._new_state(provider, key) for key in unique]
+
+    def _new_state(self, provider, api_key):
+        return _KeyState(provider, api_key, self._rate, self._burst, next(self._order))
+
+    def has_keys(self, provider):
+        return bool(self._keys.get(provider))
+
+    def _states(self, provider, api_key):
+        """Caller holds the lock. The candidate keys for a request."""
+        if api_key:
+            for state in self._keys.get(provider, []):
+                if state.api_key == api_key:
+                    return [state]
+            pinned = self._pinned.get((provider, api_key))
+            if pinned is None:
+                pinned = self._pinned[(provider, api_key)] = self._new_state(provider, api_key)
+            return [pinned]
+        states = self._keys.get(provider)
+        if not states:
+            states = self._keys[provider] = [self._new_state(provider, None)]
+        return states
+
+    def _acquire(self, provider, api_key):
+        """Blocks until a key has a token; returns it with the request counted as in flight."""
+        with self._lock:
+            while True:
+                now = time.monotonic()
+                states = self._states(provider, api_key)
+                # Least loaded among the keys usable now; least recently used breaks ties
+                ready = [state for state in states if state.ready_in(now) == 0]
+                if ready:
+                    state = min(ready, key=lambda s: (s.in_flight, s.last_used, s.order))
+                    state.bucket.take(now)
+                    state.in_flight += 1
+                    state.requests += 1
+                    state.last_used = next(self._counter)
+                    return state
+                self._lock.wait(timeout=min(state.ready_in(now) for state in states))
+
+    def _release(self, state, latency=None, first_chunk=None, status=None, failed=False):
+        with self._lock:
+            state.in_flight -= 1
+            if failed:
+                state.errors += 1
+                if status == 429:
+                    state.rate_limited += 1
+            else:
+                state.successes += 1
+                state.latencies.append(latency)
+                if first_chunk is not None:
+                    state.first_chunk_latencies.append(first_chunk)
+            self._lock.notify_all()
+
+    def _cool_down(self, state, seconds):
+        with self._lock:
+            state.cooldown_until = max(state.cooldown_until, time.monotonic() + seconds)
+            self._lock.notify_all()
+
+    def _pump(self, request_key, flight, provider, model, prompt, system, api_key, temperature):
+        error = None
+        try:
+            for attempt in range(1, self.max_attempts + 1):
+                state = self._acquire(provider, api_key)
+                started = time.perf_counter()
+                first_chunk = None
+                try:
+                    for chunk in self.transport(provider, model, prompt, system, state.api_key, temperature):
+                        if first_chunk is None:
+                            first_chunk = time.perf_counter() - started
+                        flight.append(chunk)
+                except Exception as e:
+                    status = error_status(e)
+                    self._release(state, status=status, failed=True)
+                    if first_chunk is not None or not is_retryable(status) or attempt == self.max_attempts:
+                        error = e
+                        return
+                    delay = self.backoff_base * (2 ** (attempt - 1)) * random.uniform(0.8, 1.2)
+                    if status == 429:
+                        # Other keys stay usable; _acquire waits only if every key is cooling down
+                        self._cool_down(state, delay)
+                    else:
+                        time.sleep(delay)
+                    continue
+                self._release(state, latency=time.perf_counter() - started, first_chunk=first_chunk)
+                return
+        except Exception as e:
+            error = e
+        finally:
+            with self._lock:
+                self._in_flight.pop(request_key, None)
+            flight.finish(error)
+
+    def stream(self, provider, model, prompt, system=None, api_key=None, temperature=None):
+        """
+        Yields the completion's text chunks. An identical request already in
+        flight is joined instead of sent again.
+        """
+        request_key = (provider, model, prompt, system, api_key, temperature)
+        with self._lock:
+            flight = self._in_flight.get(request_key)
+            if flight is not None:
+                self.coalesced += 1
+            else:
+                flight = self._in_flight[request_key] = _InFlight()
+                threading.Thread(target=self._pump, daemon=True, name="llm-gateway",
+                                 args=(request_key, flight, provider, model, prompt, system, api_key,
+                                       temperature)).start()
+        return flight.read()
+
+    def complete(self, provider, model, prompt, system=None, api_key=None, temperature=None):
+        return "".join(self.stream(provider, model, prompt, system=system, api_key=api_key, temperature=temperature))
+
+    def get_metrics(self):
+        """One row per key: load, outcomes and latency percentiles in milliseconds."""
+        with self._lock:
+            states = [state for states in self._keys.values() for state in states] + list(self._pinned.values())
+            rows = []
+            for state in states:
+                latencies = list(state.latencies)
+                first_chunks = list(state.first_chunk_latencies)
+                rows.append({
+                    'provider': state.provider,
+                    'key': mask_key(state.api_key),
+                    'in_flight': state.in_flight,
+                    'requests': state.requests,
+                    'successes': state.successes,
+                    'errors': state.errors,
+                    'rate_limited': state.rate_limited,
+                    'p50_ms': round(_percentile(latencies, 0.5) * 1000, 1) if latencies else None,
+                    'p95_ms': round(_percentile(latencies, 0.95) * 1000, 1) if latencies else None,
+                    'first_chunk_p50_ms': round(_percentile(first_chunks, 0.5) * 1000, 1) if first_chunks else None,
+                })
+            return rows
@@ -0,0 +1,134 @@
+# modules/pdf_text.py
+"""
+PDF text extraction with an on-disk cache.
+Each page's text is extracted exactly once; large documents are split into
+page ranges across a shared process pool. Results are cached by the SHA-256 of
+the file's bytes, so re-uploading the same resume or JD is instant.
+
+The pool is created on first use and its workers start from a forkserver
+(spawn where that is unavailable): forking the threaded Streamlit server
+could copy a lock another thread holds. jd_batch reuses it via get_pool().
+"""
+import atexit
+import hashlib
+import io
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import PyPDF2
+
+CACHE_DIR = os.getenv("PDF_TEXT_CACHE_DIR", ".pdf_text_cache")
+# Bump when the extraction logic changes so old cache files are ignored
+EXTRACTOR_VERSION = 1
+# Documents with at least this many pages are extracted in parallel
+PARALLEL_MIN_PAGES = 16
+POOL_WORKERS = int(os.getenv("PDF_TEXT_WORKERS", str(os.cpu_count() or 1)))
+
+def _read_bytes(source):
+    """Accepts a path, raw bytes or a file-like object (e.g. a Streamlit upload)."""
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            return f.read()
+    if hasattr(source, "getvalue"):
+        return source.getvalue()
+    source.seek(0)
+    return source.read()
+
+def _cache_path(digest):
+    return os.path.join(CACHE_DIR, f"{digest}.v{EXTRACTOR_VERSION}.txt")
+
+def _load_cached(digest):
+    try:
+        with open(_cache_path(digest), "r", encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return None
+
+def _store_cached(digest, text):
+    """Writes atomically so a concurrent reader never sees a partial file."""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, _cache_path(digest))
+    except OSError as e:
+        print(f"Could not cache PDF text: {e}")
+
+# --- Process pool ---
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    """The process-wide extraction pool, created on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            _pool = ProcessPoolExecutor(max_workers=POOL_WORKERS, mp_context=multiprocessing.get_context(method))
+        return _pool
+
+def reset_pool():
+    """Shuts the pool down; the next get_pool() starts a fresh one (e.g. after a worker died)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+atexit.register(reset_pool)
+
+# --- Extraction ---
+def _extract_page_range(data, start, stop):
+    """Text of pages [start, stop); runs in a worker process for large PDFs."""
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+def _extract_pages(data, parallel_min_pages, max_workers):
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    page_count = len(reader.pages)
+    workers = min(max_workers or POOL_WORKERS, page_count)
+    if page_count < parallel_min_pages or workers < 2:
+        return [page.extract_text() or "" for page in reader.pages]
+
+    # One contiguous range per worker keeps the per-process PDF parse to one
+    bounds = [page_count * i // workers for i in range(workers + 1)]
+    try:
+        chunks = get_pool().map(_extract_page_range, [data] * workers, bounds[:-1], bounds[1:])
+        return [text for chunk in chunks for text in chunk]
+    except (BrokenProcessPool, OSError, RuntimeError) as e:
+        # e.g. a worker was killed or process creation is not permitted; extraction still works serially
+        print(f"Parallel PDF extraction failed, falling back to serial: {e}")
+        reset_pool()
+        return [page.extract_text() or "" for page in reader.pages]
+
+def extract_text(source, use_cache=True, parallel_min_pages=PARALLEL_MIN_PAGES, max_workers=None):
+    """
+    Extracts the text of a PDF.
+
+    Args:
+        source: File path, bytes or file-like object
+        use_cache: Read and write the on-disk cache
+        parallel_min_pages: Page count from which a process pool is used
+        max_workers: Page ranges to split a large PDF into (default POOL_WORKERS)
+
+    Returns:
+        The text of all pages that have any, joined by newlines
+    """
+    data = _read_bytes(source)
+    digest = hashlib.sha256(data).hexdigest()
+    if use_cache:
+        cached = _load_cached(digest)
+        if cached is not None:
+            return cached
+
+    pages = _extract_pages(data, parallel_min_pages, max_workers)
+    text = "\n".join(page for page in pages if page)
+    if use_cache:
+        _store_cached(digest, text)
+    return text
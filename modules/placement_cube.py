@@ -0,0 +1,187 @@
+# modules/placement_cube.py
+"""
+Pre-aggregated placement facts for the Placement Insights page.
+setup_database.py builds the cubes once from the companies view; the
+page then answers every filter (months x CTC range) from these aggregates
+instead of re-scanning the raw rows on each interaction.
+
+Medians stay exact: each cube keeps a row count per distinct CTC value,
+which is a complete histogram of the CTC distribution.
+
+The branches are whatever dim_branch holds when the cubes are built; they
+are stored with the cubes (placement_cube_branches), so a new branch file
+shows up on the page after the next build without code changes.
+"""
+import sqlite3
+import numpy as np
+import pandas as pd
+from modules import placement_store
+
+CUBE_TABLES = {
+    # Branch codes the cubes were built with, in display order
+    'placement_cube_branches': "Branch TEXT PRIMARY KEY, Position INTEGER",
+    # Month ordering as first seen in the source data
+    'placement_cube_months': "Month TEXT PRIMARY KEY, Position INTEGER",
+    # month x CTC: overall package statistics and student totals
+    'placement_cube_month_ctc': "Month TEXT, CTC REAL, Rows INTEGER, Placed INTEGER",
+    # branch x month x CTC over the rows where that branch placed anyone
+    'placement_cube_branch': "Branch TEXT, Month TEXT, CTC REAL, Rows INTEGER, Placed INTEGER",
+    # month x company x CTC with the per-branch split (one INTEGER column per branch is appended)
+    'placement_cube_company': "Month TEXT, Company TEXT, CTC REAL, Rows INTEGER, Placed INTEGER",
+}
+
+# Company names in the source data carry stray spaces, including non-breaking ones
+COMPANY_NAME = "TRIM(Company, char(32, 160, 9, 10, 13))"
+
+def _placed_expression(columns):
+    return " + ".join(f"COALESCE({code}, 0)" for code in columns)
+
+def build_cubes(conn):
+    """Rebuilds every cube from the companies view in one transaction."""
+    branches = placement_store.get_branches(conn)
+    placed = _placed_expression(branches) or "0"
+    with conn:
+        for table, columns in CUBE_TABLES.items():
+            if table == 'placement_cube_company':
+                columns += "".join(f", {code} INTEGER" for code in branches)
+            conn.execute(f"DROP TABLE IF EXISTS {table}")
+            conn.execute(f"CREATE TABLE {table} ({columns})")
+        conn.executemany("INSERT INTO placement_cube_branches (Branch, Position) VALUES (?, ?)",
+                         [(code, position) for position, code in enumerate(branches)])
+        # companies is a view over the normalized tables (no rowid), so take the first-seen order
+        months = {}
+        for (month,) in conn.execute("SELECT Month FROM companies WHERE Month IS NOT NULL"):
+            months.setdefault(month, len(months))
+        conn.executemany("INSERT INTO placement_cube_months (Month, Position) VALUES (?, ?)", months.items())
+        conn.execute(f"""
+        INSERT INTO placement_cube_month_ctc (Month, CTC, Rows, Placed)
+        SELECT Month, Average_CTC_LPA, COUNT(*), SUM({placed}) FROM companies GROUP BY Month, Average_CTC_LPA
+        """)
+        for code in branches:
+            conn.execute(f"""
+            INSERT INTO placement_cube_branch (Branch, Month, CTC, Rows, Placed)
+            SELECT ?, Month, Average_CTC_LPA, COUNT(*), SUM({code}) FROM companies
+            WHERE {code} > 0 GROUP BY Month, Average_CTC_LPA
+            """, (code,))
+        branch_columns = "".join(f", {code}" for code in branches)
+        branch_sums = "".join(f", SUM(COALESCE({code}, 0))" for code in branches)
+        conn.execute(f"""
+        INSERT INTO placement_cube_company (Month, Company, CTC, Rows, Placed{branch_columns})
+        SELECT Month, {COMPANY_NAME}, Average_CTC_LPA, COUNT(*), SUM({placed}){branch_sums}
+        FROM companies GROUP BY Month, {COMPANY_NAME}, Average_CTC_LPA
+        """)
+
+def cubes_exist(conn):
+    names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    return set(CUBE_TABLES) <= names
+
+class CubesMissingError(Exception):
+    """The database has no (or outdated) cubes; setup_database.py builds them."""
+
+def load_cubes(db_path="data.db"):
+    """
+    Returns {table name: DataFrame}. Reads only: build_cubes drops and recreates
+    the tables, so it runs in setup_database.py, never on a page that other
+    sessions are reading from.
+    """
+    try:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    except sqlite3.Error as e:
+        raise CubesMissingError(f"Cannot open {db_path}: {e}") from e
+    try:
+        if not cubes_exist(conn):
+            raise CubesMissingError(f"{db_path} has no placement cubes; run python setup_database.py")
+        return {table: pd.read_sql_query(f"SELECT * FROM {table}", conn) for table in CUBE_TABLES}
+    finally:
+        conn.close()
+
+# --- Aggregation helpers ---
+def weighted_median(values, counts):
+    """Exact median of a distribution given as (value, count) pairs, pandas-style for even sizes."""
+    pairs = sorted((value, count) for value, count in zip(values, counts) if count > 0 and pd.notna(value))
+    total = sum(count for _, count in pairs)
+    if total == 0:
+        return float('nan')
+    lower_rank, upper_rank = (total - 1) // 2, total // 2
+    seen, lower = 0, None
+    for value, count in pairs:
+        if lower is None and seen + count > lower_rank:
+            lower = value
+        if seen + count > upper_rank:
+            return (lower + value) / 2
+        seen += count
+    return float('nan')
+
+def weighted_mean(values, counts):
+    counts = pd.Series(counts, dtype=float)
+    total = counts.sum()
+    return float((pd.Series(values, dtype=float) * counts).sum() / total) if total else float('nan')
+
+def filter_cube(cube, months, min_ctc, max_ctc):
+    """Applies the page filters; rows without a CTC never match a CTC range."""
+    return cube[cube['Month'].isin(months) & cube['CTC'].between(min_ctc, max_ctc)]
+
+def month_order(cubes):
+    return cubes['placement_cube_months'].sort_values('Position')['Month'].tolist()
+
+def branch_order(cubes):
+    """Branch codes the cubes were built with."""
+    return cubes['placement_cube_branches'].sort_values('Position')['Branch'].tolist()
+
+def key_metrics(cubes, months, min_ctc, max_ctc):
+    month_ctc = filter_cube(cubes['placement_cube_month_ctc'], months, min_ctc, max_ctc)
+    company = filter_cube(cubes['placement_cube_company'], months, min_ctc, max_ctc)
+    return {
+        'average': weighted_mean(month_ctc['CTC'], month_ctc['Rows']),
+        'median': weighted_median(month_ctc['CTC'], month_ctc['Rows']),
+        'highest': float(month_ctc['CTC'].max()) if not month_ctc.empty else float('nan'),
+        'students': int(month_ctc['Placed'].sum()),
+        'companies': int(company['Company'].nunique()),
+    }
+
+def month_averages(cubes, months, min_ctc, max_ctc):
+    month_ctc = filter_cube(cubes['placement_cube_month_ctc'], months, min_ctc, max_ctc)
+    rows = [{'MONTH': month, 'AVERAGE_CTC_LPA': weighted_mean(group['CTC'], group['Rows'])}
+            for month, group in month_ctc.groupby('Month')]
+    return pd.DataFrame(rows, columns=['MONTH', 'AVERAGE_CTC_LPA'])
+
+def branch_totals(cubes, months, min_ctc, max_ctc):
+    company = filter_cube(cubes['placement_cube_company'], months, min_ctc, max_ctc)
+    branches = branch_order(cubes)
+    return pd.DataFrame({'Branch': branches, 'Students_Placed': [int(company[code].sum()) for code in branches]})
+
+def branch_stats(cubes, months, min_ctc, max_ctc):
+    branch = filter_cube(cubes['placement_cube_branch'], months, min_ctc, max_ctc)
+    stats = []
+    for code in branch_order(cubes):
+        group = branch[branch['Branch'] == code]
+        average = weighted_mean(group['CTC'], group['Rows'])
+        median = weighted_median(group['CTC'], group['Rows'])
+        stats.append({
+            "Branch": code,
+            # numpy rounding, as the page used before on pandas results
+            "Average_Package_LPA": round(np.float64(average), 2) if pd.notna(average) else 0,
+            "Median_Package_LPA": round(np.float64(median), 2) if pd.notna(median) else 0,
+            "Total_Students_Placed": int(group['Placed'].sum()),
+        })
+    return pd.DataFrame(stats).sort_values(by="Average_Package_LPA", ascending=False)
+
+def company_table(cubes, months, min_ctc, max_ctc):
+    """Per-company mean CTC, students placed and branch split for the filtered cube."""
+    company = filter_cube(cubes['placement_cube_company'], months, min_ctc, max_ctc).copy()
+    company['CTC_x_Rows'] = company['CTC'] * company['Rows']
+    grouped = company.groupby('Company')[['CTC_x_Rows', 'Rows', 'Placed'] + branch_order(cubes)].sum()
+    grouped['AVERAGE_CTC_LPA'] = grouped['CTC_x_Rows'] / grouped['Rows']
+    return grouped.drop(columns='CTC_x_Rows').rename(columns={'Placed': 'TOTAL_PLACED'}).reset_index()
+
+def company_summary(cubes, months, min_ctc, max_ctc, company_name):
+    company = filter_cube(cubes['placement_cube_company'], months, min_ctc, max_ctc)
+    company = company[company['Company'] == company_name]
+    branches = branch_order(cubes)
+    return {
+        'average': weighted_mean(company['CTC'], company['Rows']),
+        'median': weighted_median(company['CTC'], company['Rows']),
+        'students': int(company['Placed'].sum()),
+        'branch_split': pd.DataFrame({'Branch': branches,
+                                      'Students_Placed': [int(company[code].sum()) for code in branches]}),
+    }
@@ -0,0 +1,326 @@
+"""
+Structured query engine for the placement database (data.db).
+Common questions are translated into parameterized SQL by a local intent
+parser; anything else is turned into a single SELECT by the LLM, which
+only ever sees the schema. Queries run locally and only the result rows
+are returned.
+"""
+import os
+import re
+import sqlite3
+from pathlib import Path
+
+DB_PATH = "data.db"
+MAX_ROWS = 200
+
+# Branch codes and names come from data.db (dim_branch, see get_branches); these are
+# extra spoken forms for the known ones, used only when the branch is loaded
+BRANCH_ALIASES = {
+    'business systems': 'BBS',
+    'bioinformatics': 'BCB',
+    'cse core': 'BCE', 'cse (core)': 'BCE', 'computer science core': 'BCE',
+    'information security': 'BCI',
+    'iot': 'BCT', 'internet of things': 'BCT',
+    'data science': 'BDS',
+    'electronics': 'BEC',
+    'electrical': 'BEE',
+    'information technology': 'BIT',
+    'blockchain': 'BKT',
+}
+
+_VISIT_COLUMNS = ('Company', 'Month', 'Average_CTC_LPA')
+
+def schema_description(branches):
+    """The schema shown to the LLM, with one column per loaded branch ({code: name})."""
+    branch_lines = "\n".join(f"{code}: No. of {name} students placed." for code, name in branches.items())
+    return f"""
+Table: companies
+Company: Name of the recruiting company.
+Month: The month during which the company visited the campus, formatted like 'Jul-25'.
+Average_CTC_LPA: The average salary package (in LPA) offered by the company.
+{branch_lines}
+
+Table: placements_long (one row per company, month and branch with students placed)
+Company, Month, Average_CTC_LPA: As in companies.
+Branch: Branch code, one of the codes above.
+Placed: No. of students of that branch placed.
+"""
+
+_MONTHS = {
+    'jan': 'Jan', 'january': 'Jan', 'feb': 'Feb', 'february': 'Feb', 'mar': 'Mar', 'march': 'Mar',
+    'apr': 'Apr', 'april': 'Apr', 'may': 'May', 'jun': 'Jun', 'june': 'Jun', 'jul': 'Jul', 'july': 'Jul',
+    'aug': 'Aug', 'august': 'Aug', 'sep': 'Sep', 'sept': 'Sep', 'september': 'Sep', 'oct': 'Oct',
+    'october': 'Oct', 'nov': 'Nov', 'november': 'Nov', 'dec': 'Dec', 'december': 'Dec',
+}
+_MONTH_PATTERN = re.compile(r'\b(' + '|'.join(sorted(_MONTHS, key=len, reverse=True)) + r')\b', re.IGNORECASE)
+_NUM = r'(\d+(?:\.\d+)?)'
+_CTC_BETWEEN = re.compile(r'\bbetween\s+' + _NUM + r'\s*(?:lpa|lakhs?)?\s+(?:and|to|-)\s+' + _NUM, re.IGNORECASE)
+_CTC_ABOVE = re.compile(r'(?:\babove|\bmore\s+than|\bgreater\s+than|\bover|\bat\s+least|\bminimum(?:\s+of)?|>=?)\s*'
+                        + _NUM + r'\s*(?:lpa|lakhs?)?', re.IGNORECASE)
+_CTC_BELOW = re.compile(r'(?:\bbelow|\bless\s+than|\bunder|\bat\s+most|\bmaximum(?:\s+of)?|<=?)\s*'
+                        + _NUM + r'\s*(?:lpa|lakhs?)?', re.IGNORECASE)
+_TOP_N = re.compile(r'\btop\s+(\d+)\b', re.IGNORECASE)
+_HIGHEST = re.compile(r'\b(?:highest|best|top)\b', re.IGNORECASE)
+_HOW_MANY = re.compile(r'\bhow\s+many\b|\bcount\b|\bnumber\s+of\b|\btotal\b', re.IGNORECASE)
+_COMPANIES_WORD = re.compile(r'\bcompan(?:y|ies)\b|\brecruiters?\b', re.IGNORECASE)
+_AVERAGE = re.compile(r'\baverage\s+(?:package|ctc|salary)\b|\bmean\s+(?:package|ctc)\b', re.IGNORECASE)
+
+# Only read access is ever authorized on LLM-written SQL
+_ALLOWED_ACTIONS = {sqlite3.SQLITE_SELECT, sqlite3.SQLITE_READ, sqlite3.SQLITE_FUNCTION}
+_WRITE_KEYWORDS = re.compile(r'\b(insert|update|delete|drop|alter|create|attach|detach|pragma|replace|vacuum|reindex)\b',
+                             re.IGNORECASE)
+
+def _connect_read_only(db_path):
+    uri = Path(db_path).resolve().as_uri() + "?mode=ro"
+    conn = sqlite3.connect(uri, uri=True)
+    conn.set_authorizer(lambda action, *args: sqlite3.SQLITE_OK if action in _ALLOWED_ACTIONS
+                        else sqlite3.SQLITE_DENY)
+    return conn
+
+def _run_query(sql, params, db_path):
+    """Executes a read-only query and returns (columns, rows), capped at MAX_ROWS."""
+    conn = _connect_read_only(db_path)
+    try:
+        cursor = conn.execute(sql, params)
+        columns = [description[0] for description in cursor.description or []]
+        return columns, cursor.fetchmany(MAX_ROWS)
+    finally:
+        conn.close()
+
+def get_company_names(db_path=DB_PATH):
+    """Distinct company names, used to spot companies mentioned in a question."""
+    _, rows = _run_query("SELECT DISTINCT TRIM(Company) FROM companies", (), db_path)
+    return [row[0] for row in rows if row[0]]
+
+def get_branches(db_path=DB_PATH):
+    """{code: name} of the loaded branches in display order; a new branch file adds one."""
+    try:
+        _, rows = _run_query("SELECT branch, name FROM dim_branch ORDER BY position, branch", (), db_path)
+        return {code: name or code for code, name in rows}
+    except sqlite3.Error:
+        # A database built before the normalized tables: the wide table's branch columns
+        columns, _ = _run_query("SELECT * FROM companies LIMIT 0", (), db_path)
+        return {column: column for column in columns if column not in _VISIT_COLUMNS}
+
+def _find_months(question):
+    months = []
+    for match in _MONTH_PATTERN.finditer(question):
+        word = match.group(1).lower()
+        # "may" is usually a verb unless it follows "in"/"during"
+        if word == 'may' and not re.search(r'\b(?:in|during|of)\s+$', question[:match.start()], re.IGNORECASE):
+            continue
+        if _MONTHS[word] not in months:
+            months.append(_MONTHS[word])
+    return months
+
+def _find_branches(question, branches):
+    lower = question.lower()
+    found = []
+    for alias, code in sorted(BRANCH_ALIASES.items(), key=lambda item: len(item[0]), reverse=True):
+        if code in branches and re.search(r'(?<!\w)' + re.escape(alias) + r'(?!\w)', lower) and code not in found:
+            found.append(code)
+            lower = lower.replace(alias, ' ')
+    for code in branches:
+        if re.search(r'\b' + code + r'\b', question, re.IGNORECASE) and code not in found:
+            found.append(code)
+    return found
+
+def _find_company(question, company_names, branches=()):
+    """
+    Finds the company a question is about.
+    Returns (condition, param, label), False when a proper noun after
+    "at/in/by/for" names no known company, or None when no company is mentioned.
+    """
+    lower = question.lower()
+    matches = [name for name in company_names
+               if name.lower() in lower and re.search(r'(?<!\w)' + re.escape(name.lower()) + r'(?!\w)', lower)]
+    if matches:
+        name = max(matches, key=len)
+        return "TRIM(Company) = ?", name, name
+
+    # "Infosys" should cover "Infosys HWI DSE" and "Infosys HWI SP"
+    first_words = {}
+    for name in company_names:
+        if name.split():
+            first_words.setdefault(name.split()[0].lower(), name.split()[0])
+    for word in re.findall(r"\b[A-Z][\w&.'-]{2,}", question):
+        key = word.lower().rstrip('.')
+        if key in first_words and key not in _MONTHS and key.upper() not in branches:
+            return "TRIM(Company) LIKE ?", f"{first_words[key]}%", first_words[key]
+
+    for match in re.finditer(r"\b(?:at|in|by|for|from)\s+([A-Z][\w&.'-]+)", question):
+        word = match.group(1).lower().rstrip('.')
+        if word not in _MONTHS and word.upper() not in branches and word not in BRANCH_ALIASES:
+            return False
+    return None
+
+def parse_intent(question, company_names=(), branches=()):
+    """
+    Translates a common question into parameterized SQL.
+    branches are the loaded branch codes (get_branches); the companies view has one column each.
+    Returns (sql, params, summary) or None when the question is not recognised.
+    """
+    conditions = []
+    params = []
+    described = []
+
+    months = _find_months(question)
+    if months:
+        conditions.append("(" + " OR ".join("Month LIKE ?" for _ in months) + ")")
+        params.extend(f"{month}%" for month in months)
+        described.append("in " + "/".join(months))
+
+    between = _CTC_BETWEEN.search(question)
+    above = _CTC_ABOVE.search(question)
+    below = _CTC_BELOW.search(question)
+    if between:
+        low, high = sorted((float(between.group(1)), float(between.group(2))))
+        conditions.append("Average_CTC_LPA BETWEEN ? AND ?")
+        params.extend([low, high])
+        described.append(f"offering {low:g}-{high:g} LPA")
+    else:
+        if above:
+            conditions.append("Average_CTC_LPA > ?")
+            params.append(float(above.group(1)))
+            described.append(f"offering above {float(above.group(1)):g} LPA")
+        if below:
+            conditions.append("Average_CTC_LPA < ?")
+            params.append(float(below.group(1)))
+            described.append(f"offering below {float(below.group(1)):g} LPA")
+
+    company = _find_company(question, company_names, branches)
+    if company is False:
+        # Names a company we have no rows for; let the caller fall back
+        return None
+    if company:
+        condition, param, label = company
+        conditions.append(condition)
+        params.append(param)
+        described.append(f"for {label}")
+
+    asked_branches = _find_branches(question, branches)
+    how_many = bool(_HOW_MANY.search(question))
+    top_n = _TOP_N.search(question)
+    wants_top = bool(top_n) or bool(_HIGHEST.search(question))
+    wants_average = bool(_AVERAGE.search(question))
+
+    if not (conditions or asked_branches or wants_top or (how_many and _COMPANIES_WORD.search(question))):
+        return None
+
+    where = (" WHERE " + " AND ".join(conditions)) if conditions else ""
+    scope = (" " + " ".join(described)) if described else ""
+
+    if wants_average:
+        sql = f"SELECT ROUND(AVG(Average_CTC_LPA), 2) AS Average_CTC_LPA, COUNT(*) AS Companies FROM companies{where}"
+        return sql, params, f"Average package{scope}"
+
+    if how_many:
+        if asked_branches:
+            # The long-format fact table is indexed by branch, so this avoids a wide scan
+            branch_filter = f"Branch IN ({', '.join('?' for _ in asked_branches)})"
+            sql = (f"SELECT Company, Month, SUM(Placed) AS Students_Placed FROM placements_long"
+                   f" WHERE {' AND '.join(conditions + [branch_filter])}"
+                   f" GROUP BY Company, Month ORDER BY Students_Placed DESC")
+            return sql, params + asked_branches, f"{'/'.join(asked_branches)} students placed{scope}"
+        if _COMPANIES_WORD.search(question) and not company:
+            sql = f"SELECT COUNT(DISTINCT TRIM(Company)) AS Companies FROM companies{where}"
+            return sql, params, f"Number of companies{scope}"
+        placed = " + ".join(f"COALESCE({code}, 0)" for code in branches) or "0"
+        sql = f"SELECT SUM({placed}) AS Students_Placed FROM companies{where}"
+        return sql, params, f"Students placed{scope}"
+
+    columns = ["Company", "Month", "Average_CTC_LPA"] + asked_branches
+    if asked_branches:
+        conditions.append("(" + " + ".join(f"COALESCE({code}, 0)" for code in asked_branches) + ") > 0")
+        where = " WHERE " + " AND ".join(conditions)
+        scope += f" that placed {'/'.join(asked_branches)} students"
+    sql = f"SELECT {', '.join(columns)} FROM companies{where} ORDER BY Average_CTC_LPA DESC"
+    if wants_top:
+        limit = int(top_n.group(1)) if top_n else 10
+        sql += f" LIMIT {limit}"
+        return sql, params, f"Top {limit} companies by package{scope}"
+    return sql, params, f"Companies{scope}"
+
+def question_signature(question, company_names=(), branches=()):
+    """
+    The parts of a question that change its answer: months, CTC bounds and
+    other numbers, company, branches, capitalized names and the kind of
+    question. Two phrasings with the same signature can share an answer.
+    """
+    company = _find_company(question, company_names, branches)
+    names = frozenset(word.lower().rstrip('.') for word in re.findall(r"(?<!^)\b[A-Z][\w&.'-]+", question.strip())
+                      if word.lower().rstrip('.') not in _MONTHS and word.upper() not in branches)
+    return (
+        frozenset(_find_months(question)),
+        frozenset(float(number) for number in re.findall(_NUM, question)),
+        bool(_CTC_BETWEEN.search(question)), bool(_CTC_ABOVE.search(question)), bool(_CTC_BELOW.search(question)),
+        company[2] if company else None,
+        names,
+        frozenset(_find_branches(question, branches)),
+        bool(_HOW_MANY.search(question)), bool(_HIGHEST.search(question)), bool(_AVERAGE.search(question)),
+        bool(_COMPANIES_WORD.search(question)),
+    )
+
+def build_sql_prompt(question, branches):
+    """System prompt asking the LLM for one SQLite SELECT over the schema (no data)."""
+    return f"""
+You translate questions about VIT placement data into SQLite queries.
+Return exactly one SQLite SELECT statement and nothing else: no explanation, no Markdown fences.
+Use only this schema:
+{schema_description(branches)}
+Match company names case-insensitively with LIKE. Month values look like 'Jul-25'.
+"""
+
+def _clean_llm_sql(text):
+    """Strips code fences and trailing semicolons; rejects anything but one SELECT."""
+    sql = re.sub(r'^```(?:sql)?|```$', '', (text or '').strip(), flags=re.IGNORECASE | re.MULTILINE).strip()
+    sql = sql.rstrip(';').strip()
+    if ';' in sql or not re.match(r'^(select|with)\b', sql, re.IGNORECASE) or _WRITE_KEYWORDS.search(sql):
+        raise ValueError(f"The model did not return a single SELECT statement: {sql[:200]}")
+    return sql
+
+def answer_query(question, llm_complete=None, db_path=DB_PATH):
+    """
+    Answers a natural-language question with a local SQL query.
+
+    Args:
+        question: The user's question
+        llm_complete: Optional callable (system_prompt, question) -> text used to
+            write SQL for questions the intent parser does not recognise
+        db_path: Path to the placement database
+
+    Returns:
+        Dict with 'source' ('intent' or 'llm'), 'sql', 'params', 'columns',
+        'rows', 'summary' and 'error' (None on success)
+    """
+    result = {'source': None, 'sql': None, 'params': [], 'columns': [], 'rows': [],
+              'summary': None, 'error': None}
+    if not os.path.exists(db_path):
+        result['error'] = "Database file not found! Please ensure 'data.db' exists in the project folder."
+        return result
+
+    try:
+        branches = get_branches(db_path)
+        intent = parse_intent(question, get_company_names(db_path), branches)
+        if intent is not None:
+            result['sql'], result['params'], result['summary'] = intent
+            result['source'] = 'intent'
+        elif llm_complete is not None:
+            result['sql'] = _clean_llm_sql(llm_complete(build_sql_prompt(question, branches), question))
+            result['summary'] = "Query results"
+            result['source'] = 'llm'
+        else:
+            result['error'] = "Sorry, I couldn't understand that question."
+            return result
+        result['columns'], result['rows'] = _run_query(result['sql'], result['params'], db_path)
+    except sqlite3.OperationalError as e:
+        if 'no such table: placements_long' in str(e):
+            # A wide-only database that setup_database.py has not normalized yet
+            result['error'] = f"{db_path} has no placements_long view; run python setup_database.py"
+        else:
+            result['error'] = f"Error answering query: {e}"
+    except (sqlite3.Error, ValueError) as e:
+        result['error'] = f"Error answering query: {e}"
+    except Exception as e:
+        result['error'] = f"Error querying model: {e}"
+    return result
@@ -0,0 +1,413 @@
+# modules/placement_store.py
+"""
+Normalized placement data in data.db.
+
+    dim_company(company_id, name)          dim_branch(branch, name, position)
+    dim_month(month, position)             company_visits(company_id, month, avg_ctc, position, row_hash)
+    placements(company_id, month, branch, placed, avg_ctc, source)
+
+placements is the long-format fact table: one row per company, month and
+branch with at least one student placed, indexed by branch and month.
+company_visits keeps one row per company per month (also the visits where
+nobody was placed), so the wide `companies` table that the existing pages
+query can be reproduced exactly as a view. The view's branch columns are
+generated from dim_branch, so a new branch is a new row, not a schema change.
+
+Loads are incremental: unchanged source files are skipped by size, mtime
+and sha256, changed files are diffed row by row against the stored row
+hashes, and only the delta is written. Every load that changes data bumps
+the data version that pages use as their cache key.
+"""
+import glob
+import hashlib
+import json
+import os
+import sqlite3
+import pandas as pd
+
+BRANCH_NAMES = {
+    'BBS': 'CSE (Business Systems)',
+    'BCB': 'CSE (Bioinformatics)',
+    'BCE': 'CSE (Core)',
+    'BCI': 'CSE (Information Security)',
+    'BCT': 'CSE (IoT)',
+    'BDS': 'CSE (Data Science)',
+    'BEC': 'Electronics Engineering',
+    'BEE': 'Electrical Engineering',
+    'BIT': 'Information Technology',
+    'BKT': 'CSE (Blockchain Technology)',
+}
+_VISIT_COLUMNS = ('Company', 'Month', 'Average_CTC_LPA')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dim_company (
+    company_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS dim_branch (
+    branch TEXT PRIMARY KEY,
+    name TEXT,
+    position INTEGER
+);
+CREATE TABLE IF NOT EXISTS dim_month (
+    month TEXT PRIMARY KEY,
+    position INTEGER
+);
+CREATE TABLE IF NOT EXISTS company_visits (
+    company_id INTEGER NOT NULL REFERENCES dim_company(company_id),
+    month TEXT,
+    avg_ctc REAL,
+    position INTEGER,
+    row_hash TEXT  -- sha256 of the visit's source row, to detect changed rows
+);
+CREATE TABLE IF NOT EXISTS placements (
+    company_id INTEGER NOT NULL REFERENCES dim_company(company_id),
+    month TEXT,
+    branch TEXT NOT NULL REFERENCES dim_branch(branch),
+    placed INTEGER NOT NULL,
+    avg_ctc REAL,
+    source TEXT
+);
+CREATE TABLE IF NOT EXISTS placement_sources (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER,
+    size INTEGER,
+    sha256 TEXT
+);
+CREATE TABLE IF NOT EXISTS placement_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_company_visits_company_month ON company_visits (company_id, month);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_placements_company_month_branch ON placements (company_id, month, branch);
+CREATE INDEX IF NOT EXISTS idx_placements_branch_month ON placements (branch, month);
+CREATE INDEX IF NOT EXISTS idx_placements_month ON placements (month);
+"""
+
+def _clean_name(name):
+    """Strips ordinary and non-breaking spaces from company names."""
+    return str(name).strip(' \xa0\t\r\n') if pd.notna(name) else None
+
+def create_schema(conn):
+    conn.executescript(SCHEMA)
+    # company_visits tables created before row hashes existed need the column added
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(company_visits)")}
+    if 'row_hash' not in columns:
+        conn.execute("ALTER TABLE company_visits ADD COLUMN row_hash TEXT")
+        conn.commit()
+
+def get_data_version(db_path="data.db"):
+    """
+    Counter bumped by every load that changed the placement data; 0 before the first load.
+    Cheap enough to call on every page run and use as a cache key.
+    """
+    if not os.path.exists(db_path):
+        return 0
+    conn = sqlite3.connect(db_path)
+    try:
+        row = conn.execute("SELECT value FROM placement_meta WHERE key = 'data_version'").fetchone()
+        return int(row[0]) if row else 0
+    except sqlite3.OperationalError:
+        # Databases that predate the normalized tables
+        return 0
+    finally:
+        conn.close()
+
+def _stored_version(conn):
+    row = conn.execute("SELECT value FROM placement_meta WHERE key = 'data_version'").fetchone()
+    return int(row[0]) if row else 0
+
+def _company_id(conn, name):
+    conn.execute("INSERT OR IGNORE INTO dim_company (name) VALUES (?)", (name,))
+    return conn.execute("SELECT company_id FROM dim_company WHERE name = ?", (name,)).fetchone()[0]
+
+def _ensure_branch(conn, branch):
+    conn.execute("""
+    INSERT OR IGNORE INTO dim_branch (branch, name, position)
+    VALUES (?, ?, (SELECT COALESCE(MAX(position), -1) + 1 FROM dim_branch))
+    """, (branch, BRANCH_NAMES.get(branch, branch)))
+
+def get_branches(conn):
+    """Branch codes in display order."""
+    return [row[0] for row in conn.execute("SELECT branch FROM dim_branch ORDER BY position, branch")]
+
+def _drop_companies(conn):
+    """Drops the companies view, or the wide companies table of databases built before the fact table."""
+    row = conn.execute("SELECT type FROM sqlite_master WHERE name = 'companies'").fetchone()
+    if row:
+        conn.execute(f"DROP {row[0].upper()} companies")
+
+def create_views(conn):
+    """(Re)creates the `companies` compatibility view and the `placements_long` view."""
+    branch_columns = ",\n           ".join(
+        f"COALESCE(SUM(CASE WHEN p.branch = '{branch}' THEN p.placed END), 0) AS {branch}"
+        for branch in get_branches(conn)
+    )
+    _drop_companies(conn)
+    conn.execute(f"""
+    CREATE VIEW companies AS
+    SELECT c.name AS Company, v.month AS Month, v.avg_ctc AS Average_CTC_LPA,
+           {branch_columns}
+    FROM company_visits v
+    JOIN dim_company c ON c.company_id = v.company_id
+    LEFT JOIN placements p ON p.company_id = v.company_id AND p.month IS v.month
+    GROUP BY v.position
+    ORDER BY v.position
+    """)
+    conn.execute("DROP VIEW IF EXISTS placements_long")
+    conn.execute("""
+    CREATE VIEW placements_long AS
+    SELECT c.name AS Company, p.month AS Month, p.avg_ctc AS Average_CTC_LPA, p.branch AS Branch, p.placed AS Placed
+    FROM placements p
+    JOIN dim_company c ON c.company_id = p.company_id
+    """)
+
+def read_wide_csv(csv_path):
+    """data.csv: one row per company visit, one column per branch."""
+    df = pd.read_csv(csv_path)
+    df = df.rename(columns={'Average_CTC_(LPA)': 'Average_CTC_LPA'})
+    df['Company'] = df['Company'].map(_clean_name)
+    return df
+
+def read_branch_file(path):
+    """data/<branch>.csv: Company, Placed, Average CTC (LPA) for one branch, no month."""
+    df = pd.read_csv(path, encoding='utf-8-sig', index_col=0)
+    df = df.rename(columns={'Average CTC (LPA)': 'Average_CTC_LPA'})
+    df['Company'] = df['Company'].map(_clean_name)
+    return df
+
+def _branch_files(branch_dir):
+    """{branch code: path} for the per-branch files (overall_data.csv is not one)."""
+    files = {}
+    for path in sorted(glob.glob(os.path.join(branch_dir, '*.csv'))):
+        stem = os.path.splitext(os.path.basename(path))[0]
+        if stem.isalpha() and len(stem) <= 4:
+            files[stem.upper()] = path
+    return files
+
+def _file_stat(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _row_hash(name, month, ctc, counts):
+    """Content hash of one visit; zero counts are left out, so adding a branch column changes nothing."""
+    payload = json.dumps([name, month, ctc, sorted(counts.items())])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def _to_float(value):
+    return float(value) if pd.notna(value) else None
+
+def _desired_state(csv_path, branch_files):
+    """
+    What the tables should contain for the current source files.
+
+    Returns:
+        (visits, branch_facts, branches, warnings) where visits maps
+        (company, month) to {'position', 'ctc', 'counts', 'hash'} and
+        branch_facts maps (company, month, branch) to (placed, ctc, source)
+    """
+    wide = read_wide_csv(csv_path)
+    branches = [column for column in wide.columns if column not in _VISIT_COLUMNS]
+    branches += [code for code in branch_files if code not in branches]
+    warnings = []
+
+    visits = {}
+    for position, row in enumerate(wide.to_dict('records')):
+        if not row['Company']:
+            continue
+        month = row['Month'] if pd.notna(row['Month']) else None
+        key = (row['Company'], month)
+        if key in visits:
+            warnings.append(f"data.csv: duplicate row for {row['Company']} in {month}; counts added together")
+        else:
+            visits[key] = {'position': position, 'ctc': _to_float(row['Average_CTC_LPA']), 'counts': {}}
+        counts = visits[key]['counts']
+        for branch in branches:
+            placed = row.get(branch)
+            if pd.notna(placed) and placed > 0:
+                counts[branch] = counts.get(branch, 0) + int(placed)
+    for (name, month), visit in visits.items():
+        visit['hash'] = _row_hash(name, month, visit['ctc'], visit['counts'])
+
+    months_by_company = {}
+    for name, month in visits:
+        months_by_company.setdefault(name, []).append(month)
+
+    branch_facts = {}
+    for branch, path in branch_files.items():
+        for row in read_branch_file(path).to_dict('records'):
+            if not row['Company'] or pd.isna(row['Placed']):
+                continue
+            name, placed = row['Company'], int(row['Placed'])
+            existing = [visits[(name, month)]['counts'][branch] for month in months_by_company.get(name, [])
+                        if branch in visits[(name, month)]['counts']]
+            if existing:
+                # Companies that visited in several months repeat the same count each month
+                if any(count != placed for count in existing):
+                    warnings.append(f"{os.path.basename(path)}: {name} placed {placed}, data.csv has {existing}")
+                continue
+            months = months_by_company.get(name, [])
+            if len(months) != 1:
+                # An undated fact would match no company visit, so it could never reach the view or the cubes
+                where = "is not in data.csv" if not months else f"visited in {len(months)} months"
+                warnings.append(f"{os.path.basename(path)}: {name} {where}; its {placed} placed cannot be "
+                                f"dated and is skipped")
+                continue
+            branch_facts[(name, months[0], branch)] = (placed, _to_float(row.get('Average_CTC_LPA')),
+                                                       os.path.basename(path))
+    return visits, branch_facts, branches, warnings
+
+def ingest(conn, csv_path="data.csv", branch_dir="data", force=False):
+    """
+    Brings the placement tables in line with data.csv and the per-branch files.
+
+    data.csv is authoritative. A per-branch row adds a fact only when its
+    company has no row for that branch in data.csv; it is dated with the
+    company's month, so it is skipped with a warning when the company is not
+    in data.csv or visited in several months. Counts that disagree with
+    data.csv are reported, not applied.
+
+    Nothing is written when no source file changed. Otherwise only new,
+    changed and removed rows are written, in one transaction, and the data
+    version is bumped.
+
+    Args:
+        force: Diff every row even if the source files look unchanged
+
+    Returns:
+        Dict with 'changed', 'data_version', 'inserted', 'updated',
+        'deleted', 'visits', 'placements', 'from_branch_files' and 'warnings'
+    """
+    branch_files = _branch_files(branch_dir) if branch_dir and os.path.isdir(branch_dir) else {}
+    paths = [csv_path] + list(branch_files.values())
+    legacy = conn.execute("SELECT type FROM sqlite_master WHERE name = 'companies'").fetchone()
+    if legacy and legacy[0] == 'table':
+        with conn:
+            _drop_companies(conn)  # the wide table of databases built before the fact table
+        force = True
+    create_schema(conn)
+
+    summary = {'changed': False, 'data_version': _stored_version(conn), 'inserted': 0, 'updated': 0,
+               'deleted': 0, 'warnings': []}
+    stored = {path: (mtime_ns, size, sha) for path, mtime_ns, size, sha
+              in conn.execute("SELECT path, mtime_ns, size, sha256 FROM placement_sources")}
+    stats = {path: _file_stat(path) for path in paths}
+    if not force and set(stored) == set(paths) and all(stored[path][:2] == stats[path] for path in paths):
+        return _with_counts(conn, summary)
+
+    hashes = {path: _file_sha256(path) for path in paths}
+    sources = [(path, *stats[path], hashes[path]) for path in paths]
+    if not force and set(stored) == set(paths) and all(stored[path][2] == hashes[path] for path in paths):
+        # Touched but identical: remember the new mtimes so the next load skips them again
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO placement_sources (path, mtime_ns, size, sha256) "
+                             "VALUES (?, ?, ?, ?)", sources)
+        return _with_counts(conn, summary)
+
+    visits, branch_facts, branches, summary['warnings'] = _desired_state(csv_path, branch_files)
+    current_visits = {(name, month): (company_id, position, row_hash) for company_id, name, month, position, row_hash
+                      in conn.execute("""
+                      SELECT v.company_id, c.name, v.month, v.position, v.row_hash
+                      FROM company_visits v JOIN dim_company c ON c.company_id = v.company_id
+                      """)}
+    current_facts = {(name, month, branch): (placed, avg_ctc, source)
+                     for name, month, branch, placed, avg_ctc, source in conn.execute("""
+                     SELECT c.name, p.month, p.branch, p.placed, p.avg_ctc, p.source
+                     FROM placements p JOIN dim_company c ON c.company_id = p.company_id
+                     WHERE p.source != 'data.csv'
+                     """)}
+    known_branches = set(get_branches(conn))
+
+    with conn:
+        for branch in branches:
+            _ensure_branch(conn, branch)
+
+        # Facts from the branch files that are gone or changed
+        for key in set(current_facts) - set(branch_facts) | {
+                key for key in branch_facts if key in current_facts and current_facts[key] != branch_facts[key]}:
+            name, month, branch = key
+            conn.execute("""
+            DELETE FROM placements WHERE company_id = (SELECT company_id FROM dim_company WHERE name = ?)
+            AND month IS ? AND branch = ? AND source != 'data.csv'
+            """, (name, month, branch))
+            summary['deleted' if key not in branch_facts else 'updated'] += 1
+
+        # Visits that left data.csv
+        for (name, month), (company_id, _, _) in current_visits.items():
+            if (name, month) not in visits:
+                conn.execute("DELETE FROM placements WHERE company_id = ? AND month IS ? AND source = 'data.csv'",
+                             (company_id, month))
+                conn.execute("DELETE FROM company_visits WHERE company_id = ? AND month IS ?", (company_id, month))
+                summary['deleted'] += 1
+
+        # New and changed visits; rows that only moved within the file just get their position updated
+        for (name, month), visit in visits.items():
+            current = current_visits.get((name, month))
+            if current and current[2] == visit['hash']:
+                if current[1] != visit['position']:
+                    conn.execute("UPDATE company_visits SET position = ? WHERE company_id = ? AND month IS ?",
+                                 (visit['position'], current[0], month))
+                continue
+            company_id = current[0] if current else _company_id(conn, name)
+            conn.execute("DELETE FROM placements WHERE company_id = ? AND month IS ? AND source = 'data.csv'",
+                         (company_id, month))
+            conn.execute("""
+            INSERT INTO company_visits (company_id, month, avg_ctc, position, row_hash) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (company_id, month) DO UPDATE SET
+                avg_ctc = excluded.avg_ctc, position = excluded.position, row_hash = excluded.row_hash
+            """, (company_id, month, visit['ctc'], visit['position'], visit['hash']))
+            conn.executemany("""
+            INSERT INTO placements (company_id, month, branch, placed, avg_ctc, source)
+            VALUES (?, ?, ?, ?, ?, 'data.csv')
+            """, [(company_id, month, branch, placed, visit['ctc']) for branch, placed in visit['counts'].items()])
+            summary['updated' if current else 'inserted'] += 1
+
+        # New and changed facts from the branch files
+        for key, (placed, ctc, source) in branch_facts.items():
+            if current_facts.get(key) == (placed, ctc, source):
+                continue
+            name, month, branch = key
+            conn.execute("""
+            INSERT INTO placements (company_id, month, branch, placed, avg_ctc, source)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """, (_company_id(conn, name), month, branch, placed, ctc, source))
+            if key not in current_facts:
+                summary['inserted'] += 1
+
+        changed = summary['inserted'] or summary['updated'] or summary['deleted'] or not current_visits
+        if changed:
+            conn.execute("DELETE FROM dim_month")
+            first_seen = {}
+            for (_, month), visit in sorted(visits.items(), key=lambda item: item[1]['position']):
+                if month is not None:
+                    first_seen.setdefault(month, visit['position'])
+            conn.executemany("INSERT INTO dim_month (month, position) VALUES (?, ?)", first_seen.items())
+            summary['data_version'] += 1
+            conn.execute("INSERT OR REPLACE INTO placement_meta (key, value) VALUES ('data_version', ?)",
+                         (str(summary['data_version']),))
+        has_view = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'view' AND name = 'companies'").fetchone()
+        if not has_view or set(branches) - known_branches:
+            create_views(conn)
+        conn.execute("DELETE FROM placement_sources")
+        conn.executemany("INSERT INTO placement_sources (path, mtime_ns, size, sha256) VALUES (?, ?, ?, ?)",
+                         sources)
+
+    if changed:
+        conn.execute("ANALYZE")
+        conn.commit()
+    summary['changed'] = bool(changed)
+    return _with_counts(conn, summary)
+
+def _with_counts(conn, summary):
+    summary['visits'] = conn.execute("SELECT COUNT(*) FROM company_visits").fetchone()[0]
+    summary['placements'] = conn.execute("SELECT COUNT(*) FROM placements").fetchone()[0]
+    summary['from_branch_files'] = conn.execute(
+        "SELECT COUNT(*) FROM placements WHERE source != 'data.csv'").fetchone()[0]
+    return summary
@@ -0,0 +1,203 @@
+# modules/resume_analysis.py
+"""
+The JD Resume Matcher's Gemini stages as a small dependency graph.
+
+    skills -> match -> recommendations
+                    -> summary
+
+Stages run in a thread pool as soon as their inputs are ready, so
+recommendations and the recruiter summary are generated concurrently; the
+shared LLM gateway spreads the calls over the configured API keys.
+Progress is reported through events handled in the calling thread, which
+is the only thread allowed to touch Streamlit.
+"""
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from modules import llm_client
+
+STAGE_DEPENDENCIES = {
+    'skills': [],
+    'match': ['skills'],
+    'recommendations': ['match'],
+    'summary': ['match'],
+}
+
+def run_dag(tasks, dependencies, max_workers=4, on_event=None):
+    """
+    Runs tasks in dependency order with as much parallelism as the graph allows.
+
+    Args:
+        tasks: {name: callable(results, emit)}; results holds the outputs of
+            finished tasks and emit(payload) reports progress for this task
+        dependencies: {name: [names it needs]}
+        max_workers: Thread pool size
+        on_event: Optional callable(kind, name, payload), always called in the
+            calling thread. kind is 'start', 'progress', 'done' (payload is the
+            result), 'error' (payload is the exception) or 'skipped'
+
+    Returns:
+        (results, timings): timings maps name -> (start, end) seconds since the run started
+    """
+    events = queue.Queue()
+    results, timings, errors = {}, {}, {}
+    pending = set(tasks)
+    running = set()
+    started_at = time.perf_counter()
+
+    def notify(kind, name, payload=None):
+        if on_event is not None:
+            on_event(kind, name, payload)
+
+    def execute(name):
+        start = time.perf_counter() - started_at
+        events.put(('start', name, None))
+        try:
+            result = tasks[name](dict(results), lambda payload: events.put(('progress', name, payload)))
+        except Exception as e:
+            events.put(('error', name, (e, start, time.perf_counter() - started_at)))
+        else:
+            events.put(('done', name, (result, start, time.perf_counter() - started_at)))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        def submit_ready():
+            changed = True
+            while changed:
+                changed = False
+                for name in sorted(pending):
+                    needs = dependencies.get(name, [])
+                    if any(dependency in errors for dependency in needs):
+                        # A failed input fails everything downstream of it
+                        pending.discard(name)
+                        errors[name] = None
+                        notify('skipped', name)
+                        changed = True
+                    elif all(dependency in results for dependency in needs):
+                        pending.discard(name)
+                        running.add(name)
+                        pool.submit(execute, name)
+
+        submit_ready()
+        while running:
+            kind, name, payload = events.get()
+            if kind in ('done', 'error'):
+                value, start, end = payload
+                running.discard(name)
+                timings[name] = (start, end)
+                if kind == 'done':
+                    results[name] = value
+                else:
+                    errors[name] = value
+                notify(kind, name, value)
+                submit_ready()
+            else:
+                notify(kind, name, payload)
+    return results, timings
+
+# --- Prompts ---
+def skills_prompt(resume_text):
+    return f"""
+You are a professional resume analyzer AI.
+Extract all skills, experience, projects, certifications, education details, and main keywords from the candidate's resume below. Structure your output as:
+
+Skills:
+Experience:
+Certifications:
+Projects:
+Education:
+Tailored Keywords:
+
+Resume:
+{resume_text}
+"""
+
+def match_prompt(job_description, skills_report):
+    return f"""
+You are an expert at resume-job matching.
+Given these:
+Job Description:
+{job_description}
+
+Resume Summary:
+{skills_report}
+
+1. Analyze the overlap and differences between required and provided skills/evidence.
+2. List clear matches and clear gaps (missing/weak areas).
+3. Assign a detailed suitability score out of 10, with reasoning.
+
+Use this structure:
+Matched Requirements:
+Missing/Weak Areas:
+Suitability Score (1-10) with reason:
+"""
+
+def recommendation_prompt(match_report):
+    return f"""
+Imagine you are a career coach for job applicants.
+Given the following analysis, suggest actionable recommendations the candidate should follow to improve their chances of getting this job.
+Your recommendations should be practical, focused, and tailored to this job description and resume.
+
+Analysis:
+{match_report}
+
+Structure:
+1. Immediate Resume/Skill Improvement Actions: (If match is <8.5, then give 1 solid project idea and professional certifications or courses available in the internet, along with any improvement tips that can be made in the resume). If score > 8.5, you can give general tips/resume based tips.
+2. Longer-Term Career/Skill Tips:
+"""
+
+def summary_prompt(job_description, match_report):
+    # Built from the match report alone so it can run alongside the recommendations
+    return f"""
+Summarize the candidate's suitability for this job in 2-3 recruiter-friendly sentences, using this info:
+
+Job Description:
+{job_description}
+
+Candidate Resume Analysis:
+{match_report}
+
+Output only the summary for a recruiter.
+"""
+
+# --- Pipeline ---
+def _gemini_stage(model, build_prompt):
+    """
+    A DAG task that streams one Gemini completion. API errors propagate, so
+    run_dag reports the stage as failed and skips the stages that need it.
+    """
+    def task(results, emit):
+        chunks = llm_client.stream(llm_client.GEMINI, model, build_prompt(results))
+        return llm_client.collect(chunks, on_update=emit).strip()
+    return task
+
+def analyze(resume_text, job_description, model, on_event=None, max_workers=3):
+    """
+    Runs the four analysis stages.
+
+    Args:
+        resume_text: Extracted resume text
+        job_description: Job description text
+        model: Gemini model name
+        on_event: See run_dag; 'progress' payloads are the stage's text so far,
+            'error' payloads the exception
+
+    Returns:
+        (results, timings) keyed by 'skills', 'match', 'recommendations', 'summary';
+        results has only the stages that succeeded
+    """
+    tasks = {
+        'skills': _gemini_stage(model, lambda results: skills_prompt(resume_text)),
+        'match': _gemini_stage(model, lambda results: match_prompt(job_description, results['skills'])),
+        'recommendations': _gemini_stage(model, lambda results: recommendation_prompt(results['match'])),
+        'summary': _gemini_stage(model, lambda results: summary_prompt(job_description, results['match'])),
+    }
+    return run_dag(tasks, STAGE_DEPENDENCIES, max_workers=max_workers, on_event=on_event)
+
+def format_timings(timings):
+    """Rows for a timings table plus the wall-clock and summed stage time."""
+    rows = [{'Stage': name, 'Started (s)': round(start, 2), 'Finished (s)': round(end, 2),
+             'Duration (s)': round(end - start, 2)}
+            for name, (start, end) in sorted(timings.items(), key=lambda item: item[1][0])]
+    wall_clock = max((end for _, end in timings.values()), default=0.0)
+    sequential = sum(end - start for start, end in timings.values())
+    return rows, round(wall_clock, 2), round(sequential, 2)
@@ -0,0 +1,207 @@
+# modules/semantic_cache.py
+"""
+In-memory near-duplicate matcher for previously answered questions.
+Questions are indexed as TF-IDF vectors over their content words in an
+inverted index (CPU only, no external model). A new question reuses a
+stored answer when its cosine similarity reaches the threshold and its
+signature (the entities that change the answer: months, numbers,
+branches, company, ...) is identical. Negations and comparison
+directions are always part of the signature: "not above 10 LPA" shares
+almost every term with "above 10 LPA" but has the opposite answer.
+"""
+import math
+import re
+import threading
+from collections import OrderedDict, defaultdict
+
+STOPWORDS = frozenset("""
+a an the of in on at for to from by with and or is are was were be been do does did
+me my i we our you your please show list tell give find what which who whose whom
+that this these those there their it its can could would will shall should about any all
+""".split())
+
+# Signature groups up to this size are scored exhaustively
+SCAN_GROUP_SIZE = 256
+
+_NEGATION = re.compile(r"\b(?:not|no|never|none|neither|nor|without|except|excluding)\b|n't\b", re.IGNORECASE)
+# Comparison words by the direction they ask for; "at least"/"at most" are tried first
+_COMPARISONS = (
+    ('gt', r'\bat\s+least\b|\b(?:above|over|more|greater|higher|exceeding)\b|>'),
+    ('lt', r'\bat\s+most\b|\b(?:below|under|less|fewer|lower)\b|<'),
+    ('max', r'\b(?:highest|most|top|best|maximum)\b'),
+    ('min', r'\b(?:lowest|least|bottom|worst|minimum)\b'),
+    ('between', r'\bbetween\b'),
+)
+_COMPARISON = re.compile('|'.join(f'(?P<{name}>{pattern})' for name, pattern in _COMPARISONS), re.IGNORECASE)
+
+def _stem(word):
+    """Very light stemming so plurals share a term."""
+    if len(word) > 4 and word.endswith('ies'):
+        return word[:-3] + 'y'
+    if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+        return word[:-1]
+    return word
+
+def extract_terms(text):
+    """
+    Set of stemmed content words in a question. Word order is ignored on
+    purpose: rewordings mostly reorder, and the signature guards the
+    entities that word order would otherwise protect.
+    """
+    return {_stem(word) for word in re.findall(r"[a-z0-9]+(?:\.[0-9]+)?", (text or '').lower())
+            if word not in STOPWORDS}
+
+def guard_signature(text):
+    """
+    Negation count and comparison directions of a question. Term-set cosine
+    cannot tell "not above" from "above" or "below" from "above", so two
+    questions only match when these agree.
+    """
+    directions = frozenset(match.lastgroup for match in _COMPARISON.finditer(text or ''))
+    return len(_NEGATION.findall(text or '')), directions
+
+class SemanticCache:
+    """
+    Bounded LRU index of answered questions with cosine-similarity lookup.
+
+    Args:
+        threshold: Minimum cosine similarity (0-1) for a stored answer to be reused
+        max_entries: Maximum number of questions kept; least recently used are evicted
+        signature_fn: Optional callable(question) -> hashable; only questions with
+            equal signatures (and equal guard_signature) can match each other
+    """
+
+    def __init__(self, threshold=0.85, max_entries=10000, signature_fn=None):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.signature_fn = signature_fn or (lambda question: None)
+        self.tag = None  # e.g. the data fingerprint the answers belong to
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # entry_id -> (question, answer, terms, signature)
+        self._postings = defaultdict(set)  # term -> entry_ids
+        self._by_signature = defaultdict(set)  # signature -> entry_ids
+        self._by_question = {}  # question -> entry_id, so re-asking replaces instead of duplicating
+        self._next_id = 0
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _signature(self, question):
+        return guard_signature(question), self.signature_fn(question)
+
+    def _idf(self, term):
+        return math.log((len(self._entries) + 1) / (len(self._postings.get(term, ())) + 1)) + 1.0
+
+    def _weights(self, terms):
+        weights = {term: self._idf(term) for term in terms}
+        norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+        return {term: weight / norm for term, weight in weights.items()}
+
+    def _candidates(self, query_weights, signature):
+        """
+        Only questions with the same signature can match. Small signature
+        groups are scanned whole; for large ones prefix filtering applies: a
+        stored question sharing none of the query's rarest terms has cosine
+        <= sqrt(sum of the remaining squared weights), so only the postings
+        of the rare prefix need to be scanned.
+        """
+        group = self._by_signature.get(signature, set())
+        if len(group) <= SCAN_GROUP_SIZE:
+            return group
+        ordered = sorted(query_weights.items(), key=lambda item: item[1], reverse=True)
+        suffix_mass = sum(weight * weight for _, weight in ordered)
+        candidates = set()
+        for term, weight in ordered:
+            if math.sqrt(suffix_mass) < self.threshold:
+                break
+            candidates.update(self._postings.get(term, ()))
+            suffix_mass -= weight * weight
+        return candidates & group
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            entry_id, (question, _, terms, signature) = self._entries.popitem(last=False)
+            self._forget(entry_id, question, terms, signature)
+            self.stats['evictions'] += 1
+
+    def _forget(self, entry_id, question, terms, signature):
+        """Removes an entry (already popped from _entries) from the lookup structures."""
+        if self._by_question.get(question) == entry_id:
+            del self._by_question[question]
+        group = self._by_signature[signature]
+        group.discard(entry_id)
+        if not group:
+            del self._by_signature[signature]
+        for term in terms:
+            posting = self._postings.get(term)
+            if posting is not None:
+                posting.discard(entry_id)
+                if not posting:
+                    del self._postings[term]
+
+    def add(self, question, answer):
+        """Indexes an answered question."""
+        terms = extract_terms(question)
+        if not terms:
+            return
+        signature = self._signature(question)
+        with self._lock:
+            previous_id = self._by_question.get(question)
+            if previous_id is not None:
+                _, _, previous_terms, previous_signature = self._entries.pop(previous_id)
+                self._forget(previous_id, question, previous_terms, previous_signature)
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = (question, answer, frozenset(terms), signature)
+            for term in terms:
+                self._postings[term].add(entry_id)
+            self._by_signature[signature].add(entry_id)
+            self._by_question[question] = entry_id
+            self._evict()
+
+    def lookup(self, question):
+        """
+        Finds the most similar stored question.
+        Returns (answer, similarity, matched_question) or None below the threshold.
+        """
+        terms = extract_terms(question)
+        signature = self._signature(question)
+        with self._lock:
+            if not terms or not self._entries:
+                self.stats['misses'] += 1
+                return None
+            query_weights = self._weights(terms)
+            idf = {}  # terms repeat across candidates; compute each idf once per lookup
+            best_id, best_score = None, 0.0
+            for entry_id in self._candidates(query_weights, signature):
+                stored_terms = self._entries[entry_id][2]
+                for term in stored_terms:
+                    if term not in idf:
+                        idf[term] = self._idf(term)
+                norm = math.sqrt(sum(idf[term] * idf[term] for term in stored_terms))
+                score = sum(query_weights[term] * idf[term] for term in stored_terms if term in query_weights) / norm
+                if score > best_score:
+                    best_id, best_score = entry_id, score
+            if best_id is None or best_score < self.threshold:
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(best_id)
+            self.stats['hits'] += 1
+            stored_question, answer, _, _ = self._entries[best_id]
+            return answer, round(best_score, 4), stored_question
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._postings.clear()
+            self._by_signature.clear()
+            self._by_question.clear()
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats['entries'] = len(self._entries)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        return stats
@@ -0,0 +1,30 @@
+# modules/synthetic_roster.py
+"""
+Synthetic student roster for the offline checks and benchmarks
+(check_query_plans.py, benchmark_batch_matcher.py, load_test.py).
+No real student data is needed to exercise the hot queries.
+"""
+import random
+from modules import branch_mapper
+
+def populate(conn, num_students):
+    """Inserts a synthetic roster plus a few jobs with eligibility rows."""
+    branches = [code for code, _ in branch_mapper.get_all_branches()]
+    students = []
+    for i in range(num_students):
+        email = f"student{i}@vit.ac.in"
+        students.append((email, f"20X{i:05d}", f"Student {i}", round(random.uniform(6.0, 9.8), 2),
+                         random.choice(branches), 85.0, 85.0, random.choice([0, 0, 0, 1]),
+                         random.choice([0, 0, 0, 0, 1, 2])))
+    conn.executemany("INSERT INTO users (email, hashed_password, role) VALUES (?, 'x', 'student')",
+                     [(s[0],) for s in students])
+    conn.executemany("""
+    INSERT INTO student_profiles (email, roll_number, full_name, cgpa, branch, class_10_perc, class_12_perc, year_gap, backlogs)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, students)
+    for job in range(20):
+        cursor = conn.execute("INSERT INTO jobs (company_name) VALUES (?)", (f"Company {job}",))
+        sample = random.sample(students, min(len(students), num_students // 4))
+        conn.executemany("INSERT INTO eligibility (job_id, student_email) VALUES (?, ?)",
+                         [(cursor.lastrowid, s[0]) for s in sample])
+    conn.commit()
@@ -1,6 +1,6 @@
 # pages/2_🎓_Student_Dashboard.py
 import streamlit as st
-from modules import database
+from modules import branch_mapper, database
 import json
 import os
 import pandas as pd
@@ -13,15 +13,64 @@ if st.session_state.get("role") != "student":
 st.title("🎓 Student Dashboard")
 st.subheader(f"Welcome, {st.session_state.get('email')}!")
 
+JOBS_PER_PAGE = 10
+
+# Keyset pagination state: a stack of "before job_id" cursors, one per visited page.
+# It belongs to one student; another login in the same browser session starts over
+if st.session_state.get("job_page_owner") != st.session_state['email']:
+    st.session_state["job_page_owner"] = st.session_state['email']
+    st.session_state["job_page_cursors"] = [None]
+    st.session_state["requested_pdfs"] = set()
+
+# --- Profile ---
+profile = database.get_student_profile(st.session_state['email'])
+if profile is not None:
+    with st.expander("✏️ Update My Academic Profile"):
+        with st.form("profile_form"):
+            col1, col2 = st.columns(2)
+            branch_options = branch_mapper.get_all_branches()
+            branch_codes = [code for code, _ in branch_options]
+            selected_branch = col1.selectbox(
+                "Branch", [f"{code} - {name}" for code, name in branch_options],
+                index=branch_codes.index(profile['branch']) if profile['branch'] in branch_codes else 0)
+            updates = {
+                'branch': selected_branch.split(' - ')[0],
+                'cgpa': col2.number_input("Current CGPA (out of 10)", min_value=0.0, max_value=10.0, step=0.01,
+                                          value=float(profile['cgpa'] or 0)),
+                'class_10_perc': col1.number_input("Class 10 Percentage", min_value=0.0, max_value=100.0, step=0.1,
+                                                   value=float(profile['class_10_perc'] or 0)),
+                'class_12_perc': col2.number_input("Class 12 Percentage", min_value=0.0, max_value=100.0, step=0.1,
+                                                   value=float(profile['class_12_perc'] or 0)),
+                'backlogs': col1.number_input("Active Backlogs", min_value=0, step=1,
+                                              value=int(profile['backlogs'] or 0)),
+                'year_gap': col2.number_input("Year Gaps (in years)", min_value=0, step=1,
+                                              value=int(profile['year_gap'] or 0)),
+            }
+            save_button = st.form_submit_button("Save Profile")
+        if save_button:
+            # Eligibility for open jobs is recomputed for this student in the same transaction
+            success, message = database.update_student_profile(st.session_state['email'], updates)
+            if success:
+                st.session_state["job_page_cursors"] = [None]
+                st.success(message)
+            else:
+                st.error(message)
+
 st.header("My Eligible Jobs")
 st.write("This list shows all jobs that match your profile.")
 
 # Refresh button
 if st.button("🔄 Refresh Jobs"):
+    st.session_state["job_page_cursors"] = [None]
     st.rerun()
 
 with st.spinner("Fetching your eligible jobs..."):
-    jobs_df = database.get_eligible_jobs_for_student(st.session_state['email'])
+    total_jobs = database.count_eligible_jobs_for_student(st.session_state['email'])
+    jobs_df, next_cursor = database.get_eligible_jobs_page(
+        st.session_state['email'],
+        before_job_id=st.session_state["job_page_cursors"][-1],
+        page_size=JOBS_PER_PAGE
+    )
 
 if jobs_df.empty:
     st.info("📭 No jobs have been posted for you yet. Check back later!")
@@ -31,11 +80,15 @@ if jobs_df.empty:
     - Your profile matches the job requirements (CGPA, Branch, Backlogs, Year Gap)
     """)
 else:
-    st.success(f"✅ You are eligible for {len(jobs_df)} job(s)!")
+    page_number = len(st.session_state["job_page_cursors"])
+    total_pages = max(1, -(-total_jobs // JOBS_PER_PAGE))
+    st.success(f"✅ You are eligible for {total_jobs} job(s)!")
+    st.caption(f"Page {page_number} of {total_pages}")
     st.markdown("---")
     
     # Display jobs in a simple list format
-    for index, row in jobs_df.iterrows():
+    for row in jobs_df.to_dict('records'):
+        job_id = row['job_id']
         company_name = row['company_name']
         
         # Create a card-like display
@@ -72,19 +125,23 @@ else:
                 with col2:
                     st.markdown(value)
             
-            # PDF Download
+            # PDF Download (file is only read once the student asks for it)
             st.markdown("---")
             pdf_path = row.get('pdf_path')
             if pdf_path and os.path.exists(pdf_path):
-                with open(pdf_path, "rb") as pdf_file:
-                    st.download_button(
-                        label="📄 Download Job Description PDF",
-                        data=pdf_file.read(),
-                        file_name=os.path.basename(pdf_path),
-                        mime="application/pdf",
-                        key=f"pdf_{index}",
-                        use_container_width=True
-                    )
+                if job_id in st.session_state["requested_pdfs"]:
+                    with open(pdf_path, "rb") as pdf_file:
+                        st.download_button(
+                            label="📄 Download Job Description PDF",
+                            data=pdf_file.read(),
+                            file_name=os.path.basename(pdf_path),
+                            mime="application/pdf",
+                            key=f"pdf_{job_id}",
+                            use_container_width=True
+                        )
+                elif st.button("📄 Get Job Description PDF", key=f"get_pdf_{job_id}", use_container_width=True):
+                    st.session_state["requested_pdfs"].add(job_id)
+                    st.rerun()
             else:
                 st.info("📄 No PDF available for this job")
             
@@ -96,3 +153,14 @@ else:
             
             st.markdown("---")
             st.markdown("")  # Add some spacing between jobs
+
+    # Pagination controls
+    col_prev, col_next = st.columns(2)
+    with col_prev:
+        if page_number > 1 and st.button("⬅️ Previous Page", use_container_width=True):
+            st.session_state["job_page_cursors"].pop()
+            st.rerun()
+    with col_next:
+        if next_cursor is not None and st.button("Next Page ➡️", use_container_width=True):
+            st.session_state["job_page_cursors"].append(next_cursor)
+            st.rerun()
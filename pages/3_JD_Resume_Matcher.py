@@ -14,20 +14,12 @@ if st.session_state.get("role") == "admin":
 
 import streamlit as st
 
-import PyPDF2
-
-import google.generativeai as genai
-
 from dotenv import load_dotenv
 
-import os
+from modules import llm_client, pdf_text, resume_analysis
 
 load_dotenv()
 
-API_KEYS = [os.getenv("GEMINI_API_KEY_1"), os.getenv("GEMINI_API_KEY_2")]
-
-
-
 DEFAULT_MODEL = "models/gemini-2.5-flash"
 
 AVAILABLE_MODELS = [
@@ -66,9 +58,7 @@ if uploaded_file:
 
         with st.spinner("Extracting text from your PDF..."):
 
-            reader = PyPDF2.PdfReader(uploaded_file)
-
-            resume_text = "\n".join([page.extract_text() for page in reader.pages if page.extract_text()])
+            resume_text = pdf_text.extract_text(uploaded_file)
 
         st.success("Resume processed successfully.")
 
@@ -82,177 +72,87 @@ job_description = st.text_area("Paste the Job Description here", height=200)
 
 
 
-def ask_gemini(prompt, api_key):
-
-    try:
+STAGE_TITLES = {
 
-        genai.configure(api_key=api_key)
+    "skills": "Extracting skills & experience from resume...",
 
-        model = genai.GenerativeModel(model_choice)
+    "match": "Analyzing resume vs. job description...",
 
-        response = model.generate_content([prompt])
+    "recommendations": "Generating actionable recommendations for the candidate...",
 
-        return response.text.strip()
+    "summary": "Summarizing for recruiter...",
 
-    except Exception as e:
-
-        return f"[Error]: {e}"
+}
 
 
 
 if st.button("Analyze Resume") and resume_text and job_description:
 
-    # Use keys alternately for each major section
-
-    key_iter = iter(API_KEYS * 2)  # Just in case, double so we don't run out
-
-
-
-    with st.status("Extracting skills & experience from resume...", expanded=True):
-
-        skills_prompt = f"""
-
-You are a professional resume analyzer AI.
-
-Extract all skills, experience, projects, certifications, education details, and main keywords from the candidate's resume below. Structure your output as:
-
-
-
-Skills:
-
-Experience:
-
-Certifications:
-
-Projects:
-
-Education:
-
-Tailored Keywords:
-
-
-
-Resume:
-
-{resume_text}
-
-"""
-
-        skills_report = ask_gemini(skills_prompt, next(key_iter))
-
-        st.write(skills_report)
-
-
-
-    with st.status("Analyzing resume vs. job description...", expanded=True):
-
-        match_prompt = f"""
-
-You are an expert at resume-job matching.
-
-Given these:
-
-Job Description:
-
-{job_description}
-
-
-
-Resume Summary:
-
-{skills_report}
-
-
-
-1. Analyze the overlap and differences between required and provided skills/evidence.
-
-2. List clear matches and clear gaps (missing/weak areas).
-
-3. Assign a detailed suitability score out of 10, with reasoning.
-
-
-
-Use this structure:
-
-Matched Requirements:
-
-Missing/Weak Areas:
-
-Suitability Score (1-10) with reason:
-
-"""
-
-        match_report = ask_gemini(match_prompt, next(key_iter))
-
-        st.write(match_report)
-
-
-
-    with st.status("Generating actionable recommendations for the candidate...", expanded=True):
-
-        recommendation_prompt = f"""
-
-Imagine you are a career coach for job applicants.
-
-Given the following analysis, suggest actionable recommendations the candidate should follow to improve their chances of getting this job.
-
-Your recommendations should be practical, focused, and tailored to this job description and resume.
-
+    # Recommendations and the recruiter summary both need only the match report,
 
+    # so they run in parallel; the LLM gateway spreads concurrent calls over the API keys
 
-Analysis:
+    stage_boxes = {}
 
-{match_report}
+    for stage, title in STAGE_TITLES.items():
 
+        status = st.status(title, expanded=True)
 
+        stage_boxes[stage] = (status, status.empty())
 
-Structure:
 
-1. Immediate Resume/Skill Improvement Actions: (If match is <8.5, then give 1 solid project idea and professional certifications or courses available in the internet, along with any improvement tips that can be made in the resume). If score > 8.5, you can give general tips/resume based tips.
 
-2. Longer-Term Career/Skill Tips:
+    def show_progress(kind, stage, payload):
 
-"""
+        status, placeholder = stage_boxes[stage]
 
-        recommendations = ask_gemini(recommendation_prompt, next(key_iter))
+        if kind == "progress":
 
-        st.write(recommendations)
+            placeholder.markdown(payload)
 
+        elif kind == "done":
 
+            if stage == "summary":
 
-    with st.status("Summarizing for recruiter...", expanded=True):
+                placeholder.success(payload)
 
-        summary_prompt = f"""
+            else:
 
-Summarize the candidate's suitability for this job in 2-3 recruiter-friendly sentences, using this info:
+                placeholder.markdown(payload)
 
+            status.update(state="complete")
 
+        elif kind == "error":
 
-Job Description:
+            placeholder.error(f"[Error]: {payload}")
 
-                    {job_description}
+            status.update(state="error")
 
+        elif kind == "skipped":
 
+            placeholder.warning("Skipped because an earlier stage failed.")
 
-Candidate Resume Analysis:
+            status.update(state="error")
 
-{match_report}
 
 
+    results, timings = resume_analysis.analyze(resume_text, job_description, model_choice,
 
-Candidate Recommendations:
+                                               on_event=show_progress)
 
-{recommendations}
+    timing_rows, wall_clock, sequential = resume_analysis.format_timings(timings)
 
+    with st.expander(f"⏱️ Analysis took {wall_clock:.1f}s"):
 
+        st.dataframe(timing_rows, use_container_width=True)
 
-Output only the summary for a recruiter.
+        st.caption(f"The stages took {sequential:.1f}s combined; running them concurrently saved "
 
-"""
+                   f"{max(sequential - wall_clock, 0):.1f}s.")
 
-        summary = ask_gemini(summary_prompt, next(key_iter))
+        st.dataframe(llm_client.get_gateway().get_metrics(), use_container_width=True)
 
-        st.success(summary)
+        st.caption("API key usage since the app started.")
 
 
 
@@ -22,6 +22,7 @@ import os
 import wave
 from dotenv import load_dotenv
 from openai import OpenAI
+from modules import placement_query, placement_store, answer_cache, semantic_cache, llm_client
 # speech_recognition imported but not used - removed
 
 # ---------------------------
@@ -33,11 +34,16 @@ db_path = "data.db"
 # Initialize OpenAI client
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
+# Near-duplicate questions reuse an earlier answer above this cosine similarity
+SEMANTIC_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.85"))
+SEMANTIC_MAX_ENTRIES = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "10000"))
+
 # ---------------------------
 # Helper: Load local DB
 # ---------------------------
 @st.cache_data(show_spinner=False)
-def load_db_to_context(db_path=db_path):
+def load_db_to_context(db_path=db_path, data_version=0):
+    # data_version is part of the cache key, so only a load that changed data refreshes it
     if not os.path.exists(db_path):
         st.error("Database file not found! Please ensure 'data.db' exists in the project folder.")
         return pd.DataFrame()
@@ -74,52 +80,62 @@ def get_voice_input(duration=10, samplerate=16000):
 
     return transcription.text.strip()
 # ---------------------------
-# Helper: Query LLM
+# Helper: Query Engine
 # ---------------------------
-def query_llm(user_query, df):
-    if df.empty:
-        return "⚠️ Database is empty or not loaded correctly."
-
-    table_text = df.to_csv(index=False)
-
-    system_prompt = f"""
-You are CDC Assistant, an intelligent placement query engine for VIT students.
-You are given the placement database below (in CSV format).
-Use it to answer user queries accurately and concisely.
-Always show the final answer in a clean, readable format (Markdown tables or bullet points).
-Do not hallucinate — only use information from the database.
-
---- Placement Database (CSV) ---
-{table_text}
---------------------------------
-
---- Database Schema ---
-Company: Name of the recruiting company.
-Month: The month during which the company visited the campus.
-Average_CTC_LPA: The average salary package (in LPA) offered by the company.
-BBS: No. of CSE (Business Systems) students placed.
-BCE: No. of CSE (Core) students placed.
-BCI: No. of CSE (Information Security) students placed.
-BCT: No. of CSE (IoT) students placed.
-BDS: No. of CSE (Data Science) students placed.
-BEC: No. of Electronics Engineering students placed.
-BEE: No. of Electrical Engineering students placed.
-BIT: No. of Information Technology students placed.
-BKT: No. of CSE (Blockchain Technology) students placed.
-"""
-
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_query}
-            ],
-            temperature=0.2
-        )
-        return response.choices[0].message.content
-    except Exception as e:
-        return f"Error querying model: {e}"
+def generate_sql(system_prompt, user_query, placeholder=None):
+    """
+    Asks the LLM for a SQL query only; the data itself never leaves the app.
+    The query is streamed into the placeholder as it is written.
+    """
+    chunks = llm_client.stream(llm_client.OPENAI, "gpt-4o-mini", user_query, system=system_prompt, temperature=0)
+    if placeholder is None:
+        return llm_client.collect(chunks)
+    sql = llm_client.collect(chunks, on_update=lambda text: placeholder.code(text, language="sql"))
+    placeholder.empty()
+    return sql
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def build_semantic_index(fingerprint):
+    """
+    One in-memory similarity index per version of the placement data, shared
+    by every session and filled from the answer cache. Streamlit builds each
+    key once, so concurrent sessions never rebuild the same index.
+    """
+    index = semantic_cache.SemanticCache(threshold=SEMANTIC_THRESHOLD, max_entries=SEMANTIC_MAX_ENTRIES)
+    index.tag = fingerprint
+    company_names = placement_query.get_company_names(db_path) if fingerprint else []
+    branches = placement_query.get_branches(db_path) if fingerprint else {}
+    index.signature_fn = lambda question: placement_query.question_signature(question, company_names, branches)
+    for answer in answer_cache.get_answers(db_path):
+        if answer.get('question'):
+            index.add(answer['question'], answer)
+    return index
+
+def get_semantic_index():
+    """Returns the similarity index for the current placement data."""
+    return build_semantic_index(answer_cache.get_data_fingerprint(db_path))
+
+def query_llm(user_query, placeholder=None):
+    """Answers the query locally; the LLM is only used to write SQL for unusual questions."""
+    cached = answer_cache.get(user_query, db_path)
+    if cached is not None:
+        cached['cached'] = True
+        return cached
+    index = get_semantic_index()
+    similar = index.lookup(user_query)
+    if similar is not None:
+        answer, similarity, matched_question = similar
+        return dict(answer, cached=True, similar_to=matched_question, similarity=similarity)
+    result = placement_query.answer_query(
+        user_query,
+        llm_complete=lambda system_prompt, question: generate_sql(system_prompt, question, placeholder),
+        db_path=db_path
+    )
+    if not result['error']:
+        result['question'] = user_query
+        answer_cache.put(user_query, db_path, result)
+        index.add(user_query, result)
+    return result
 
 
 
@@ -175,7 +191,7 @@ with col2:
         user_query = get_voice_input()
 
 # Load database
-df = load_db_to_context()
+df = load_db_to_context(db_path, placement_store.get_data_version(db_path))
 
 # Show preview of data
 if not df.empty:
@@ -185,9 +201,30 @@ if not df.empty:
 # Query handling
 if user_query:
     with st.spinner(" Thinking..."):
-        llm_response = query_llm(user_query, df)
-    st.markdown("### LLM Response")
-    st.markdown(llm_response)
+        result = query_llm(user_query, placeholder=st.empty())
+    st.markdown("### Answer")
+    if result['error']:
+        st.error(result['error'])
+    else:
+        st.markdown(f"**{result['summary']}**")
+        if result.get('similar_to'):
+            st.caption(f"⚡ Reused the answer to a similar question: “{result['similar_to']}” "
+                       f"(similarity {result['similarity']:.2f})")
+        elif result.get('cached'):
+            st.caption("⚡ Served from the answer cache")
+        if result['rows']:
+            st.dataframe(pd.DataFrame(result['rows'], columns=result['columns']), use_container_width=True)
+        else:
+            st.info("No matching records found.")
+        with st.expander("Show SQL"):
+            st.code(result['sql'], language="sql")
+            st.caption("Answered by the local query parser" if result['source'] == 'intent'
+                       else "SQL written by gpt-4o-mini, executed locally (read-only)")
+
+with st.sidebar.expander("📈 Answer Cache"):
+    st.json(answer_cache.get_stats())
+    st.caption("Similar-question index")
+    st.json(get_semantic_index().get_stats())
 
 # Footer
 st.markdown("<p class='footer'>⚙️ Powered by Streamlit · OpenAI · SQLite</p>", unsafe_allow_html=True)
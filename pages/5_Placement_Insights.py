@@ -17,57 +17,62 @@ import streamlit as st
 import pandas as pd
 import sqlite3
 import plotly.express as px
-import numpy as np
+from modules import placement_cube, placement_store
 
 
 st.title("CDC Assistant — Advanced Placement Analytics Dashboard")
 st.caption("Interactive analytics for placement trends, package statistics, and branch performance at VIT.")
 
 # -----------------------------------------------------------
-# LOAD DATABASE
+# LOAD AGGREGATES
 # -----------------------------------------------------------
+DB_PATH = "data.db"
+
 @st.cache_data
-def load_data(db_path="data.db"):
-    conn = sqlite3.connect(db_path)
-    df = pd.read_sql_query("SELECT * FROM companies", conn)
-    conn.close()
+def load_cubes(db_path, data_version):
+    # data_version is part of the cache key, so only a load that changed data refreshes the cubes
+    return placement_cube.load_cubes(db_path)
 
-    # Normalize columns
-    df.columns = (
-        df.columns.str.strip()
-        .str.replace(r"[^\w]+", "_", regex=True)
-        .str.upper()
+@st.cache_data
+def load_filtered_rows(db_path, data_version, months, min_ctc, max_ctc, limit=500):
+    conn = sqlite3.connect(db_path)
+    placeholders = ", ".join("?" for _ in months)
+    df = pd.read_sql_query(
+        f"SELECT * FROM companies WHERE Month IN ({placeholders}) AND Average_CTC_LPA BETWEEN ? AND ? LIMIT ?",
+        conn, params=[*months, min_ctc, max_ctc, limit]
     )
+    conn.close()
     return df
 
-df = load_data()
+data_version = placement_store.get_data_version(DB_PATH)
+try:
+    cubes = load_cubes(DB_PATH, data_version)
+except placement_cube.CubesMissingError as e:
+    st.error(f"Placement analytics are not available yet: {e}")
+    st.stop()
+month_ctc = cubes["placement_cube_month_ctc"]
 
 # -----------------------------------------------------------
 # FILTERS
 # -----------------------------------------------------------
 st.sidebar.header("Filters")
 
+all_months = placement_cube.month_order(cubes)
 months = st.sidebar.multiselect(
     "Select Month(s):",
-    options=df["MONTH"].unique(),
-    default=df["MONTH"].unique()
+    options=all_months,
+    default=all_months
 )
 
 min_ctc, max_ctc = st.sidebar.slider(
     "Average CTC Range (LPA):",
-    float(df["AVERAGE_CTC_LPA"].min()),
-    float(df["AVERAGE_CTC_LPA"].max()),
-    (float(df["AVERAGE_CTC_LPA"].min()), float(df["AVERAGE_CTC_LPA"].max()))
+    float(month_ctc["CTC"].min()),
+    float(month_ctc["CTC"].max()),
+    (float(month_ctc["CTC"].min()), float(month_ctc["CTC"].max()))
 )
 
-filtered_df = df[
-    (df["MONTH"].isin(months)) &
-    (df["AVERAGE_CTC_LPA"].between(min_ctc, max_ctc))
-]
-
-branch_columns = ["BBS", "BCE", "BCI", "BCT", "BDS", "BEC", "BEE", "BIT", "BKT"]
-filtered_df = filtered_df.copy()
-filtered_df["TOTAL_PLACED"] = filtered_df[branch_columns].sum(axis=1)
+filters = (cubes, months, min_ctc, max_ctc)
+companies_df = placement_cube.company_table(*filters)
 
 # -----------------------------------------------------------
 # KEY METRICS
@@ -76,17 +81,13 @@ st.subheader("Key Metrics")
 
 col1, col2, col3, col4, col5 = st.columns(5)
 
-avg_ctc = round(filtered_df["AVERAGE_CTC_LPA"].mean(), 2)
-median_ctc = round(filtered_df["AVERAGE_CTC_LPA"].median(), 2)
-max_ctc = round(filtered_df["AVERAGE_CTC_LPA"].max(), 2)
-total_students = int(filtered_df["TOTAL_PLACED"].sum())
-unique_companies = filtered_df["COMPANY"].nunique()
+metrics = placement_cube.key_metrics(*filters)
 
-col1.metric("Average Package (LPA)", avg_ctc)
-col2.metric("Median Package (LPA)", median_ctc)
-col3.metric("Highest Package (LPA)", max_ctc)
-col4.metric("Total Students Placed", total_students)
-col5.metric("Companies Visited", unique_companies)
+col1.metric("Average Package (LPA)", round(metrics["average"], 2))
+col2.metric("Median Package (LPA)", round(metrics["median"], 2))
+col3.metric("Highest Package (LPA)", round(metrics["highest"], 2))
+col4.metric("Total Students Placed", metrics["students"])
+col5.metric("Companies Visited", metrics["companies"])
 
 st.divider()
 
@@ -96,60 +97,34 @@ st.divider()
 
 # Average CTC by Month
 st.subheader("Average Package by Month")
-month_ctc = filtered_df.groupby("MONTH")["AVERAGE_CTC_LPA"].mean().reset_index()
-fig1 = px.bar(month_ctc, x="MONTH", y="AVERAGE_CTC_LPA", color="MONTH", text_auto=True,
+month_avg = placement_cube.month_averages(*filters)
+fig1 = px.bar(month_avg, x="MONTH", y="AVERAGE_CTC_LPA", color="MONTH", text_auto=True,
               title="Average Package Trend by Month")
 st.plotly_chart(fig1, use_container_width=True)
 
 # Branch-wise placement totals
 st.subheader("Placement Distribution by Branch")
-branch_totals = filtered_df[branch_columns].sum().reset_index()
-branch_totals.columns = ["Branch", "Students_Placed"]
+branch_totals = placement_cube.branch_totals(*filters)
 fig2 = px.bar(branch_totals, x="Branch", y="Students_Placed", color="Branch",
               title="Total Placements by Branch", text_auto=True)
 st.plotly_chart(fig2, use_container_width=True)
 
 # Branch-wise statistics
 st.subheader("Branch-wise Statistics")
-branch_stats = []
-for branch in branch_columns:
-    sub_df = filtered_df[filtered_df[branch] > 0]
-    avg_ctc_b = sub_df["AVERAGE_CTC_LPA"].mean() if not sub_df.empty else np.nan
-    median_ctc_b = sub_df["AVERAGE_CTC_LPA"].median() if not sub_df.empty else np.nan
-    total_b = sub_df[branch].sum()
-    branch_stats.append({
-        "Branch": branch,
-        "Average_Package_LPA": round(avg_ctc_b, 2) if not np.isnan(avg_ctc_b) else 0,
-        "Median_Package_LPA": round(median_ctc_b, 2) if not np.isnan(median_ctc_b) else 0,
-        "Total_Students_Placed": int(total_b)
-    })
-
-branch_stats_df = pd.DataFrame(branch_stats).sort_values(by="Average_Package_LPA", ascending=False)
+branch_stats_df = placement_cube.branch_stats(*filters)
 st.dataframe(branch_stats_df, use_container_width=True)
 
 # Top Paying Companies
 st.subheader("Top Paying Companies")
-top_companies = (
-    filtered_df.groupby("COMPANY")["AVERAGE_CTC_LPA"]
-    .mean()
-    .reset_index()
-    .sort_values(by="AVERAGE_CTC_LPA", ascending=False)
-    .head(10)
-)
-fig3 = px.bar(top_companies, x="AVERAGE_CTC_LPA", y="COMPANY", orientation="h", color="AVERAGE_CTC_LPA",
+top_companies = companies_df.sort_values(by="AVERAGE_CTC_LPA", ascending=False).head(10)
+fig3 = px.bar(top_companies, x="AVERAGE_CTC_LPA", y="Company", orientation="h", color="AVERAGE_CTC_LPA",
               title="Top 10 Highest Average Packages", text_auto=True)
 st.plotly_chart(fig3, use_container_width=True)
 
 # Most Hiring Companies
 st.subheader("Top Companies by Number of Placements")
-most_hiring = (
-    filtered_df.groupby("COMPANY")["TOTAL_PLACED"]
-    .sum()
-    .reset_index()
-    .sort_values(by="TOTAL_PLACED", ascending=False)
-    .head(10)
-)
-fig4 = px.bar(most_hiring, x="TOTAL_PLACED", y="COMPANY", orientation="h", color="TOTAL_PLACED",
+most_hiring = companies_df.sort_values(by="TOTAL_PLACED", ascending=False).head(10)
+fig4 = px.bar(most_hiring, x="TOTAL_PLACED", y="Company", orientation="h", color="TOTAL_PLACED",
               title="Top 10 Companies by Students Placed", text_auto=True)
 st.plotly_chart(fig4, use_container_width=True)
 
@@ -158,18 +133,16 @@ st.plotly_chart(fig4, use_container_width=True)
 # -----------------------------------------------------------
 st.subheader("Company Level Analytics")
 
-selected_company = st.selectbox("Select a Company:", options=sorted(filtered_df["COMPANY"].unique()))
+selected_company = st.selectbox("Select a Company:", options=sorted(companies_df["Company"].unique()))
 if selected_company:
-    comp_data = filtered_df[filtered_df["COMPANY"] == selected_company]
+    summary = placement_cube.company_summary(*filters, selected_company)
     st.write(f"Summary for {selected_company}:")
     col1, col2, col3 = st.columns(3)
-    col1.metric("Average Package (LPA)", round(comp_data["AVERAGE_CTC_LPA"].mean(), 2))
-    col2.metric("Median Package (LPA)", round(comp_data["AVERAGE_CTC_LPA"].median(), 2))
-    col3.metric("Total Students Placed", int(comp_data["TOTAL_PLACED"].sum()))
+    col1.metric("Average Package (LPA)", round(summary["average"], 2))
+    col2.metric("Median Package (LPA)", round(summary["median"], 2))
+    col3.metric("Total Students Placed", summary["students"])
 
-    branch_split = comp_data[branch_columns].sum().reset_index()
-    branch_split.columns = ["Branch", "Students_Placed"]
-    fig5 = px.bar(branch_split, x="Branch", y="Students_Placed", color="Branch",
+    fig5 = px.bar(summary["branch_split"], x="Branch", y="Students_Placed", color="Branch",
                   title=f"Branch-wise Placement Split for {selected_company}", text_auto=True)
     st.plotly_chart(fig5, use_container_width=True)
 
@@ -178,5 +151,7 @@ if selected_company:
 # -----------------------------------------------------------
 st.divider()
 st.subheader("Filtered Data")
-st.dataframe(filtered_df, use_container_width=True)
+# Only this table reads raw rows, and only on demand
+if st.checkbox("Show matching rows") and months:
+    st.dataframe(load_filtered_rows(DB_PATH, data_version, tuple(months), min_ctc, max_ctc), use_container_width=True)
 st.caption("Use the sidebar filters to explore placement patterns by month and CTC range.")
@@ -1,14 +1,11 @@
 # pages/9_🔑_Admin_Panel.py
 import streamlit as st
-import importlib
-from modules import database, gemini_parser
+from modules import job_queue, jd_batch, jd_cache, pdf_text
 import json
+import pandas as pd
 import os
 from datetime import datetime
 
-# Force reload modules to avoid caching issues
-importlib.reload(database)
-
 # --- Authentication Check ---
 if st.session_state.get("role") != "admin":
     st.error("Access Denied: You must be logged in as an Admin to view this page.")
@@ -17,6 +14,12 @@ if st.session_state.get("role") != "admin":
 st.title("🔑 Admin Panel: Post New Job")
 st.caption(f"Logged in as: {st.session_state.get('email')}")
 
+with st.sidebar.expander("📈 JD Parse Cache"):
+    st.json(jd_cache.get_stats())
+
+# Postings left in the queue by an earlier run are picked up again
+job_queue.resume_pending()
+
 # Create uploads directory if it doesn't exist
 UPLOADS_DIR = "job_pdfs"
 if not os.path.exists(UPLOADS_DIR):
@@ -27,7 +30,8 @@ jd_text = st.text_area("Paste the full Job Description here", height=300)
 
 # Optional PDF upload
 st.markdown("### Optional: Upload Job Description PDF")
-pdf_file = st.file_uploader("Upload JD PDF (Optional - for student reference only)", type=['pdf'], key="jd_pdf")
+pdf_file = st.file_uploader("Upload JD PDF (Optional - its text is used when no JD is pasted above)",
+                            type=['pdf'], key="jd_pdf")
 pdf_path = None
 
 if pdf_file is not None:
@@ -40,93 +44,133 @@ if pdf_file is not None:
         f.write(pdf_file.getbuffer())
     st.success(f"PDF uploaded: {pdf_filename}")
 
-if st.button("Extract Criteria & Find Eligible Students"):
+    if not jd_text.strip():
+        try:
+            jd_text = pdf_text.extract_text(pdf_file)
+        except Exception as e:
+            st.warning(f"Could not read text from the PDF: {e}")
+        if jd_text.strip():
+            with st.expander("Job description text extracted from the PDF"):
+                st.text(jd_text)
+
+if st.button("📤 Extract & Queue for Review"):
     if not company_name or not jd_text:
         st.warning("Please enter a company name and a job description.")
     else:
-        with st.spinner("Calling Gemini API to extract criteria and job details..."):
-            criteria, message = gemini_parser.get_gemini_json_response(jd_text)
-            
-            if criteria is None:
-                st.error(f"Failed to parse criteria: {message}")
-                st.stop()
-            
-            st.success(f"Information extracted successfully: {message}")
-            
-            # Display extracted information
-            col1, col2 = st.columns(2)
-            with col1:
-                st.markdown("#### Eligibility Criteria")
-                st.json({
-                    'cgpa': criteria.get('cgpa'),
-                    'branches': criteria.get('branches'),
-                    'backlogs': criteria.get('backlogs'),
-                    'year_gap': criteria.get('year_gap')
-                })
-            
-            with col2:
-                st.markdown("#### Job Details")
-                details = {}
-                if criteria.get('ctc'):
-                    details['CTC'] = criteria.get('ctc')
-                if criteria.get('stipend'):
-                    details['Stipend'] = criteria.get('stipend')
-                if criteria.get('last_date'):
-                    details['Last Date'] = criteria.get('last_date')
-                if criteria.get('company_description'):
-                    details['Company Description'] = criteria.get('company_description')
-                
-                if details:
-                    st.json(details)
-                else:
-                    st.info("No additional details found in JD")
-
-        with st.spinner("Querying student database..."):
-            eligible_students_df = database.get_students_matching_criteria(criteria)
-            
-            if eligible_students_df.empty:
-                st.warning("No students match the extracted criteria.")
-            else:
-                st.subheader("Eligible Students")
-                st.dataframe(eligible_students_df)
-                st.info(f"Found {len(eligible_students_df)} eligible students.")
-                
-                # Store results in session state to be saved
-                st.session_state['current_job_data'] = {
-                    'company': company_name,
-                    'jd': jd_text,
-                    'criteria_json': json.dumps(criteria),
-                    'eligible_emails': eligible_students_df['email'].tolist(),
-                    'ctc': criteria.get('ctc'),
-                    'stipend': criteria.get('stipend'),
-                    'last_date': criteria.get('last_date'),
-                    'company_description': criteria.get('company_description'),
-                    'pdf_path': pdf_path
-                }
-
-# Add a button to "confirm" and save the job
-if 'current_job_data' in st.session_state:
-    st.markdown("---")
-    if st.button(f"✅ Confirm and Post Job for {len(st.session_state['current_job_data']['eligible_emails'])} students"):
-        data = st.session_state['current_job_data']
-        
-        success, message = database.save_job_and_eligibility(
-            data['company'],
-            data['jd'],
-            data['criteria_json'],
-            data['eligible_emails'],
-            st.session_state['email'], # The admin's email
-            ctc=data.get('ctc'),
-            stipend=data.get('stipend'),
-            last_date=data.get('last_date'),
-            company_description=data.get('company_description'),
-            pdf_path=data.get('pdf_path')
-        )
-        
-        if success:
-            st.success(f"Job posted successfully! Job ID: {message}")
-            # Clear cache
-            del st.session_state['current_job_data']
-            st.rerun()
+        # Parsing and matching run in the background; nothing is lost on a rerun
+        queue_id = job_queue.enqueue(company_name, jd_text, st.session_state['email'], pdf_path=pdf_path)
+        st.success(f"Queued #{queue_id} for {company_name}. Review the extracted criteria below, then confirm "
+                   f"to post it. You can queue the next job right away.")
+
+# --- Batch posting ---
+st.markdown("---")
+st.subheader("📚 Batch Post Job Descriptions")
+batch_files = st.file_uploader("Upload many JD PDFs (each file's name is used as the company name)",
+                               type=['pdf'], accept_multiple_files=True, key="jd_batch_pdfs")
+
+if batch_files and st.button(f"📤 Extract & Queue {len(batch_files)} Jobs for Review"):
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    batch_paths, batch_companies = [], []
+    for index, uploaded in enumerate(batch_files):
+        company = jd_batch.company_from_filename(uploaded.name)
+        path = os.path.join(UPLOADS_DIR, f"{company.replace(' ', '_')}_{timestamp}_{index}.pdf")
+        with open(path, "wb") as f:
+            f.write(uploaded.getbuffer())
+        batch_paths.append(path)
+        batch_companies.append(company)
+
+    progress_bar = st.progress(0.0, text="Extracting text...")
+    def show_progress(stage, done, total):
+        progress_bar.progress(done / total if total else 1.0, text=f"{stage.capitalize()}: {done}/{total}")
+
+    # Like a single post, each job is parsed and matched in the background and waits for review below
+    results = jd_batch.queue_for_review(batch_paths, st.session_state['email'], companies=batch_companies,
+                                        on_progress=show_progress)
+    progress_bar.empty()
+    queued = sum(1 for row in results if row['status'] == 'queued')
+    st.success(f"Queued {queued} of {len(results)} jobs. Review each one below before it is posted.")
+    st.dataframe(pd.DataFrame(results), use_container_width=True, hide_index=True)
+
+STATUS_LABELS = {'queued': '⏳ Queued', 'running': '⚙️ Running', 'review': '📝 Awaiting Review', 'done': '✅ Posted',
+                 'failed': '❌ Failed', 'rejected': '🗑️ Discarded'}
+
+def show_criteria(entry):
+    criteria = json.loads(entry['criteria_json'])
+    st.caption(entry['parse_message'] or '')
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("#### Eligibility Criteria")
+        st.json({key: criteria.get(key) for key in ('cgpa', 'branches', 'backlogs', 'year_gap')})
+    with col2:
+        st.markdown("#### Job Details")
+        details = {label: criteria.get(key) for label, key in (
+            ('CTC', 'ctc'), ('Stipend', 'stipend'), ('Last Date', 'last_date'),
+            ('Company Description', 'company_description')) if criteria.get(key)}
+        if details:
+            st.json(details)
         else:
-            st.error(f"Failed to save job: {message}")
+            st.info("No additional details found in JD")
+
+def is_active(entries):
+    """True while a worker still has to pick up or finish one of the entries."""
+    return any(entry['status'] in ('queued', 'running') for entry in entries)
+
+def render_queue_panel(polling=False):
+    entries = job_queue.list_entries(posted_by=st.session_state.get('email'))
+    if polling and not is_active(entries):
+        # Nothing left to wait for: rerun the page so the panel is drawn once and stops polling
+        st.rerun()
+    if not entries:
+        return
+    st.markdown("---")
+    st.subheader("Job Posting Queue")
+    st.dataframe(pd.DataFrame([{
+        'Queue #': entry['queue_id'],
+        'Company': entry['company_name'],
+        'Status': STATUS_LABELS.get(entry['status'], entry['status']),
+        'Stage': entry['stage'] or '',
+        'Attempts': entry['attempts'],
+        'Eligible Students': entry['eligible_count'],
+        'Job ID': entry['job_id'],
+        'Last Error': entry['error'] or '',
+    } for entry in entries]), use_container_width=True, hide_index=True)
+
+    for entry in entries:
+        if entry['status'] == 'review':
+            # Nothing reaches students until an admin has checked the parse
+            with st.expander(f"#{entry['queue_id']} {entry['company_name']}: review before posting", expanded=True):
+                show_criteria(entry)
+                st.markdown("#### Eligible Students")
+                st.dataframe(pd.DataFrame({'email': json.loads(entry['eligible_json'])}), hide_index=True)
+                col1, col2 = st.columns(2)
+                if col1.button(f"✅ Confirm and Post Job for {entry['eligible_count']} students",
+                               key=f"approve_{entry['queue_id']}"):
+                    job_queue.approve(entry['queue_id'])
+                    st.rerun()
+                if col2.button("🗑️ Discard", key=f"reject_{entry['queue_id']}"):
+                    job_queue.reject(entry['queue_id'])
+                    st.rerun()
+        elif entry['status'] == 'done':
+            with st.expander(f"#{entry['queue_id']} {entry['company_name']}: posted for "
+                             f"{entry['eligible_count']} students"):
+                show_criteria(entry)
+        elif entry['status'] == 'failed':
+            col1, col2 = st.columns([4, 1])
+            col1.error(f"#{entry['queue_id']} {entry['company_name']}: {entry['error']}")
+            if col2.button("Retry", key=f"retry_{entry['queue_id']}"):
+                job_queue.retry(entry['queue_id'])
+                st.rerun()
+
+# Re-runs on its own every few seconds so stage changes show up as they happen
+@st.fragment(run_every=2)
+def polling_queue_panel():
+    render_queue_panel(polling=True)
+
+def queue_panel():
+    """Polls only while entries are queued or running; entries waiting for review do not need it."""
+    if is_active(job_queue.list_entries(posted_by=st.session_state.get('email'))):
+        polling_queue_panel()
+    else:
+        render_queue_panel()
+
+queue_panel()
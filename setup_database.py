@@ -1,70 +1,53 @@
 """
-Script to populate data.db from data.csv
+Script to populate data.db from data.csv and the per-branch files in data/
 Run this script once to set up the database for Voice Query Engine and Placement Insights
 """
 import sqlite3
-import pandas as pd
 import os
+from modules import database, answer_cache, placement_cube, placement_store
 
 def setup_placement_database():
-    """Creates and populates the companies table in data.db from data.csv"""
+    """Loads data.csv and the per-branch files in data/ into the normalized placement tables in data.db, incrementally"""
     
     db_path = "data.db"
     csv_path = "data.csv"
+    branch_dir = "data"
     
     # Check if CSV file exists
     if not os.path.exists(csv_path):
         print(f"Error: {csv_path} not found!")
         return False
     
-    # Read CSV file
-    print(f"Reading {csv_path}...")
-    df = pd.read_csv(csv_path)
-    
-    # Rename column to match code expectations (Average_CTC_(LPA) -> Average_CTC_LPA)
-    if 'Average_CTC_(LPA)' in df.columns:
-        df = df.rename(columns={'Average_CTC_(LPA)': 'Average_CTC_LPA'})
-    
     # Connect to database
     conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    # Create companies table
-    print("Creating companies table...")
-    cursor.execute("""
-    CREATE TABLE IF NOT EXISTS companies (
-        Company TEXT,
-        Month TEXT,
-        Average_CTC_LPA REAL,
-        BBS INTEGER,
-        BCB INTEGER,
-        BCE INTEGER,
-        BCI INTEGER,
-        BCT INTEGER,
-        BDS INTEGER,
-        BEC INTEGER,
-        BEE INTEGER,
-        BIT INTEGER,
-        BKT INTEGER
-    )
-    """)
-    
-    # Clear existing data (optional - comment out if you want to keep existing data)
-    cursor.execute("DELETE FROM companies")
     
-    # Insert data from CSV
-    print("Inserting data into companies table...")
-    df.to_sql('companies', conn, if_exists='append', index=False)
+    # Fact and dimension tables, plus the companies view the pages query.
+    # Only rows that changed since the last run are written.
+    print(f"Loading {csv_path} and the branch files in {branch_dir}/...")
+    summary = placement_store.ingest(conn, csv_path, branch_dir)
+    for warning in summary['warnings']:
+        print(f"Warning: {warning}")
+    print(f"{summary['placements']} placement facts ({summary['from_branch_files']} only in the branch files) "
+          f"for {summary['visits']} company visits.")
+
+    if not summary['changed'] and placement_cube.cubes_exist(conn):
+        conn.close()
+        print(f"No changes since data version {summary['data_version']}; caches kept.")
+        return True
+    print(f"Data version {summary['data_version']}: {summary['inserted']} rows added, "
+          f"{summary['updated']} changed, {summary['deleted']} removed.")
+
+    # Aggregates used by the Placement Insights page
+    print("Building placement analytics cubes...")
+    placement_cube.build_cubes(conn)
     
-    # Commit and close
-    conn.commit()
+    conn.close()
     
-    # Verify
-    cursor.execute("SELECT COUNT(*) FROM companies")
-    count = cursor.fetchone()[0]
-    print(f"Successfully inserted {count} records into companies table.")
+    # Cached answers were computed from the old data
+    database.init_database()
+    answer_cache.clear()
+    print("Cleared cached query answers.")
     
-    conn.close()
     print(f"Database setup complete! {db_path} is ready to use.")
     return True
 